@@ -0,0 +1,205 @@
+# ASGI 入口
+# 与 Flask 应用提供相同的路由和 ApiResponse 结构，共用服务实例和缓存。
+# 处理函数为异步函数：缓存命中时直接在事件循环中返回，只有上游抓取才进入线程池，
+# 慢客户端不再各自占用一个线程。
+#
+# 运行：uvicorn asgi:app --host 0.0.0.0 --port 8080
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from config.config import config
+from handlers.apis_page import APIS_HTML, APIS_JSON, StaticPage
+from models.models import ApiResponse
+from services.all_service import ALL_KEY, NDJSON_CONTENT_TYPE, accepts_ndjson, get_all_service, parse_batch_request
+from services.registry import PLATFORMS, index_endpoints
+from services.warmup import start_warmup
+from utils import cache_headers, metrics, tracing
+from utils.admission import Overloaded
+
+# 配置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """服务器启动时在后台预热上游 DNS 和连接，导入模块（如测试）时不启动"""
+    start_warmup()
+    yield
+
+app = FastAPI(title="热搜 API 服务", docs_url=None, redoc_url=None, openapi_url=None, lifespan=lifespan)
+all_service = get_all_service()
+
+def _json(endpoint: str, platform: str, response: ApiResponse, status_code: int = 200) -> JSONResponse:
+    """序列化响应并记录耗时"""
+    with metrics.SERIALIZE_SECONDS.time(endpoint, platform), tracing.span("serialize"):
+        return JSONResponse(response.to_dict(), status_code=status_code)
+
+def _data(endpoint: str, key: str, body: memoryview = None, response: ApiResponse = None) -> Response:
+    """热搜数据响应：body 为已编码的响应体（快照中的切片原样发送，不复制），否则序列化 response；
+    带 CDN 缓存头，空结果不缓存"""
+    if body is not None:
+        return Response(body, media_type="application/json", headers=all_service.response_headers(key))
+    result = _json(endpoint, "all" if key == ALL_KEY else key, response)
+    result.headers.update(all_service.response_headers(key) if response.code == 200 else cache_headers.no_store_headers())
+    return result
+
+def _error(endpoint: str, platform: str, message: str) -> Response:
+    """服务器错误响应，不缓存"""
+    response = _json(endpoint, platform, ApiResponse(code=500, message=message, data=None), 500)
+    response.headers.update(cache_headers.no_store_headers())
+    return response
+
+def _shed(endpoint: str, key: str, error: Overloaded) -> Response:
+    """未获准入时返回旧数据（标记为 stale），没有旧数据时快速返回 503"""
+    body = all_service.shed(key)
+    if body is not None:
+        return Response(body, media_type="application/json", headers=all_service.shed_headers(key, error.retry_after))
+    platform = "all" if key == ALL_KEY else key
+    response = _json(endpoint, platform, ApiResponse(code=503, message=str(error), data=None), 503)
+    response.headers["Retry-After"] = str(error.retry_after)
+    response.headers.update(cache_headers.no_store_headers())
+    return response
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """请求追踪，返回 Server-Timing 响应头"""
+    token = tracing.start_trace()
+    try:
+        response = await call_next(request)
+        response.headers["Server-Timing"] = tracing.current_trace().server_timing()
+        return response
+    finally:
+        tracing.end_trace(token)
+
+@app.get("/")
+async def index():
+    """首页"""
+    return JSONResponse({
+        "message": "热搜 API 服务",
+        "apis_page": "/apis - 查看所有平台API（可视化界面）",
+        "endpoints": index_endpoints()
+    }, headers=cache_headers.static_headers(config.apis_cache_max_age, "index"))
+
+async def _all_hot_search(endpoint: str) -> Response:
+    with metrics.REQUEST_SECONDS.time(endpoint, "all"):
+        try:
+            body = all_service.get_response_body(ALL_KEY)
+            if body is not None:
+                return _data(endpoint, ALL_KEY, body)
+            all_hot_search = await run_in_threadpool(all_service.serve_all_hot_search)
+            return _data(endpoint, ALL_KEY, response=ApiResponse(data=all_hot_search))
+        except Overloaded as e:
+            return _shed(endpoint, ALL_KEY, e)
+        except Exception as e:
+            logger.error(f"获取所有平台热搜失败: {str(e)}")
+            return _error(endpoint, "all", f"服务器错误: {str(e)}")
+
+def _ndjson() -> StreamingResponse:
+    """流式 NDJSON 的 /all，各平台完成后立即写出一行；生成器在线程池中迭代，不阻塞事件循环"""
+    headers = {**all_service.response_headers(ALL_KEY), "X-Accel-Buffering": "no"}
+    return StreamingResponse(all_service.stream_all_hot_search(), media_type=NDJSON_CONTENT_TYPE, headers=headers)
+
+@app.get("/all")
+async def get_all_hot_search(request: Request):
+    """获取所有平台热搜接口，Accept 为 application/x-ndjson 时流式返回"""
+    if accepts_ndjson(request.headers.get("accept")):
+        return _ndjson()
+    return await _all_hot_search("/all")
+
+@app.get("/all.ndjson")
+async def get_all_hot_search_ndjson():
+    """流式获取所有平台热搜接口"""
+    return _ndjson()
+
+@app.get("/api/hot-search")
+async def get_hot_search():
+    """获取热搜接口"""
+    return await _all_hot_search("/api/hot-search")
+
+@app.get("/api/health")
+async def health_check():
+    """健康检查接口"""
+    return JSONResponse({"status": "ok"}, headers=cache_headers.no_store_headers())
+
+@app.post("/batch")
+async def batch_hot_search(request: Request):
+    """一次获取多个平台热搜接口，各平台并发抓取，返回各平台的结果和状态"""
+    with metrics.REQUEST_SECONDS.time("/batch", "batch"):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        try:
+            limits = parse_batch_request(body)
+        except ValueError as e:
+            response = _json("/batch", "batch", ApiResponse(code=400, message=str(e), data=None), 400)
+            response.headers.update(cache_headers.no_store_headers())
+            return response
+        try:
+            results = await run_in_threadpool(all_service.serve_batch, limits)
+            # 结果随请求体变化，CDN 不按请求体区分缓存
+            response = _json("/batch", "batch", ApiResponse(data=results))
+            response.headers.update(cache_headers.no_store_headers())
+            return response
+        except Exception as e:
+            logger.error(f"批量获取热搜失败: {str(e)}")
+            return _error("/batch", "batch", f"服务器错误: {str(e)}")
+
+# 通用处理函数生成器
+def create_platform_handler(platform):
+    async def handler():
+        with metrics.REQUEST_SECONDS.time(platform.endpoint, platform.slug):
+            try:
+                body = all_service.get_response_body(platform.slug)
+                if body is not None:
+                    return _data(platform.endpoint, platform.slug, body)
+                # 进程内缓存直接在事件循环中读取，其他后端涉及 I/O，交给线程池
+                hot_items = all_service.cache.get(platform.slug) if all_service.cache.backend.local else None
+                if hot_items is None:
+                    hot_items = await run_in_threadpool(all_service.serve_platform_hot_search, platform.get_service())
+                
+                if hot_items:
+                    response = ApiResponse(data=hot_items)
+                else:
+                    response = ApiResponse(code=404, message=f"未找到{platform.name}热搜数据", data=None)
+                return _data(platform.endpoint, platform.slug, response=response)
+            except Overloaded as e:
+                return _shed(platform.endpoint, platform.slug, e)
+            except Exception as e:
+                logger.error(f"获取{platform.name}热搜失败: {str(e)}")
+                return _error(platform.endpoint, platform.slug, f"服务器错误: {str(e)}")
+    handler.__doc__ = platform.description
+    return handler
+
+# 注册各平台路由
+for _platform in PLATFORMS:
+    app.add_api_route(_platform.endpoint, create_platform_handler(_platform),
+                      methods=["GET"], name=f"get_{_platform.slug}_hot_search")
+
+def _static_page(request: Request, page: StaticPage) -> Response:
+    """返回预先渲染的页面，If-None-Match 匹配时返回 304"""
+    if page.not_modified(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=page.headers)
+    return Response(page.body, media_type=page.content_type, headers=page.headers)
+
+@app.get("/apis")
+async def get_apis(request: Request):
+    """获取所有可用的API接口列表"""
+    return _static_page(request, APIS_HTML)
+
+@app.get("/apis.json")
+async def get_apis_json(request: Request):
+    """获取所有可用的API接口列表（JSON格式）"""
+    return _static_page(request, APIS_JSON)
+
+@app.get("/metrics")
+async def get_metrics():
+    """导出 Prometheus 格式的监控指标"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE, headers=cache_headers.no_store_headers())
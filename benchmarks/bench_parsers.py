@@ -0,0 +1,144 @@
+# 解析性能基准测试
+# 使用录制的上游数据离线运行各平台服务的 get_hot_search，统计解析吞吐和内存分配
+# us/page 为扣除抓取开销后的解析耗时，us/req 为含回放请求在内的总耗时
+#
+# 用法：
+#   python -m benchmarks.bench_parsers                      # 全部平台
+#   python -m benchmarks.bench_parsers -p baidu -p weibo    # 指定平台
+#   python -m benchmarks.bench_parsers -o after.json --compare before.json
+import argparse
+import json
+import logging
+import os
+import platform as py_platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay import FixtureStore, create_replay_session
+from services import platform_services
+from utils.http import set_session
+from utils.outbound import HostLimit, OutboundScheduler, set_scheduler
+
+def _git_revision() -> str:
+    """当前提交"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+def bench_platform(service, iterations: int, warmup: int) -> Dict[str, Any]:
+    """测试单个平台"""
+    for _ in range(warmup):
+        service.get_hot_search()
+
+    durations = []
+    parse_total = 0.0
+    items = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        hot_items = service.fetch_hot_search()
+        elapsed = time.perf_counter() - start
+        durations.append(elapsed)
+        # 扣除回放适配器和 requests 本身的开销，只保留解析耗时
+        parse_total += max(elapsed - service.last_fetch_time, 0.0)
+        items += len(hot_items)
+
+    # 单独跑一次统计内存分配，避免 tracemalloc 影响计时
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    service.get_hot_search()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+
+    durations.sort()
+    total = sum(durations)
+    return {
+        "items_per_page": items // iterations if iterations else 0,
+        "items_per_sec": round(items / parse_total, 1) if parse_total else 0.0,
+        "us_per_page": round(parse_total / iterations * 1e6, 1),
+        "us_per_request": round(total / iterations * 1e6, 1),
+        "us_per_request_p50": round(durations[len(durations) // 2] * 1e6, 1),
+        "us_per_request_p95": round(durations[max(int(len(durations) * 0.95) - 1, 0)] * 1e6, 1),
+        "peak_alloc_kib": round(peak / 1024, 1),
+        "retained_alloc_kib": round(allocated / 1024, 1)
+    }
+
+def run(platforms: Optional[List[str]], iterations: int, warmup: int) -> Dict[str, Any]:
+    """运行基准测试"""
+    store = FixtureStore()
+    set_session(create_replay_session(store))
+    # 回放不访问真实上游，不做并发和速率限制
+    set_scheduler(OutboundScheduler(HostLimit(1 << 30, 0, 1)))
+
+    results = {}
+    for name, service_name in store.platforms().items():
+        if platforms and name not in platforms:
+            continue
+        service = getattr(platform_services, service_name)()
+        results[name] = bench_platform(service, iterations, warmup)
+
+    return {
+        "revision": _git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": py_platform.python_version(),
+        "iterations": iterations,
+        "results": results
+    }
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """打印报告，提供基线时显示变化"""
+    print(f"revision={report['revision']} python={report['python']} iterations={report['iterations']}")
+    header = f"{'platform':<14}{'items':>7}{'items/s':>12}{'us/page':>11}{'us/req':>11}{'peak KiB':>10}"
+    if baseline:
+        header += f"{'Δus/page':>11}"
+    print(header)
+    for name, result in report["results"].items():
+        line = (f"{name:<14}{result['items_per_page']:>7}{result['items_per_sec']:>12.1f}"
+                f"{result['us_per_page']:>11.1f}{result['us_per_request']:>11.1f}{result['peak_alloc_kib']:>10.1f}")
+        if baseline:
+            old = baseline["results"].get(name)
+            if old and old["us_per_page"]:
+                change = (result["us_per_page"] - old["us_per_page"]) / old["us_per_page"] * 100
+                line += f"{change:>+10.1f}%"
+            else:
+                line += f"{'-':>11}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="离线解析性能基准测试")
+    parser.add_argument("-p", "--platform", action="append", help="只测试指定平台，可重复")
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="每个平台的迭代次数")
+    parser.add_argument("--warmup", type=int, default=10, help="预热次数")
+    parser.add_argument("-o", "--output", help="将报告保存为 JSON")
+    parser.add_argument("--compare", help="与之前保存的 JSON 报告对比")
+    args = parser.parse_args()
+
+    # 解析失败由服务记录日志，基准测试中只保留严重错误
+    logging.basicConfig(level=logging.CRITICAL)
+
+    report = run(args.platform, args.iterations, args.warmup)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# 冷启动基准测试
+# 反复启动全新的解释器进程，统计进程总耗时、导入应用耗时和首个请求耗时，模拟 Serverless 冷启动
+# process 为父进程观测的子进程总耗时（含解释器启动），import 为导入入口模块（含创建应用），
+# first_request 为导入后第一个请求的耗时（仅 wsgi，使用 Flask 测试客户端，不经过网络）
+#
+# 用法：
+#   python -m benchmarks.bench_startup                   # 默认 wsgi 入口 main.py，20 次
+#   python -m benchmarks.bench_startup --entry asgi -n 10
+#   python -m benchmarks.bench_startup --importtime 15   # 额外列出导入最慢的模块
+#   python -m benchmarks.bench_startup -o after.json --compare before.json
+import argparse
+import json
+import os
+import platform as py_platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_parsers import _git_revision
+from benchmarks.loadtest import percentile
+
+# 入口模块 -> 首个请求的路径（None 表示只统计导入）
+ENTRIES: Dict[str, Optional[str]] = {
+    "main": "/",
+    "asgi": None,
+}
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+module = __import__({module!r})
+imported = time.perf_counter()
+result = {{"import_ms": (imported - start) * 1000}}
+path = {path!r}
+if path:
+    response = module.app.test_client().get(path)
+    response.get_data()
+    result["first_request_ms"] = (time.perf_counter() - imported) * 1000
+    result["status"] = response.status_code
+result["modules"] = len(sys.modules)
+print("BENCH " + json.dumps(result))
+"""
+
+def _child_env() -> Dict[str, str]:
+    """子进程环境：关闭共享快照等启动期的可选功能，只测应用本身"""
+    env = dict(os.environ)
+    env.pop("SNAPSHOT_DIR", None)
+    # 需要写入字节码缓存，测的是部署后的常规冷启动
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+def run_once(entry: str) -> Dict[str, Any]:
+    """启动一个全新的进程并采样"""
+    code = _CHILD.format(module=entry, path=ENTRIES[entry])
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=_child_env(),
+                               capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    for line in completed.stdout.splitlines():
+        if line.startswith("BENCH "):
+            result = json.loads(line[len("BENCH "):])
+            result["process_ms"] = elapsed
+            return result
+    raise RuntimeError(f"子进程未输出结果: {completed.stderr[-2000:]}")
+
+def import_profile(entry: str, limit: int) -> List[Dict[str, Any]]:
+    """使用 -X importtime 找出累计导入耗时最长的模块"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {entry}"],
+                               cwd=ROOT, env=_child_env(), capture_output=True, text=True)
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if not parts[0].isdigit():
+            continue
+        modules.append({"module": parts[2], "self_us": int(parts[0]), "cumulative_us": int(parts[1])})
+    modules.sort(key=lambda module: module["cumulative_us"], reverse=True)
+    return modules[:limit]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "min_ms": round(values[0], 1),
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "max_ms": round(values[-1], 1)
+    }
+
+def run(entry: str, iterations: int, warmup: int) -> Dict[str, Any]:
+    """运行基准测试，预热轮次用于填充字节码缓存和系统文件缓存"""
+    for _ in range(warmup):
+        run_once(entry)
+    samples = [run_once(entry) for _ in range(iterations)]
+
+    results = {}
+    for metric in ("process_ms", "import_ms", "first_request_ms"):
+        values = [sample[metric] for sample in samples if metric in sample]
+        if values:
+            results[metric[:-3]] = summarize(values)
+    return {
+        "revision": _git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": py_platform.python_version(),
+        "entry": entry,
+        "iterations": iterations,
+        "modules_loaded": samples[-1]["modules"],
+        "results": results
+    }
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """打印报告，提供基线时显示 p50 变化"""
+    print(f"revision={report['revision']} python={report['python']} entry={report['entry']} "
+          f"iterations={report['iterations']} modules={report['modules_loaded']}")
+    header = f"{'phase':<16}{'min':>9}{'p50':>9}{'p95':>9}{'max':>9}"
+    if baseline:
+        header += f"{'Δp50':>9}"
+    print(header)
+    for phase, stats in report["results"].items():
+        line = (f"{phase:<16}{stats['min_ms']:>9.1f}{stats['p50_ms']:>9.1f}"
+                f"{stats['p95_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+        if baseline:
+            old = baseline["results"].get(phase)
+            if old and old["p50_ms"]:
+                line += f"{(stats['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100:>+8.1f}%"
+            else:
+                line += f"{'-':>9}"
+        print(line)
+    if report.get("imports"):
+        print(f"\n{'module':<48}{'self ms':>10}{'cumul ms':>10}")
+        for module in report["imports"]:
+            print(f"{module['module']:<48}{module['self_us'] / 1000:>10.1f}{module['cumulative_us'] / 1000:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="冷启动基准测试")
+    parser.add_argument("--entry", choices=sorted(ENTRIES), default="main", help="入口模块")
+    parser.add_argument("-n", "--iterations", type=int, default=20, help="启动次数")
+    parser.add_argument("--warmup", type=int, default=2, help="预热次数")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="列出累计导入耗时最长的 N 个模块")
+    parser.add_argument("-o", "--output", help="将报告保存为 JSON")
+    parser.add_argument("--compare", help="与之前保存的 JSON 报告对比")
+    args = parser.parse_args()
+
+    report = run(args.entry, args.iterations, args.warmup)
+    if args.importtime:
+        report["imports"] = import_profile(args.entry, args.importtime)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# 上游传输基准测试
+# 在子进程中启动本地上游回放服务，分别用 HTTP/1.1 连接池和 HTTP/2（h2c 多路复用）并发抓取全部平台，
+# 按回放服务 /__stats 的变化比较建立的连接数，并统计抓取耗时。每种传输使用新建的 Session，连接数从零开始统计。
+#
+# 用法：
+#   python -m benchmarks.bench_transport                         # fast 配置，每种传输 20 轮
+#   python -m benchmarks.bench_transport --profile realistic -n 50
+#   python -m benchmarks.bench_transport -t http2 -o after.json
+#   python -m benchmarks.bench_transport --upstream http://127.0.0.1:9000   # 使用已启动的回放服务
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from benchmarks.loadtest import ManagedProcess, wait_ready
+from config.config import config
+from services.registry import PLATFORMS
+from utils.executor import get_executor
+from utils.http import create_session, set_session
+from utils.http2 import http2_available
+from utils.outbound import HostLimit, OutboundScheduler, set_scheduler
+
+TRANSPORTS = ("http1", "http2")
+
+def _percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)] if values else 0.0
+
+def upstream_stats(upstream: str) -> Dict[str, Any]:
+    """回放服务的统计，不经过被测的 Session"""
+    return requests.get(f"{upstream}/__stats", timeout=5).json()
+
+def bench_transport(upstream: str, transport: str, cycles: int) -> Dict[str, Any]:
+    """用指定传输并发抓取全部平台 cycles 轮"""
+    session = create_session(http2=transport == "http2", prior_knowledge=True)
+    set_session(session)
+    services = {platform.slug: platform.get_service() for platform in PLATFORMS}
+    executor = get_executor()
+    stats_before = upstream_stats(upstream)
+    fetches: List[float] = []
+    rounds: List[float] = []
+    empty = 0
+
+    def fetch(service) -> bool:
+        start = time.perf_counter()
+        hot_items = service.fetch_hot_search()
+        fetches.append(time.perf_counter() - start)
+        return bool(hot_items)
+
+    try:
+        for _ in range(cycles):
+            start = time.perf_counter()
+            futures = [executor.submit(fetch, service) for service in services.values()]
+            concurrent.futures.wait(futures)
+            rounds.append(time.perf_counter() - start)
+            empty += sum(1 for future in futures if not future.result())
+    finally:
+        session.close()
+
+    stats_after = upstream_stats(upstream)
+    issued = sum(stats_after["requests"].values()) - sum(stats_before["requests"].values())
+    return {
+        # 扣除读取统计本身的连接
+        "connections": stats_after["connections"] - stats_before["connections"] - 1,
+        "requests": issued,
+        "empty": empty,
+        "fetch_ms_p50": round(_percentile(fetches, 50) * 1000, 1),
+        "fetch_ms_p95": round(_percentile(fetches, 95) * 1000, 1),
+        "fetch_ms_p99": round(_percentile(fetches, 99) * 1000, 1),
+        "round_ms_p50": round(_percentile(rounds, 50) * 1000, 1),
+        "round_ms_p95": round(_percentile(rounds, 95) * 1000, 1)
+    }
+
+def run(transports: List[str], profile: str, cycles: int, seed: int, upstream: Optional[str] = None,
+        upstream_port: int = 9100) -> Dict[str, Any]:
+    """启动回放服务（未指定 upstream 时）并依次测试各传输"""
+    process = None
+    if not upstream:
+        process = ManagedProcess(
+            [sys.executable, "-m", "benchmarks.fake_upstream", "--port", str(upstream_port),
+             "--profile", profile, "--seed", str(seed)], {})
+        upstream = f"http://127.0.0.1:{upstream_port}"
+    try:
+        wait_ready(f"{upstream}/__stats")
+        config.upstream_base_url = upstream
+        # 回放服务在本地，不做并发和速率限制
+        set_scheduler(OutboundScheduler(HostLimit(1 << 30, 0, 1)))
+        results = {transport: bench_transport(upstream, transport, cycles) for transport in transports}
+    finally:
+        if process is not None:
+            process.stop()
+    return {"profile": profile, "cycles": cycles, "platforms": len(PLATFORMS), "results": results}
+
+def print_report(report: Dict[str, Any]):
+    print(f"profile={report['profile']} cycles={report['cycles']} platforms={report['platforms']}")
+    print(f"{'transport':<11}{'conns':>7}{'reqs':>7}{'empty':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'round p50':>11}{'round p95':>11}")
+    for transport, result in report["results"].items():
+        print(f"{transport:<11}{result['connections']:>7}{result['requests']:>7}{result['empty']:>7}"
+              f"{result['fetch_ms_p50']:>9.1f}{result['fetch_ms_p95']:>9.1f}{result['fetch_ms_p99']:>9.1f}"
+              f"{result['round_ms_p50']:>11.1f}{result['round_ms_p95']:>11.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="上游传输（HTTP/1.1 与 HTTP/2）基准测试")
+    parser.add_argument("-t", "--transport", action="append", choices=TRANSPORTS, help="只测试指定传输，可重复")
+    parser.add_argument("--profile", default="fast", help="回放服务的故障配置，同 benchmarks.fake_upstream")
+    parser.add_argument("-n", "--cycles", type=int, default=20, help="每种传输抓取全部平台的轮数")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--upstream", help="使用已启动的回放服务，不指定时自动启动")
+    parser.add_argument("--upstream-port", type=int, default=9100, help="自动启动的回放服务端口")
+    parser.add_argument("-o", "--output", help="将报告保存为 JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    transports = args.transport or list(TRANSPORTS)
+    if "http2" in transports and not http2_available():
+        parser.error("HTTP/2 需要安装 httpx[http2]")
+
+    report = run(transports, args.profile, args.cycles, args.seed, args.upstream, args.upstream_port)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# 本地 Redis 协议替身服务
+# 实现缓存后端用到的 RESP 命令（PING/AUTH/SELECT/GET/SET[EX|PX]/DEL/EXISTS/DBSIZE/FLUSHDB），
+# 数据只保存在内存中，用于在没有 Redis 的环境下验证 redis 缓存后端和多节点共用缓存。
+#
+# 用法：
+#   python -m benchmarks.fake_redis --port 6390
+#   CACHE_BACKEND=redis CACHE_REDIS_URL=redis://127.0.0.1:6390/0 python main.py
+import argparse
+import logging
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class FakeRedisStore:
+    """按数据库编号划分的内存键值存储"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 数据库编号 -> 键 -> (值, 过期时间或 None)
+        self._dbs: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+        self.commands = 0
+
+    def _db(self, db: int) -> Dict[bytes, Tuple[bytes, Optional[float]]]:
+        return self._dbs.setdefault(db, {})
+
+    def _alive(self, db: int, key: bytes) -> Optional[bytes]:
+        entry = self._db(db).get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and time.time() >= entry[1]:
+            del self._db(db)[key]
+            return None
+        return entry[0]
+
+    def execute(self, db: int, args: List[bytes]) -> Any:
+        """执行一条命令，返回值按 RESP 类型编码"""
+        with self._lock:
+            self.commands += 1
+            command = args[0].upper()
+            if command == b"PING":
+                return "PONG"
+            if command == b"GET":
+                return self._alive(db, args[1])
+            if command == b"SET":
+                expires = None
+                options = [arg.upper() for arg in args[3:]]
+                for i, option in enumerate(options):
+                    if option == b"EX":
+                        expires = time.time() + int(args[4 + i])
+                    elif option == b"PX":
+                        expires = time.time() + int(args[4 + i]) / 1000
+                self._db(db)[args[1]] = (args[2], expires)
+                return "OK"
+            if command == b"DEL":
+                return sum(1 for key in args[1:] if self._db(db).pop(key, None) is not None)
+            if command == b"EXISTS":
+                return sum(1 for key in args[1:] if self._alive(db, key) is not None)
+            if command == b"DBSIZE":
+                return len(self._db(db))
+            if command == b"FLUSHDB":
+                self._db(db).clear()
+                return "OK"
+            return RuntimeError(f"ERR unknown command '{args[0].decode(errors='replace')}'")
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """RESP2 连接处理器"""
+
+    def handle(self):
+        db = 0
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            command = args[0].upper() if args else b""
+            if command == b"SELECT":
+                db = int(args[1])
+                reply = "OK"
+            elif command == b"AUTH":
+                reply = "OK" if self.server.password in (None, args[-1].decode()) else RuntimeError("WRONGPASS invalid password")
+            elif command == b"QUIT":
+                self._write("OK")
+                return
+            else:
+                reply = self.server.store.execute(db, args)
+            self._write(reply)
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # 内联命令（如 telnet 输入）
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            header = self.rfile.readline()
+            length = int(header[1:-2])
+            data = self.rfile.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("连接已断开")
+            args.append(data[:-2])
+        return args
+
+    def _write(self, reply: Any):
+        if isinstance(reply, RuntimeError):
+            data = b"-" + str(reply).encode() + b"\r\n"
+        elif reply is None:
+            data = b"$-1\r\n"
+        elif isinstance(reply, str):
+            data = b"+" + reply.encode() + b"\r\n"
+        elif isinstance(reply, int):
+            data = b":%d\r\n" % reply
+        else:
+            data = b"$%d\r\n%s\r\n" % (len(reply), reply)
+        self.wfile.write(data)
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """本地 Redis 协议替身服务"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, password: Optional[str] = None):
+        super().__init__(address, FakeRedisHandler)
+        self.store = FakeRedisStore()
+        self.password = password
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+def start_fake_redis(host: str = "127.0.0.1", port: int = 0, password: Optional[str] = None) -> FakeRedisServer:
+    """在后台线程启动替身服务，port=0 时自动分配端口"""
+    server = FakeRedisServer((host, port), password)
+    thread = threading.Thread(target=server.serve_forever, name="fake-redis", daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 Redis 协议替身服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    parser.add_argument("--password", help="要求客户端 AUTH 的密码")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = FakeRedisServer((args.host, args.port), args.password)
+    logger.info(f"Redis 替身服务启动在 {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
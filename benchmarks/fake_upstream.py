@@ -0,0 +1,412 @@
+# 本地上游回放服务
+# 按录制数据响应 platform_services.py 中的全部上游 URL，并可按平台注入延迟、错误、慢速响应和超时
+# 同一端口同时支持 HTTP/1.1 和 h2c（prior knowledge，需要安装 h2），用于比较上游传输方式
+#
+# 用法：
+#   python -m benchmarks.fake_upstream --port 9000 --profile realistic
+#   UPSTREAM_BASE_URL=http://127.0.0.1:9000 python main.py
+#
+# 配置文件格式（--profile 也可以是内置配置名 fast / realistic / flaky / throttled）：
+#   {
+#     "default": {"latency": {"dist": "lognormal", "median_ms": 120, "sigma": 0.6},
+#                 "error_rate": 0.01, "error_status": 503, "timeout_rate": 0.0, "timeout_s": 30,
+#                 "drip": {"chunk_bytes": 2048, "interval_ms": 10},
+#                 "throttle": {"rate": 5, "burst": 10, "retry_after": 1}},
+#     "platforms": {"weibo": {"latency": {"dist": "uniform", "min_ms": 300, "max_ms": 900}}}
+#   }
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay import FixtureStore
+from utils.http import restore_upstream_url
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 连接前言，h2c 客户端连接后首先发送
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+# 内置配置
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "fast": {
+        "default": {}
+    },
+    "realistic": {
+        "default": {
+            "latency": {"dist": "lognormal", "median_ms": 120, "sigma": 0.6}
+        },
+        "platforms": {
+            "github": {"latency": {"dist": "lognormal", "median_ms": 450, "sigma": 0.7}},
+            "history": {"latency": {"dist": "lognormal", "median_ms": 250, "sigma": 0.5},
+                        "drip": {"chunk_bytes": 16384, "interval_ms": 5}},
+            "weibo": {"latency": {"dist": "lognormal", "median_ms": 200, "sigma": 0.8}}
+        }
+    },
+    "flaky": {
+        "default": {
+            "latency": {"dist": "lognormal", "median_ms": 150, "sigma": 0.9},
+            "error_rate": 0.05,
+            "timeout_rate": 0.02,
+            "timeout_s": 15
+        },
+        "platforms": {
+            "bilibili": {"error_rate": 0.3},
+            "toutiao": {"drip": {"chunk_bytes": 512, "interval_ms": 50}}
+        }
+    },
+    # 每个平台每秒最多 2 次请求，超出返回 429 和 Retry-After
+    "throttled": {
+        "default": {
+            "latency": {"dist": "lognormal", "median_ms": 80, "sigma": 0.4},
+            "throttle": {"rate": 2, "burst": 4, "retry_after": 1}
+        }
+    }
+}
+
+class FaultProfile:
+    """按平台的延迟和故障配置"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, seed: Optional[int] = None):
+        config = config or {}
+        self.default = config.get("default", {})
+        self.platforms = config.get("platforms", {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # 各平台的限流令牌桶：平台 -> (令牌数, 更新时间)
+        self._buckets: Dict[str, Any] = {}
+
+    @classmethod
+    def load(cls, name_or_path: str, seed: Optional[int] = None) -> "FaultProfile":
+        """加载内置配置或 JSON 配置文件"""
+        if name_or_path in PROFILES:
+            return cls(PROFILES[name_or_path], seed)
+        with open(name_or_path, encoding="utf-8") as f:
+            return cls(json.load(f), seed)
+
+    def settings(self, platform: str) -> Dict[str, Any]:
+        """某个平台的配置，平台配置覆盖默认配置"""
+        return {**self.default, **self.platforms.get(platform, {})}
+
+    def random(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def throttled(self, platform: str, settings: Dict[str, Any]) -> bool:
+        """按平台令牌桶判断本次请求是否应被限流"""
+        spec = settings.get("throttle")
+        if not spec:
+            return False
+        rate, burst = spec.get("rate", 1), spec.get("burst", 1)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(platform, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            self._buckets[platform] = (tokens - 1 if allowed else tokens, now)
+        return not allowed
+
+    def latency(self, settings: Dict[str, Any]) -> float:
+        """抽样响应延迟（秒）"""
+        spec = settings.get("latency")
+        if not spec:
+            return 0.0
+        dist = spec.get("dist", "fixed")
+        with self._lock:
+            if dist == "uniform":
+                value = self._random.uniform(spec.get("min_ms", 0), spec.get("max_ms", 0))
+            elif dist == "lognormal":
+                value = self._random.lognormvariate(math.log(max(spec.get("median_ms", 1), 1e-3)),
+                                                    spec.get("sigma", 0.5))
+            else:
+                value = spec.get("ms", 0)
+        return value / 1000
+
+class UpstreamStats:
+    """回放服务统计，供负载和连接复用测试使用"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests: Dict[str, int] = {}
+        self.faults: Dict[str, int] = {}
+        # 条件请求命中（返回 304）的次数
+        self.not_modified = 0
+
+    def connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def request(self, platform: str, fault: str = "", not_modified: bool = False):
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+            self.requests[platform] = self.requests.get(platform, 0) + 1
+            if fault:
+                self.faults[fault] = self.faults.get(fault, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "requests": dict(self.requests),
+                "faults": dict(self.faults),
+                "not_modified": self.not_modified
+            }
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """回放请求处理器"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.stats.connection()
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        # 读掉请求体，保持连接可复用
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self._handle("POST")
+
+    def handle(self):
+        # 以 HTTP/2 连接前言开头的是 h2c（prior knowledge）连接
+        try:
+            preface = self.request.recv(len(H2_PREFACE), socket.MSG_PEEK)
+        except OSError:
+            return
+        if preface.startswith(H2_PREFACE[:4]) and h2 is not None:
+            H2Connection(self).run()
+        else:
+            super().handle()
+
+    def _handle(self, method: str):
+        response = self._response(method, self.path, self.headers.get("If-None-Match"))
+        if response is None:
+            self.close_connection = True
+            return
+        self._send(*response)
+
+    def _response(self, method: str, path: str, if_none_match: Optional[str] = None) -> Optional[tuple]:
+        """按录制数据和故障配置计算响应：(状态码, Content-Type, 响应体, 慢速发送配置, 响应头)；
+        模拟超时时挂起后返回 None，由调用方断开。HTTP/1.1 和 h2c 共用。
+        正常响应带按内容计算的 ETag，If-None-Match 匹配时返回 304。"""
+        if path == "/__stats":
+            return 200, "application/json", json.dumps(self.server.stats.to_dict()).encode(), None, None
+
+        url = restore_upstream_url(path)
+        fixture = self.server.store.find(method, url)
+        if fixture is None:
+            self.server.stats.request("unknown", "not_found")
+            return 404, "text/plain", f"no fixture for {method} {url}".encode(), None, None
+
+        profile = self.server.profile
+        settings = profile.settings(fixture.platform)
+
+        if profile.throttled(fixture.platform, settings):
+            self.server.stats.request(fixture.platform, "throttled")
+            retry_after = settings["throttle"].get("retry_after")
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+            return 429, "text/plain", b"too many requests", None, headers
+
+        if profile.random() < settings.get("timeout_rate", 0):
+            # 模拟超时：挂起后直接断开，不返回任何数据
+            self.server.stats.request(fixture.platform, "timeout")
+            time.sleep(settings.get("timeout_s", 30))
+            return None
+
+        delay = profile.latency(settings)
+        if delay:
+            time.sleep(delay)
+
+        if profile.random() < settings.get("error_rate", 0):
+            self.server.stats.request(fixture.platform, "error")
+            return settings.get("error_status", 503), "text/plain", b"injected error", None, None
+
+        body = fixture.body(url)
+        etag = f'"{zlib.crc32(body):08x}"'
+        if if_none_match == etag:
+            self.server.stats.request(fixture.platform, not_modified=True)
+            return 304, fixture.content_type, b"", None, {"ETag": etag}
+        self.server.stats.request(fixture.platform)
+        return 200, fixture.content_type, body, settings.get("drip"), {"ETag": etag}
+
+    def _send(self, status: int, content_type: str, body: bytes, drip: Optional[Dict[str, Any]] = None,
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not drip:
+            self.wfile.write(body)
+            return
+        # 慢速响应：分块发送，块间等待
+        chunk_bytes = max(int(drip.get("chunk_bytes", 1024)), 1)
+        interval = drip.get("interval_ms", 10) / 1000
+        for offset in range(0, len(body), chunk_bytes):
+            self.wfile.write(body[offset:offset + chunk_bytes])
+            self.wfile.flush()
+            time.sleep(interval)
+
+class H2Connection:
+    """h2c 连接：同一连接上的多个流并发处理，每个流在单独的线程中按故障配置延迟后响应"""
+
+    def __init__(self, handler: FakeUpstreamHandler):
+        self.handler = handler
+        self.sock = handler.request
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        # 保护 h2 状态机和套接字写入；流控窗口更新时唤醒等待发送的流
+        self.cond = threading.Condition()
+        self.closed = False
+        # 流 id -> (方法, 路径, If-None-Match)
+        self._requests: Dict[int, tuple] = {}
+
+    def _flush(self):
+        data = self.conn.data_to_send()
+        if data:
+            self.sock.sendall(data)
+
+    def run(self):
+        with self.cond:
+            self.conn.initiate_connection()
+            self._flush()
+        try:
+            while not self.closed:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                with self.cond:
+                    for event in self.conn.receive_data(data):
+                        self._on_event(event)
+                    self._flush()
+                    self.cond.notify_all()
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            with self.cond:
+                self.closed = True
+                self.cond.notify_all()
+
+    def _on_event(self, event):
+        if isinstance(event, h2.events.RequestReceived):
+            headers = dict(event.headers)
+            self._requests[event.stream_id] = (headers[":method"], headers[":path"], headers.get("if-none-match"))
+        elif isinstance(event, h2.events.DataReceived):
+            self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+        elif isinstance(event, h2.events.StreamEnded):
+            threading.Thread(target=self._respond, args=(event.stream_id, *self._requests.pop(event.stream_id)),
+                             daemon=True).start()
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            self.closed = True
+
+    def _respond(self, stream_id: int, method: str, path: str, if_none_match: Optional[str]):
+        response = self.handler._response(method, path, if_none_match)
+        try:
+            with self.cond:
+                if self.closed:
+                    return
+                if response is None:
+                    self.conn.reset_stream(stream_id)
+                    self._flush()
+                    return
+                status, content_type, body, drip, headers = response
+                self.conn.send_headers(stream_id, [
+                    (":status", str(status)),
+                    ("content-type", content_type),
+                    ("content-length", str(len(body))),
+                    *((name.lower(), value) for name, value in (headers or {}).items())
+                ], end_stream=not body)
+                self._flush()
+            chunk_bytes = max(int(drip.get("chunk_bytes", 1024)), 1) if drip else len(body)
+            interval = drip.get("interval_ms", 10) / 1000 if drip else 0
+            offset = 0
+            while offset < len(body):
+                with self.cond:
+                    # 按流控窗口和最大帧长分帧发送，窗口用完时等待对端更新
+                    size = min(chunk_bytes, len(body) - offset, self.conn.local_flow_control_window(stream_id),
+                               self.conn.max_outbound_frame_size)
+                    if size <= 0:
+                        self.cond.wait(1)
+                        if self.closed:
+                            return
+                        continue
+                    offset += size
+                    self.conn.send_data(stream_id, body[offset - size:offset], end_stream=offset >= len(body))
+                    self._flush()
+                if interval:
+                    time.sleep(interval)
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+
+class FakeUpstreamServer(ThreadingHTTPServer):
+    """本地上游回放服务"""
+
+    daemon_threads = True
+
+    def __init__(self, address, profile: FaultProfile, store: Optional[FixtureStore] = None):
+        super().__init__(address, FakeUpstreamHandler)
+        self.profile = profile
+        self.store = store or FixtureStore()
+        self.stats = UpstreamStats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def start_fake_upstream(host: str = "127.0.0.1", port: int = 0,
+                        profile: Optional[FaultProfile] = None) -> FakeUpstreamServer:
+    """在后台线程启动回放服务，port=0 时自动分配端口"""
+    server = FakeUpstreamServer((host, port), profile or FaultProfile())
+    thread = threading.Thread(target=server.serve_forever, name="fake-upstream", daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="本地上游回放服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--profile", default="fast", help="内置配置名（fast/realistic/flaky/throttled）或 JSON 配置文件")
+    parser.add_argument("--seed", type=int, help="随机种子，便于复现")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = FakeUpstreamServer((args.host, args.port), FaultProfile.load(args.profile, args.seed))
+    logger.info(f"上游回放服务启动在 {server.base_url}，配置 {args.profile}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+news_callback({"total": 50, "items": [{"id": "40000000", "title": "网络安全引发热议：暴雨预警第1期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000000.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000001", "title": "人工智能最新进展：AI大模型第2期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000001.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000002", "title": "暴雨预警背后的故事：网络安全第3期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000002.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000003", "title": "冬奥会持续升温：中秋假期第4期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000003.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000004", "title": "航天员出舱背后的故事：新款手机第5期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000004.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000005", "title": "奥运冠军引发热议：房贷利率第6期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000005.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000006", "title": "暴雨预警背后的故事：科技创新第7期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000006.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000007", "title": "演唱会门票背后的故事：芯片突破第8期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000007.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000008", "title": "电影票房持续升温：科技创新第9期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000008.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000009", "title": "数字人民币再创新高：世界杯预选赛第10期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000009.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000010", "title": "芯片突破最新进展：乡村振兴第11期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000010.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000011", "title": "AI大模型再创新高：数字人民币第12期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000011.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000012", "title": "航天员出舱背后的故事：油价调整第13期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000012.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000013", "title": "房贷利率背后的故事：AI大模型第14期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000013.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000014", "title": "世界杯预选赛引发热议：乡村振兴第15期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000014.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000015", "title": "博物馆官方回应：芯片突破第16期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000015.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000016", "title": "乡村振兴最新进展：人工智能第17期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000016.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000017", "title": "秋招背后的故事：延迟退休第18期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000017.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000018", "title": "演唱会门票官方回应：国产大飞机第19期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000018.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000019", "title": "乡村振兴引发热议：网络安全第20期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000019.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000020", "title": "秋招引发热议：城市更新第21期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000020.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000021", "title": "暴雨预警最新进展：房贷利率第22期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000021.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000022", "title": "世界杯预选赛背后的故事：航天员出舱第23期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000022.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000023", "title": "网络安全持续升温：油价调整第24期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000023.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000024", "title": "数字人民币最新进展：秋招第25期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000024.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000025", "title": "中秋假期官方回应：秋招第26期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000025.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000026", "title": "数字人民币官方回应：乡村振兴第27期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000026.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000027", "title": "中秋假期背后的故事：演唱会门票第28期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000027.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000028", "title": "博物馆持续升温：世界杯预选赛第29期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000028.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000029", "title": "科技创新再创新高：城市更新第30期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000029.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000030", "title": "奥运冠军最新进展：网络安全第31期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000030.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000031", "title": "新能源汽车引发热议：AI大模型第32期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000031.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000032", "title": "乡村振兴背后的故事：世界杯预选赛第33期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000032.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000033", "title": "新款手机官方回应：旅游热度第34期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000033.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000034", "title": "乡村振兴再创新高：数字人民币第35期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000034.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000035", "title": "考研报名官方回应：芯片突破第36期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000035.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000036", "title": "暴雨预警最新进展：新能源汽车第37期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000036.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000037", "title": "世界杯预选赛官方回应：网络安全第38期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000037.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000038", "title": "房贷利率引发热议：人工智能第39期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000038.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000039", "title": "乡村振兴背后的故事：世界杯预选赛第40期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000039.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000040", "title": "科技创新引发热议：延迟退休第41期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000040.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000041", "title": "台风路径官方回应：数字人民币第42期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000041.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000042", "title": "人工智能持续升温：新款手机第43期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000042.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000043", "title": "房贷利率引发热议：旅游热度第44期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000043.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000044", "title": "中秋假期引发热议：电影票房第45期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000044.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000045", "title": "高考志愿最新进展：演唱会门票第46期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000045.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000046", "title": "考研报名官方回应：房贷利率第47期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000046.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000047", "title": "芯片突破再创新高：博物馆第48期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000047.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000048", "title": "暴雨预警持续升温：人工智能第49期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000048.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}, {"id": "40000049", "title": "冬奥会官方回应：乡村振兴第50期", "url": "http://politics.people.com.cn/n1/2026/1019/c1001-40000049.html", "date": "2026-10-19 10:00:00", "nodeId": "1001"}]});
@@ -0,0 +1,264 @@
+# HTTP 负载测试
+# 以指定并发压测应用接口（默认连接本地上游回放服务），输出吞吐、延迟分位数、错误率和服务进程内存
+#
+# 用法：
+#   python -m benchmarks.loadtest --server wsgi -c 32 -d 30 -o wsgi.json
+#   python -m benchmarks.loadtest --target http://127.0.0.1:8080 -e /all -e /baidu
+#   python -m benchmarks.loadtest --server wsgi --compare wsgi.json
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.replay import FixtureStore
+
+logger = logging.getLogger(__name__)
+
+# 服务启动方式，{port} 会替换为实际端口；新增服务模式时在这里登记
+SERVER_MODES: Dict[str, List[str]] = {
+    "wsgi": [sys.executable, "main.py"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", "{port}",
+             "--log-level", "warning"],
+}
+
+def default_endpoints() -> List[str]:
+    """默认压测接口：聚合接口、接口列表和全部平台接口"""
+    routes = {"/" + name for name in FixtureStore().platforms()}
+    return ["/all", "/api/hot-search", "/apis"] + sorted(routes)
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """分位数（最近秩）"""
+    if not sorted_values:
+        return 0.0
+    index = min(max(int(round(p / 100 * len(sorted_values))) - 1, 0), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def _read_rss_kib(pid: int) -> int:
+    """读取进程及其子进程的常驻内存（Linux）"""
+    total = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+    for current in pids:
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            continue
+    return total
+
+class ManagedProcess:
+    """压测期间托管的子进程"""
+
+    def __init__(self, command: List[str], env: Dict[str, str]):
+        self.process = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env},
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def wait_ready(url: str, timeout: float = 30):
+    """等待服务就绪"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"服务未在 {timeout} 秒内就绪: {url}")
+
+class LoadGenerator:
+    """多线程负载生成器"""
+
+    def __init__(self, target: str, endpoints: List[str], concurrency: int,
+                 duration: float, max_requests: Optional[int], timeout: float):
+        self.target = target.rstrip("/")
+        self.endpoints = endpoints
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._issued = 0
+        # 端点 -> [(耗时秒, 状态码或 0 表示异常)]
+        self.samples: Dict[str, List[Any]] = defaultdict(list)
+
+    def _next(self) -> bool:
+        with self._lock:
+            if self.max_requests is not None and self._issued >= self.max_requests:
+                return False
+            self._issued += 1
+            return True
+
+    def _worker(self, deadline: float, seed: int):
+        session = requests.Session()
+        rng = random.Random(seed)
+        local = defaultdict(list)
+        while time.perf_counter() < deadline and self._next():
+            endpoint = rng.choice(self.endpoints)
+            start = time.perf_counter()
+            try:
+                response = session.get(self.target + endpoint, timeout=self.timeout)
+                response.content
+                status = response.status_code
+            except requests.RequestException:
+                status = 0
+            local[endpoint].append((time.perf_counter() - start, status))
+        with self._lock:
+            for endpoint, samples in local.items():
+                self.samples[endpoint].extend(samples)
+
+    def run(self, memory_pid: Optional[int] = None) -> Dict[str, Any]:
+        """执行压测"""
+        start = time.perf_counter()
+        deadline = start + self.duration
+        workers = [threading.Thread(target=self._worker, args=(deadline, i), daemon=True)
+                   for i in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+
+        rss_samples = []
+        while any(worker.is_alive() for worker in workers):
+            if memory_pid:
+                rss_samples.append(_read_rss_kib(memory_pid))
+            time.sleep(0.5)
+        elapsed = time.perf_counter() - start
+
+        report = {"elapsed_s": round(elapsed, 2), "endpoints": {}}
+        everything = []
+        for endpoint, samples in sorted(self.samples.items()):
+            report["endpoints"][endpoint] = summarize(samples, elapsed)
+            everything.extend(samples)
+        report["overall"] = summarize(everything, elapsed)
+        if rss_samples:
+            report["memory"] = {"rss_max_kib": max(rss_samples), "rss_last_kib": rss_samples[-1]}
+        return report
+
+def summarize(samples: List[Any], elapsed: float) -> Dict[str, Any]:
+    """汇总一组请求样本"""
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if status == 0 or status >= 500)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round((latencies[-1] if latencies else 0) * 1000, 1)
+    }
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """打印报告，提供基线时显示 p99 变化"""
+    print(f"server={report['server']} concurrency={report['concurrency']} elapsed={report['elapsed_s']}s")
+    header = f"{'endpoint':<20}{'reqs':>8}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    if baseline:
+        header += f"{'Δp99':>9}"
+    print(header)
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for endpoint, stats in rows:
+        line = (f"{endpoint:<20}{stats['requests']:>8}{stats['throughput_rps']:>9.1f}"
+                f"{stats['error_rate'] * 100:>7.2f}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+                f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+        if baseline:
+            old = baseline["overall"] if endpoint == "overall" else baseline["endpoints"].get(endpoint)
+            if old and old["p99_ms"]:
+                line += f"{(stats['p99_ms'] - old['p99_ms']) / old['p99_ms'] * 100:>+8.1f}%"
+            else:
+                line += f"{'-':>9}"
+        print(line)
+    if "memory" in report:
+        print(f"server rss max={report['memory']['rss_max_kib']} KiB last={report['memory']['rss_last_kib']} KiB")
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 负载测试")
+    parser.add_argument("--server", choices=sorted(SERVER_MODES), default="wsgi", help="启动的服务模式")
+    parser.add_argument("--target", help="压测已运行的服务，不再自行启动")
+    parser.add_argument("--port", type=int, default=18080, help="自行启动服务时使用的端口")
+    parser.add_argument("--upstream", help="上游覆盖地址，默认启动本地回放服务")
+    parser.add_argument("--upstream-port", type=int, default=19000)
+    parser.add_argument("--profile", default="realistic", help="回放服务的延迟/故障配置")
+    parser.add_argument("-e", "--endpoint", action="append", help="压测接口，可重复，默认全部")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=30, help="压测时长（秒）")
+    parser.add_argument("-n", "--requests", type=int, help="请求总数上限")
+    parser.add_argument("--timeout", type=float, default=30, help="单个请求超时（秒）")
+    parser.add_argument("-o", "--output", help="将报告保存为 JSON")
+    parser.add_argument("--compare", help="与之前保存的 JSON 报告对比")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    processes = []
+    try:
+        upstream = args.upstream
+        if not upstream and not args.target:
+            processes.append(ManagedProcess(
+                [sys.executable, "-m", "benchmarks.fake_upstream", "--port", str(args.upstream_port),
+                 "--profile", args.profile, "--seed", "1"], {}))
+            upstream = f"http://127.0.0.1:{args.upstream_port}"
+            wait_ready(f"{upstream}/__stats")
+
+        target = args.target
+        server_pid = None
+        if not target:
+            command = [part.format(port=args.port) for part in SERVER_MODES[args.server]]
+            server = ManagedProcess(command, {"PORT": str(args.port), "UPSTREAM_BASE_URL": upstream})
+            processes.append(server)
+            server_pid = server.pid
+            target = f"http://127.0.0.1:{args.port}"
+            wait_ready(f"{target}/api/health")
+
+        endpoints = args.endpoint or default_endpoints()
+        logger.info(f"开始压测 {target}，并发 {args.concurrency}，接口 {len(endpoints)} 个")
+        generator = LoadGenerator(target, endpoints, args.concurrency, args.duration, args.requests, args.timeout)
+        report = generator.run(memory_pid=server_pid)
+        report.update({
+            "server": "external" if args.target else args.server,
+            "concurrency": args.concurrency,
+            "profile": args.profile,
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        })
+    finally:
+        for process in reversed(processes):
+            process.stop()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# 录制数据回放
+# 按 fixtures/manifest.json 把上游 URL 映射到本地录制的响应，供基准测试和离线回放使用
+import io
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+class Fixture:
+    """单条录制数据"""
+
+    def __init__(self, entry: Dict, fixtures_dir: str):
+        self.platform = entry["platform"]
+        self.service = entry["service"]
+        self.method = entry.get("method", "GET")
+        self.pattern = re.compile(entry["pattern"])
+        self.file = entry["file"]
+        self.content_type = entry.get("content_type", "application/octet-stream")
+        self.template = entry.get("template", False)
+        with open(os.path.join(fixtures_dir, self.file), "rb") as f:
+            self._body = f.read()
+
+    def matches(self, method: str, url: str) -> bool:
+        """是否匹配请求"""
+        return method.upper() == self.method and self.pattern.search(url) is not None
+
+    def body(self, url: Optional[str] = None) -> bytes:
+        """响应体，模板数据按 URL 中的月份（pattern 中的命名分组 MM）填充，没有时按当前日期"""
+        if not self.template:
+            return self._body
+        match = self.pattern.search(url) if url else None
+        month = match.groupdict().get("MM") if match else None
+        return self._body.replace(b"{{MM}}", (month or datetime.now().strftime("%m")).encode())
+
+class FixtureStore:
+    """录制数据集合"""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR):
+        with open(os.path.join(fixtures_dir, "manifest.json"), encoding="utf-8") as f:
+            self.fixtures = [Fixture(entry, fixtures_dir) for entry in json.load(f)]
+
+    def find(self, method: str, url: str) -> Optional[Fixture]:
+        """查找匹配请求的录制数据"""
+        for fixture in self.fixtures:
+            if fixture.matches(method, url):
+                return fixture
+        return None
+
+    def platforms(self) -> Dict[str, str]:
+        """平台标识 -> 服务类名"""
+        return {fixture.platform: fixture.service for fixture in self.fixtures}
+
+    def for_platform(self, platform: str) -> List[Fixture]:
+        """某个平台的全部录制数据"""
+        return [fixture for fixture in self.fixtures if fixture.platform == platform]
+
+class FixtureAdapter(BaseAdapter):
+    """从录制数据返回响应的 requests 适配器，不产生网络请求"""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        fixture = self.store.find(request.method, request.url)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.elapsed = timedelta(0)
+        if fixture is None:
+            body = b"fixture not found"
+            response.status_code = 404
+            response.headers = CaseInsensitiveDict({"Content-Type": "text/plain"})
+        else:
+            body = fixture.body(request.url)
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict({
+                "Content-Type": fixture.content_type,
+                "Content-Length": str(len(body))
+            })
+        response.reason = "OK" if response.status_code == 200 else "Not Found"
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        return response
+
+    def close(self):
+        pass
+
+def create_replay_session(store: Optional[FixtureStore] = None) -> requests.Session:
+    """创建回放录制数据的 Session"""
+    session = requests.Session()
+    adapter = FixtureAdapter(store or FixtureStore())
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
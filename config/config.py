@@ -1,5 +1,6 @@
 # 配置模块
 import os
+import tempfile
 
 class Config:
     """应用配置类"""
@@ -11,6 +12,85 @@ class Config:
         # API 配置
         self.api_timeout = int(os.getenv("API_TIMEOUT", "10"))
         
+        # 上游请求调度：按主机族（如 baidu.com）限制并发数和速率（次/秒，0 表示不限速），超出时排队
+        self.outbound_max_in_flight = int(os.getenv("OUTBOUND_MAX_IN_FLIGHT", "4"))
+        self.outbound_rate = float(os.getenv("OUTBOUND_RATE", "10"))
+        self.outbound_burst = float(os.getenv("OUTBOUND_BURST", "20"))
+        self.outbound_queue_timeout = float(os.getenv("OUTBOUND_QUEUE_TIMEOUT", str(self.api_timeout)))
+        # 单独配置的主机族，格式 "baidu.com=2/5/10,bilibili.com=4/8/16"（并发数/速率/桶容量）
+        self.outbound_host_limits = os.getenv("OUTBOUND_HOST_LIMITS", "")
+        
+        # 进程共享的抓取线程池大小，/all 聚合、共享快照刷新和缓存后台刷新共用
+        self.fetch_workers = int(os.getenv("FETCH_WORKERS", "16"))
+        
+        # 对冲请求：声明了备用来源（alternates）的平台，主接口超过近期耗时的该分位数仍未返回时启动备用来源；
+        # 样本不足时按 hedge_delay 秒
+        self.hedge_percentile = float(os.getenv("HEDGE_PERCENTILE", "95"))
+        self.hedge_delay = float(os.getenv("HEDGE_DELAY", "1.0"))
+        
+        # 入站准入控制：同时进行的实时抓取数上限（0 表示不限）、等待队列长度和最长等待秒数，
+        # 超出时返回旧数据或 503，Retry-After 为 admission_retry_after 秒
+        self.admission_max_concurrent = int(os.getenv("ADMISSION_MAX_CONCURRENT", "4"))
+        self.admission_max_queue = int(os.getenv("ADMISSION_MAX_QUEUE", "4"))
+        self.admission_queue_timeout = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+        self.admission_retry_after = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+        
+        # 上游连接预热：启动后在后台解析全部上游主机并建立连接，之后每 warmup_interval 秒补足空闲期间断开的连接
+        # （0 表示只在启动时预热，负数表示不预热）；gunicorn worker 最多等待 warmup_wait 秒完成首次预热再接收请求
+        self.warmup_interval = float(os.getenv("WARMUP_INTERVAL", "60"))
+        self.warmup_concurrency = int(os.getenv("WARMUP_CONCURRENCY", "8"))
+        self.warmup_connections = int(os.getenv("WARMUP_CONNECTIONS", "1"))
+        self.warmup_wait = float(os.getenv("WARMUP_WAIT", "5"))
+        # 上游主机 DNS 解析结果的缓存时间（秒），0 表示不缓存
+        self.dns_cache_ttl = float(os.getenv("DNS_CACHE_TTL", "300"))
+        
+        # 上游 HTTP/2：启用后 https 上游经 ALPN 协商 HTTP/2，每个源站一个多路复用连接，不支持的源站自动改用 HTTP/1.1
+        # （需要安装 httpx[http2]）；upstream_http2_prior_knowledge 对 http 上游直接使用 h2c，用于本地回放服务
+        self.upstream_http2 = os.getenv("UPSTREAM_HTTP2", "0") == "1"
+        self.upstream_http2_prior_knowledge = os.getenv("UPSTREAM_HTTP2_PRIOR_KNOWLEDGE", "0") == "1"
+        
+        # 每个平台最多抽取的条目数，0 表示不限；平台定义中的 limit 优先
+        self.item_limit = int(os.getenv("ITEM_LIMIT", "0"))
+        
+        # 热搜缓存有效期（秒）
+        self.cache_ttl = float(os.getenv("CACHE_TTL", "60"))
+        
+        # 缓存后端：memory（进程内 LRU）、disk（本地目录）或 redis（多节点共用）
+        self.cache_backend = os.getenv("CACHE_BACKEND", "memory")
+        self.cache_max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.cache_dir = os.getenv("CACHE_DIR", "/tmp/hot_search_cache")
+        self.cache_redis_url = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+        
+        # 热启动目录：每次抓取后持久化各平台数据，重启后先返回旧数据再后台刷新；设为空字符串禁用
+        self.warm_start_dir = os.getenv("WARM_START_DIR", os.path.join(tempfile.gettempdir(), "hot_search_warm"))
+        self.warm_start_max_age = float(os.getenv("WARM_START_MAX_AGE", "86400"))
+        
+        # 多进程共享快照目录，为空时不启用（多 worker 部署建议使用 /dev/shm/hot_search）
+        self.snapshot_dir = os.getenv("SNAPSHOT_DIR", "")
+        self.snapshot_refresh_interval = float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", str(self.cache_ttl)))
+        # 快照目录中保留的历史版本文件数，负数表示全部保留（供历史数据导出）
+        self.snapshot_history = int(os.getenv("SNAPSHOT_HISTORY", "10"))
+        # 历史数据导出：Parquet 文件每个行组的行数（内存占用随之固定）和压缩算法
+        self.export_row_group_rows = int(os.getenv("EXPORT_ROW_GROUP_ROWS", "65536"))
+        self.export_compression = os.getenv("EXPORT_COMPRESSION", "zstd")
+        
+        # 上游地址覆盖，设置后所有平台请求改发到该地址（如本地回放服务 http://127.0.0.1:9000）
+        self.upstream_base_url = os.getenv("UPSTREAM_BASE_URL", "").rstrip("/")
+        
+        # /apis 与 /apis.json 的浏览器缓存时间（秒），内容随部署变化时 ETag 随之变化
+        self.apis_cache_max_age = int(os.getenv("APIS_CACHE_MAX_AGE", "86400"))
+        
+        # CDN 缓存响应头：热搜数据的 s-maxage 为数据刷新间隔，并带 Age、Vary 和 Surrogate-Key，由边缘缓存承接重复请求；
+        # cdn_max_age 为浏览器缓存时间（秒），边缘缓存过期后 stale-while-revalidate 秒内先返回旧数据并后台回源，
+        # 回源失败时 stale-if-error 秒内继续使用旧数据（0 表示不输出该指令）；设为 0 时不输出这些响应头
+        self.cdn_cache = os.getenv("CDN_CACHE", "1") == "1"
+        self.cdn_max_age = int(os.getenv("CDN_MAX_AGE", "0"))
+        self.cdn_stale_while_revalidate = int(os.getenv("CDN_STALE_WHILE_REVALIDATE", "60"))
+        self.cdn_stale_if_error = int(os.getenv("CDN_STALE_IF_ERROR", "86400"))
+        
+        # 管理接口令牌，为空时禁用 /admin 接口
+        self.admin_token = os.getenv("ADMIN_TOKEN", "")
+        
         # 数据库配置
         self.db_host = os.getenv("DB_HOST", "localhost")
         self.db_port = os.getenv("DB_PORT", "5432")
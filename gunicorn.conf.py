@@ -0,0 +1,24 @@
+# gunicorn 配置
+# 运行：gunicorn -c gunicorn.conf.py main:app
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', os.getenv('SERVER_PORT', '8080'))}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = 60
+
+# 多 worker 共用一份快照，只有一个进程抓取上游
+raw_env = [f"SNAPSHOT_DIR={os.getenv('SNAPSHOT_DIR', '/dev/shm/hot_search')}"]
+
+def post_worker_init(worker):
+    """worker 启动后立即参与刷新进程竞选，避免等到第一个请求"""
+    from config.config import config
+    from services.all_service import get_all_service
+    from services.warmup import start_warmup
+    
+    snapshot = get_all_service().snapshot
+    if snapshot is not None:
+        snapshot.ensure_started()
+    # 等待首次上游预热完成，部署后第一批请求直接复用已建立的连接
+    start_warmup(wait=config.warmup_wait)
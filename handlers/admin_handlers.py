@@ -0,0 +1,130 @@
+# 管理接口处理器
+from flask import jsonify, Blueprint, request, Response, g
+import hmac
+import logging
+import time
+
+from config.config import config
+from models.models import ApiResponse
+from services.all_service import get_all_service
+from services.history_export import (CONTENT_TYPES, EXPORT_FORMATS, export_filename, export_history,
+                                     parquet_available, parse_platforms, parse_time)
+from services.warmup import get_warmup
+from utils import cache_headers, tracing
+from utils.outbound import get_scheduler
+from utils.profiling import profile_session
+
+# 创建蓝图
+admin_bp = Blueprint('admin', __name__)
+logger = logging.getLogger(__name__)
+
+def _authorized() -> bool:
+    """校验管理令牌"""
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(config.admin_token) and hmac.compare_digest(token, config.admin_token)
+
+@admin_bp.before_request
+def check_admin_token():
+    """管理接口需要 X-Admin-Token"""
+    if not _authorized():
+        error_response = ApiResponse(code=403, message="无权访问管理接口", data=None)
+        return jsonify(error_response.to_dict()), 403
+
+@admin_bp.after_request
+def disable_caching(response: Response) -> Response:
+    """管理接口的响应不允许缓存"""
+    response.headers.update(cache_headers.no_store_headers())
+    return response
+
+@admin_bp.route('/profile', methods=['POST'])
+def start_profile():
+    """对接下来的 N 个请求进行 cProfile 采样，只分析请求线程，线程池中执行的抓取任务不在结果中"""
+    try:
+        count = int(request.args.get("requests", "10"))
+    except ValueError:
+        error_response = ApiResponse(code=400, message="requests 参数必须为整数", data=None)
+        return jsonify(error_response.to_dict()), 400
+    
+    profile_session.arm(count)
+    logger.info(f"开启性能分析，采样 {count} 个请求")
+    return jsonify(ApiResponse(data=profile_session.status()).to_dict())
+
+@admin_bp.route('/profile', methods=['GET'])
+def get_profile():
+    """下载采样结果，format=text 返回文本报告"""
+    if request.args.get("format") == "text":
+        report = profile_session.report()
+        if report is not None:
+            return Response(report, mimetype="text/plain")
+    else:
+        data = profile_session.dump()
+        if data is not None:
+            return Response(data, mimetype="application/octet-stream",
+                            headers={"Content-Disposition": "attachment; filename=hot_search.prof"})
+    
+    response = ApiResponse(code=404, message="暂无性能分析结果", data=profile_session.status())
+    return jsonify(response.to_dict()), 404
+
+@admin_bp.route('/outbound', methods=['GET'])
+def get_outbound_status():
+    """各上游主机族的并发、排队和当前速率"""
+    return jsonify(ApiResponse(data=get_scheduler().status()).to_dict())
+
+@admin_bp.route('/admission', methods=['GET'])
+def get_admission_status():
+    """入站准入控制的实时抓取数和排队数"""
+    return jsonify(ApiResponse(data=get_all_service().admission.status()).to_dict())
+
+@admin_bp.route('/warmup', methods=['GET'])
+def get_warmup_status():
+    """上游预热状态和 DNS 缓存"""
+    return jsonify(ApiResponse(data=get_warmup().status()).to_dict())
+
+@admin_bp.route('/export', methods=['GET'])
+def export_history_data():
+    """流式导出共享快照中保存的历史热搜：from/to 为时间范围，platforms 为逗号分隔的平台，format 为 ndjson 或 parquet"""
+    export_format = request.args.get("format", "ndjson")
+    try:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"format 参数必须为 {' 或 '.join(EXPORT_FORMATS)}")
+        start = parse_time(request.args.get("from", "0"))
+        end = parse_time(request.args["to"]) if request.args.get("to") else time.time()
+        platforms = parse_platforms(request.args.getlist("platforms"))
+    except ValueError as e:
+        error_response = ApiResponse(code=400, message=str(e), data=None)
+        return jsonify(error_response.to_dict()), 400
+    if not config.snapshot_dir:
+        error_response = ApiResponse(code=404, message="未启用共享快照，没有可导出的历史数据", data=None)
+        return jsonify(error_response.to_dict()), 404
+    if export_format == "parquet" and not parquet_available():
+        error_response = ApiResponse(code=501, message="Parquet 导出需要安装 pyarrow", data=None)
+        return jsonify(error_response.to_dict()), 501
+    
+    filename = export_filename(export_format, start, end)
+    return Response(export_history(export_format, start, end, platforms), content_type=CONTENT_TYPES[export_format],
+                    headers={"Content-Disposition": f"attachment; filename={filename}", "X-Accel-Buffering": "no"})
+
+def init_request_hooks(app):
+    """注册请求追踪和按需性能分析的钩子"""
+    
+    @app.before_request
+    def begin_request():
+        g.trace_token = tracing.start_trace()
+        # 管理接口本身不参与采样
+        g.profiler = None if request.path.startswith("/admin") else profile_session.start_request()
+    
+    @app.after_request
+    def add_server_timing(response):
+        trace = tracing.current_trace()
+        if trace is not None:
+            response.headers["Server-Timing"] = trace.server_timing()
+        return response
+    
+    @app.teardown_request
+    def end_request(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profile_session.finish_request(profiler)
+        token = g.pop("trace_token", None)
+        if token is not None:
+            tracing.end_trace(token)
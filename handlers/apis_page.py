@@ -0,0 +1,176 @@
+# API 列表页面
+# /apis 与 /apis.json 的内容，Flask 与 ASGI 入口共用
+# 两个页面都由平台注册表生成，在模块加载时渲染一次，之后直接返回编码好的响应体：
+#   - 图标为内联的 SVG 字标（平台名首字 + 品牌色）data URI，页面不再请求第三方站点的 favicon
+#   - 响应带按内容计算的强 ETag 和较长的 Cache-Control（边缘缓存同样保留），If-None-Match 匹配时返回 304
+import hashlib
+from html import escape
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from config.config import config
+from models.models import ApiResponse
+from services.registry import PLATFORMS
+from utils.cache_headers import static_headers
+
+# 字标图标的背景色（各平台的品牌主色），未列出的平台使用默认色
+ICON_COLORS = {
+    "baidu": "#2932e1",
+    "bilibili": "#fb7299",
+    "weibo": "#e6162d",
+    "zhihu": "#0066ff",
+    "360search": "#19b955",
+    "acfun": "#fd4c5d",
+    "csdn": "#fc5531",
+    "dongqiudi": "#16b13a",
+    "douban": "#007722",
+    "douyin": "#161823",
+    "github": "#24292f",
+    "guojiadili": "#f5b400",
+    "history": "#8c6d46",
+    "hupu": "#c60100",
+    "ithome": "#d22222",
+    "lishipin": "#3fb2b8",
+    "pengpai": "#00468c",
+    "qqnews": "#0052d9",
+    "shaoshupai": "#d71a1b",
+    "sougou": "#fe620d",
+    "toutiao": "#f04142",
+    "v2ex": "#333344",
+    "wangyi": "#c4161c",
+    "xinjingbao": "#b2001f",
+    "quark": "#5a5fff",
+    "souhu": "#ffd100",
+    "renminwang": "#c4000a",
+    "nanfangzhoumo": "#1c1c1c",
+    "360doc": "#2d8cf0",
+    "cctv": "#0b4ea2",
+}
+DEFAULT_ICON_COLOR = "#607d8b"
+
+def icon_data_uri(name: str, color: str) -> str:
+    """平台名首字的圆形 SVG 字标，编码为 data URI"""
+    svg = (
+        "<svg xmlns='http://www.w3.org/2000/svg' width='48' height='48' viewBox='0 0 48 48'>"
+        f"<circle cx='24' cy='24' r='24' fill='{color}'/>"
+        "<text x='24' y='24' dy='.35em' text-anchor='middle' font-family='Arial,sans-serif' "
+        f"font-size='22' font-weight='bold' fill='#fff'>{escape(name[:1].upper())}</text></svg>"
+    )
+    return "data:image/svg+xml," + quote(svg, safe=" ='/:,.()")
+
+# /apis 与 /apis.json 共用的平台列表
+API_PLATFORMS: List[Dict[str, str]] = [
+    {
+        "name": platform.name,
+        "endpoint": platform.endpoint,
+        "icon": icon_data_uri(platform.name, ICON_COLORS.get(platform.slug, DEFAULT_ICON_COLOR))
+    }
+    for platform in PLATFORMS
+]
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>热搜 API 服务</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        h1 {
+            color: #333;
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .platform-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
+            gap: 20px;
+        }
+        .platform-card {
+            background-color: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            padding: 15px;
+            text-align: center;
+            transition: transform 0.2s, box-shadow 0.2s;
+        }
+        .platform-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+        }
+        .platform-card a {
+            text-decoration: none;
+            color: #333;
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+        }
+        .platform-icon {
+            width: 48px;
+            height: 48px;
+            margin-bottom: 10px;
+        }
+        .platform-name {
+            font-weight: bold;
+            margin-top: 8px;
+            font-size: 14px;
+        }
+        .footer {
+            margin-top: 40px;
+            text-align: center;
+            color: #666;
+        }
+    </style>
+</head>
+<body>
+    <h1>热搜 API 服务</h1>
+    <div class="platform-grid">
+"""
+
+_PAGE_TAIL = """    </div>
+    <div class="footer">
+        <p>热搜 API 服务 &copy; 2023</p>
+        <p><a href="/all" target="_blank">获取所有平台热搜</a></p>
+    </div>
+</body>
+</html>
+"""
+
+def render_apis_html() -> str:
+    """生成 API 列表页面"""
+    cards = "".join(
+        f"""        <div class="platform-card">
+            <a href="{escape(platform['endpoint'])}" target="_blank">
+                <img src="{platform['icon']}" alt="{escape(platform['name'])}" class="platform-icon" width="48" height="48">
+                <div class="platform-name">{escape(platform['name'])}</div>
+            </a>
+        </div>
+"""
+        for platform in API_PLATFORMS
+    )
+    return _PAGE_HEAD + cards + _PAGE_TAIL
+
+class StaticPage:
+    """预先渲染好的响应体及其缓存相关响应头"""
+
+    def __init__(self, body: bytes, content_type: str, max_age: int, surrogate_key: str):
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.headers = {"ETag": self.etag, **static_headers(max_age, surrogate_key)}
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        """请求的 If-None-Match 是否与 ETag 匹配（按弱比较，与 W/ 前缀无关）"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip() for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+APIS_HTML = StaticPage(render_apis_html().encode("utf-8"), "text/html; charset=utf-8", config.apis_cache_max_age, "apis")
+APIS_JSON = StaticPage(ApiResponse(data=API_PLATFORMS).to_json(), "application/json", config.apis_cache_max_age, "apis")
@@ -3,29 +3,38 @@ from flask import jsonify, Blueprint, request
 import logging
 
 from models.models import ApiResponse
-# 从 all_service 导入 AllService 替代原来的 HotSearchService
-from services.all_service import AllService
+from utils import cache_headers, metrics, tracing
+# 从 all_service 导入共享的 AllService 替代原来的 HotSearchService
+from services.all_service import ALL_KEY, get_all_service
+from handlers.all_handlers import data_response, error_response, shed_response
+from utils.admission import Overloaded
 
 # 创建蓝图
 api_bp = Blueprint('api', __name__)
-# 使用 AllService 替代 HotSearchService
-hot_search_service = AllService()
+# 使用 AllService 替代 HotSearchService，与 /all 共用同一实例和缓存
+hot_search_service = get_all_service()
 logger = logging.getLogger(__name__)
 
 @api_bp.route('/hot-search', methods=['GET'])
+@metrics.track_request("/api/hot-search", "all")
 def get_hot_search():
     """获取热搜接口"""
     try:
-        # 使用 get_all_hot_search 方法获取所有平台的热搜
-        all_hot_search = hot_search_service.get_all_hot_search()
+        body = hot_search_service.get_response_body(ALL_KEY)
+        if body is not None:
+            return data_response(ALL_KEY, body)
+        # 缓存未命中需要实时抓取时先经过准入控制
+        all_hot_search = hot_search_service.serve_all_hot_search()
         response = ApiResponse(data=all_hot_search)
-        return jsonify(response.to_dict())
+        with metrics.SERIALIZE_SECONDS.time("/api/hot-search", "all"), tracing.span("serialize"):
+            return data_response(ALL_KEY, response=response)
+    except Overloaded as e:
+        return shed_response(ALL_KEY, e)
     except Exception as e:
         logger.error(f"获取热搜失败: {str(e)}")
-        error_response = ApiResponse(code=500, message=f"服务器错误: {str(e)}", data=None)
-        return jsonify(error_response.to_dict()), 500
+        return error_response(f"服务器错误: {str(e)}")
 
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """健康检查接口"""
-    return jsonify({"status": "ok"}) 
\ No newline at end of file
+    return jsonify({"status": "ok"}), 200, cache_headers.no_store_headers() 
\ No newline at end of file
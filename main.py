@@ -6,6 +6,8 @@ import os
 from config.config import config
 from handlers.handlers import api_bp
 from handlers.all_handlers import all_bp
+from handlers.admin_handlers import admin_bp, init_request_hooks
+from services.warmup import start_warmup
 
 # 配置日志
 logging.basicConfig(
@@ -21,11 +23,10 @@ def create_app():
     # 注册蓝图
     app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(all_bp, url_prefix='/')
+    app.register_blueprint(admin_bp, url_prefix='/admin')
     
-    # 打印所有注册的路由
-    print("注册的路由:")
-    for rule in app.url_map.iter_rules():
-        print(f"{rule.endpoint}: {rule.rule}")
+    # 请求追踪（Server-Timing）与按需性能分析
+    init_request_hooks(app)
     
     return app
 
@@ -34,5 +35,7 @@ app = create_app() # Add this line
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", config.server_port))
     
+    # 后台预热上游 DNS 和连接；gunicorn 部署由 post_worker_init 在各 worker 中启动
+    start_warmup()
     logger.info(f"服务启动在端口 {port}")
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -0,0 +1,214 @@
+# 热搜条目的紧凑二进制编码
+# 用于缓存后端存储，避免 JSON 序列化往返。按字段分列存储：
+#   MAGIC(4) | 字段数 varint | 条目数 varint | 每个字段：字段名 | 列类型(1) | 列数据
+# 列类型：
+#   INT  - 全部为整数，array('q') 小端
+#   STR  - 全部为字符串，整列一段 UTF-8 + 每个值的字符数 array('I')
+#   DICT - 取值重复较多的字符串列（平台、抓取时间），去重后的 STR 列 + 索引 array('I')
+#   ANY  - 其他情况，逐个值带类型标记，允许缺失
+# 整列一次解码后按偏移切片，解码开销与 json.loads 相当，体积约为 JSON 的七成。
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List
+
+MAGIC = b"HSI2"
+
+_COL_INT = 0
+_COL_STR = 1
+_COL_DICT = 2
+_COL_ANY = 3
+
+_INT = 0
+_NEG_INT = 1
+_STR = 2
+_NONE = 3
+_FLOAT = 4
+_TRUE = 5
+_FALSE = 6
+_MISSING = 7
+
+_DOUBLE = struct.Struct("<d")
+_BIG_ENDIAN = sys.byteorder == "big"
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# 缺失字段占位
+_ABSENT = object()
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data: bytes, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _write_str(out: bytearray, value: str):
+    encoded = value.encode("utf-8")
+    _write_varint(out, len(encoded))
+    out += encoded
+
+def _read_str(data: bytes, pos: int):
+    length, pos = _read_varint(data, pos)
+    end = pos + length
+    return data[pos:end].decode("utf-8"), end
+
+def _write_array(out: bytearray, values: array):
+    if _BIG_ENDIAN:
+        values.byteswap()
+    out += values.tobytes()
+
+def _read_array(typecode: str, data: bytes, pos: int, count: int):
+    values = array(typecode)
+    end = pos + values.itemsize * count
+    values.frombytes(data[pos:end])
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values, end
+
+def _write_str_column(out: bytearray, values: List[str]):
+    blob = "".join(values).encode("utf-8")
+    _write_varint(out, len(blob))
+    out += blob
+    _write_array(out, array("I", [len(value) for value in values]))
+
+def _read_str_column(data: bytes, pos: int, count: int):
+    length, pos = _read_varint(data, pos)
+    text = data[pos:pos + length].decode("utf-8")
+    lengths, pos = _read_array("I", data, pos + length, count)
+    values = []
+    offset = 0
+    for size in lengths:
+        values.append(text[offset:offset + size])
+        offset += size
+    return values, pos
+
+def _write_value(out: bytearray, value: Any):
+    # bool 是 int 的子类，需先判断
+    if value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif value is None:
+        out.append(_NONE)
+    elif value is _ABSENT:
+        out.append(_MISSING)
+    elif isinstance(value, int):
+        out.append(_INT if value >= 0 else _NEG_INT)
+        _write_varint(out, abs(value))
+    elif isinstance(value, str):
+        out.append(_STR)
+        _write_str(out, value)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    else:
+        raise TypeError(f"不支持编码的类型: {type(value).__name__}")
+
+def _read_value(data: bytes, pos: int):
+    tag = data[pos]
+    pos += 1
+    if tag == _STR:
+        return _read_str(data, pos)
+    if tag in (_INT, _NEG_INT):
+        value, pos = _read_varint(data, pos)
+        return (value if tag == _INT else -value), pos
+    if tag == _NONE:
+        return None, pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _MISSING:
+        return _ABSENT, pos
+    raise ValueError(f"未知的类型标记: {tag}")
+
+def _write_column(out: bytearray, values: List[Any]):
+    types = {type(value) for value in values}
+    if types == {int} and all(_INT64_MIN <= value <= _INT64_MAX for value in values):
+        out.append(_COL_INT)
+        _write_array(out, array("q", values))
+    elif types == {str}:
+        distinct = list(dict.fromkeys(values))
+        if len(distinct) * 2 <= len(values):
+            index = {value: i for i, value in enumerate(distinct)}
+            out.append(_COL_DICT)
+            _write_varint(out, len(distinct))
+            _write_str_column(out, distinct)
+            _write_array(out, array("I", [index[value] for value in values]))
+        else:
+            out.append(_COL_STR)
+            _write_str_column(out, values)
+    else:
+        out.append(_COL_ANY)
+        for value in values:
+            _write_value(out, value)
+
+def _read_column(data: bytes, pos: int, count: int):
+    kind = data[pos]
+    pos += 1
+    if kind == _COL_INT:
+        values, pos = _read_array("q", data, pos, count)
+        return values.tolist(), pos
+    if kind == _COL_STR:
+        return _read_str_column(data, pos, count)
+    if kind == _COL_DICT:
+        size, pos = _read_varint(data, pos)
+        distinct, pos = _read_str_column(data, pos, size)
+        indexes, pos = _read_array("I", data, pos, count)
+        return [distinct[i] for i in indexes], pos
+    if kind == _COL_ANY:
+        values = []
+        for _ in range(count):
+            value, pos = _read_value(data, pos)
+            values.append(value)
+        return values, pos
+    raise ValueError(f"未知的列类型: {kind}")
+
+def encode_items(items: List[Dict[str, Any]]) -> bytes:
+    """编码一组热搜条目（HotSearchItem.to_dict() 的结果）"""
+    fields: Dict[str, None] = {}
+    for item in items:
+        fields.update(dict.fromkeys(item))
+
+    out = bytearray(MAGIC)
+    _write_varint(out, len(fields))
+    _write_varint(out, len(items))
+    for field in fields:
+        _write_str(out, field)
+        _write_column(out, [item.get(field, _ABSENT) for item in items])
+    return bytes(out)
+
+def decode_items(data: bytes) -> List[Dict[str, Any]]:
+    """解码 encode_items 的结果"""
+    if data[:4] != MAGIC:
+        raise ValueError("热搜条目编码格式错误")
+    field_count, pos = _read_varint(data, 4)
+    count, pos = _read_varint(data, pos)
+    fields = []
+    columns = []
+    for _ in range(field_count):
+        field, pos = _read_str(data, pos)
+        column, pos = _read_column(data, pos, count)
+        fields.append(field)
+        columns.append(column)
+
+    rows = zip(*columns) if columns else ([] for _ in range(count))
+    items = [dict(zip(fields, row)) for row in rows]
+    if any(value is _ABSENT for column in columns for value in column):
+        for item in items:
+            for field in [field for field, value in item.items() if value is _ABSENT]:
+                del item[field]
+    return items
@@ -1,4 +1,5 @@
 # 数据模型
+import json
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -67,4 +68,8 @@ class ApiResponse:
             "code": self.code,
             "message": self.message,
             "data": self.data
-        } 
\ No newline at end of file
+        }
+    
+    def to_json(self) -> bytes:
+        """序列化为紧凑的 UTF-8 JSON 字节串"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
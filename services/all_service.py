@@ -1,35 +1,320 @@
 # 聚合服务模块
+import json
 import logging
-from typing import Dict, List, Any
+import time
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 import concurrent.futures
 from threading import Lock
 
-from models.models import HotSearchItem
-from services.platform_services import (
-    BaiduService, BilibiliService, WeiboHotService, ZhihuService,
-    Search360Service, AcfunService, CSDNService, DongqiudiService,
-    DoubanService, DouyinService
-    # 导入其他平台服务...
-)
+from models.models import ApiResponse
+from services.cache import hot_search_cache
+from services.snapshot import create_shared_snapshot
+from services.registry import PLATFORMS, get_platform
+from utils import cache_headers, metrics, tracing
+from utils.admission import AdmissionController, Overloaded, create_admission_controller
+from utils.executor import get_executor
+
+# 共享快照中 /all 预编码响应体的键
+ALL_KEY = "all"
+
+# 流式 /all 的响应类型，每行一个 JSON 对象
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# /all 聚合的平台：展示名称 -> 平台标识
+AGGREGATE_PLATFORMS = {
+    "百度": "baidu",
+    "哔哩哔哩": "bilibili",
+    "微博": "weibo",
+    "知乎": "zhihu",
+    "360搜索": "360search",
+    "AcFun": "acfun",
+    "CSDN": "csdn",
+    "懂球帝": "dongqiudi",
+    "豆瓣": "douban",
+    "抖音": "douyin",
+    # 添加其他平台...
+}
+
+def accepts_ndjson(accept: Optional[str]) -> bool:
+    """请求的 Accept 是否要求流式 NDJSON"""
+    return bool(accept) and ("application/x-ndjson" in accept or "application/ndjson" in accept)
+
+def parse_batch_request(body: Any) -> Dict[str, int]:
+    """解析 /batch 请求体，返回 平台标识 -> 条数上限（0 表示不限），请求格式不正确时抛出 ValueError：
+    {"platforms": ["baidu", {"slug": "weibo", "limit": 10}], "limit": 20}
+    limit 为各平台默认的条数上限；同一平台出现多次时只抓取一次，条数取其中最大的上限"""
+    if not isinstance(body, dict) or not isinstance(body.get("platforms"), list) or not body["platforms"]:
+        raise ValueError("请求体必须为 JSON 对象，platforms 为非空的平台列表")
+    
+    def parse_limit(value: Any) -> int:
+        if value is None:
+            return 0
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError("limit 必须为非负整数")
+        return value
+    
+    default_limit = parse_limit(body.get("limit"))
+    limits: Dict[str, int] = {}
+    for entry in body["platforms"]:
+        if isinstance(entry, str):
+            slug, limit = entry, default_limit
+        elif isinstance(entry, dict) and isinstance(entry.get("slug"), str):
+            slug, limit = entry["slug"], parse_limit(entry.get("limit", default_limit))
+        else:
+            raise ValueError("platforms 的元素必须为平台标识或 {\"slug\", \"limit\"} 对象")
+        if slug in limits:
+            limit = 0 if limits[slug] == 0 or limit == 0 else max(limits[slug], limit)
+        limits[slug] = limit
+        if len(limits) > len(PLATFORMS):
+            raise ValueError(f"一次最多请求 {len(PLATFORMS)} 个平台")
+    return limits
+
+def _batch_result(hot_items: Optional[List[Dict[str, Any]]], limit: int, stale: bool = False) -> Dict[str, Any]:
+    """/batch 中单个平台的结果"""
+    result = {"code": 200, "message": "success", "data": hot_items[:limit] if limit else hot_items}
+    if stale:
+        result["stale"] = True
+    return result
+
+def _ndjson_line(value: Dict[str, Any]) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
 
 class AllService:
     """聚合所有平台热搜的服务"""
     
-    def __init__(self):
+    def __init__(self, cache=hot_search_cache, snapshot=None, admission: Optional[AdmissionController] = None):
         self.logger = logging.getLogger(__name__)
-        self.services = {
-            "百度": BaiduService(),
-            "哔哩哔哩": BilibiliService(),
-            "微博": WeiboHotService(),
-            "知乎": ZhihuService(),
-            "360搜索": Search360Service(),
-            "AcFun": AcfunService(),
-            "CSDN": CSDNService(),
-            "懂球帝": DongqiudiService(),
-            "豆瓣": DoubanService(),
-            "抖音": DouyinService(),
-            # 添加其他平台服务...
+        self.cache = cache
+        # 接口请求需要实时抓取时的准入控制
+        self.admission = admission or create_admission_controller()
+        # 多进程部署时的共享快照，由选出的刷新进程统一抓取
+        self.snapshot = snapshot
+        self._services = None
+        if snapshot is not None:
+            snapshot.aggregate_fn = self.encode_aggregates
+    
+    @property
+    def services(self) -> Dict[str, Any]:
+        """聚合的平台服务，首次使用时才创建"""
+        if self._services is None:
+            self._services = {name: get_platform(slug).get_service() for name, slug in AGGREGATE_PLATFORMS.items()}
+        return self._services
+    
+    def encode_aggregates(self, platforms: Dict[str, List[Dict[str, Any]]]) -> Dict[str, bytes]:
+        """由各平台数据生成写入快照的聚合响应体"""
+        data = {
+            name: platforms[slug]
+            for name, slug in AGGREGATE_PLATFORMS.items()
+            if platforms.get(slug)
         }
+        return {ALL_KEY: ApiResponse(data=data).to_json()}
+    
+    def get_response_body(self, key: str) -> Optional[memoryview]:
+        """共享快照中预编码的响应体（指向快照映射的切片），key 为平台标识或 ALL_KEY；未启用快照或已过期时返回 None"""
+        if self.snapshot is None:
+            return None
+        body = self.snapshot.body(key)
+        if body is not None:
+            metrics.CACHE_REQUESTS.inc(key, "snapshot")
+        return body
+    
+    def _surrogate_keys(self, key: str) -> List[str]:
+        """响应包含的平台，/all 带全部聚合平台，按平台清除 CDN 缓存时一并失效"""
+        return [ALL_KEY, *AGGREGATE_PLATFORMS.values()] if key == ALL_KEY else [key]
+    
+    def data_age(self, key: str) -> Optional[float]:
+        """当前返回的数据产生至今的秒数：优先取共享快照中未过期的条目，否则取缓存；/all 取最旧的平台"""
+        if self.snapshot is not None:
+            age = self.snapshot.age(key)
+            if age is not None and age <= self.snapshot.max_age:
+                return age
+        if key != ALL_KEY:
+            return self.cache.age(key)
+        ages = [age for age in (self.cache.age(slug) for slug in AGGREGATE_PLATFORMS.values()) if age is not None]
+        return max(ages) if ages else None
+    
+    def refresh_interval(self, key: str) -> float:
+        """数据的刷新间隔：启用共享快照时为快照刷新间隔，否则为缓存有效期（目前各平台相同）"""
+        return self.snapshot.refresh_interval if self.snapshot is not None else self.cache.ttl
+    
+    def response_headers(self, key: str) -> Dict[str, str]:
+        """热搜数据响应的 CDN 缓存头，key 为平台标识或 ALL_KEY"""
+        return cache_headers.data_headers(self._surrogate_keys(key), self.refresh_interval(key), self.data_age(key),
+                                          negotiated=key == ALL_KEY)
+    
+    def shed_headers(self, key: str, retry_after: int) -> Dict[str, str]:
+        """未获准入时返回旧数据的响应头"""
+        return cache_headers.shed_headers(self._surrogate_keys(key), retry_after, negotiated=key == ALL_KEY)
+    
+    def get_platform_hot_search(self, service) -> List[Dict[str, Any]]:
+        """获取单个平台的热搜，优先使用共享快照和缓存"""
+        if self.snapshot is not None:
+            hot_items = self.snapshot.get(service.platform)
+            if hot_items:
+                metrics.CACHE_REQUESTS.inc(service.platform, "snapshot")
+                return hot_items
+        
+        return self.cache.get_or_load(
+            service.platform,
+            lambda: [item.to_dict() for item in service.fetch_hot_search()]
+        )
+    
+    def peek_platform_hot_search(self, platform: str) -> Optional[List[Dict[str, Any]]]:
+        """共享快照或缓存中现成的单个平台热搜，不触发抓取"""
+        if self.snapshot is not None:
+            hot_items = self.snapshot.get(platform)
+            if hot_items:
+                metrics.CACHE_REQUESTS.inc(platform, "snapshot")
+                return hot_items
+        return self.cache.get(platform)
+    
+    def serve_platform_hot_search(self, service) -> List[Dict[str, Any]]:
+        """接口请求获取单个平台热搜：有现成数据时直接返回，需要实时抓取时先申请准入，未获准入时抛出 Overloaded"""
+        hot_items = self.peek_platform_hot_search(service.platform)
+        if hot_items is not None:
+            return hot_items
+        with self.admission.admit():
+            return self.get_platform_hot_search(service)
+    
+    def serve_all_hot_search(self) -> Dict[str, List[Dict[str, Any]]]:
+        """接口请求获取所有平台热搜：各平台都有现成数据时直接返回，否则申请准入后抓取，未获准入时抛出 Overloaded"""
+        result = {}
+        for name, slug in AGGREGATE_PLATFORMS.items():
+            hot_items = self.peek_platform_hot_search(slug)
+            if not hot_items:
+                with self.admission.admit():
+                    return self.get_all_hot_search()
+            result[name] = hot_items
+        return result
+    
+    def shed(self, key: str) -> Optional[Union[bytes, memoryview]]:
+        """未获准入时的旧数据响应体：快照中的响应体（不论是否过期），否则各平台最近一次抓取的数据；都没有时返回 None"""
+        platform = "all" if key == ALL_KEY else key
+        body = self.snapshot.last_body(key) if self.snapshot is not None else None
+        if body is None:
+            if key == ALL_KEY:
+                data = {}
+                for name, slug in AGGREGATE_PLATFORMS.items():
+                    hot_items = self.cache.last(slug)
+                    if hot_items:
+                        data[name] = hot_items
+            else:
+                data = self.cache.last(key)
+            if data:
+                body = ApiResponse(data=data).to_json()
+        metrics.ADMISSION_SHED.inc(platform, "stale" if body is not None else "unavailable")
+        return body
+    
+    def stream_all_hot_search(self) -> Iterator[bytes]:
+        """/all 的流式版本（NDJSON）：每个平台一行，已有现成数据的平台立即输出，其余平台按抓取完成的先后输出；
+        最后一行为汇总，包含各平台耗时和失败的平台。需要实时抓取时申请准入，未获准入时这些平台输出最近一次的旧数据。
+        请求耗时记录到最后一行写出（或客户端断开）为止，endpoint 为 /all.ndjson"""
+        with metrics.REQUEST_SECONDS.time("/all.ndjson", "all"):
+            yield from self._stream_all_hot_search()
+    
+    def _stream_all_hot_search(self) -> Iterator[bytes]:
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        failed: Dict[str, str] = {}
+        stale: List[str] = []
+        pending: Dict[str, str] = {}
+        for name, slug in AGGREGATE_PLATFORMS.items():
+            hot_items = self.peek_platform_hot_search(slug)
+            if hot_items:
+                timings[slug] = _elapsed_ms(start)
+                yield _ndjson_line({"code": 200, "message": "success", "platform": name, "slug": slug,
+                                    "elapsed_ms": timings[slug], "data": hot_items})
+            else:
+                pending[name] = slug
+        
+        if pending:
+            try:
+                with self.admission.admit():
+                    services = {slug: self.services[name] for name, slug in pending.items()}
+                    names = {slug: name for name, slug in pending.items()}
+                    for slug, hot_items, error in self._fetch_as_completed(services):
+                        name = names[slug]
+                        timings[slug] = _elapsed_ms(start)
+                        if hot_items:
+                            line = {"code": 200, "message": "success", "data": hot_items}
+                        else:
+                            failed[slug] = error or "未获取到热搜数据"
+                            line = {"code": 500 if error else 404, "message": failed[slug], "data": None}
+                        yield _ndjson_line({**line, "platform": name, "slug": slug, "elapsed_ms": timings[slug]})
+            except Overloaded as e:
+                for name, slug in pending.items():
+                    timings[slug] = _elapsed_ms(start)
+                    hot_items = self.cache.last(slug)
+                    if hot_items:
+                        stale.append(slug)
+                        line = {"code": 200, "message": "success", "stale": True, "data": hot_items}
+                    else:
+                        failed[slug] = str(e)
+                        line = {"code": 503, "message": failed[slug], "data": None}
+                    yield _ndjson_line({**line, "platform": name, "slug": slug, "elapsed_ms": timings[slug]})
+                metrics.ADMISSION_SHED.inc("all", "stale" if stale else "unavailable")
+        
+        yield _ndjson_line({"summary": {
+            "platforms": len(AGGREGATE_PLATFORMS),
+            "succeeded": len(AGGREGATE_PLATFORMS) - len(failed),
+            "failed": failed,
+            "stale": stale,
+            "timings_ms": timings,
+            "elapsed_ms": _elapsed_ms(start)
+        }})
+    
+    def serve_batch(self, limits: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+        """接口请求一次获取多个平台的热搜（平台标识 -> 条数上限），返回各平台的结果和状态：
+        已有现成数据的平台直接返回，其余平台申请一次准入后在共享抓取线程池中并发抓取；
+        未获准入时这些平台返回最近一次的旧数据（标记为 stale），没有旧数据时状态为 503"""
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Any] = {}
+        for slug in limits:
+            platform = get_platform(slug)
+            if platform is None:
+                results[slug] = {"code": 404, "message": f"未知平台: {slug}", "data": None}
+                continue
+            hot_items = self.peek_platform_hot_search(slug)
+            if hot_items:
+                results[slug] = _batch_result(hot_items, limits[slug])
+            else:
+                pending[slug] = platform.get_service()
+        
+        if pending:
+            try:
+                with self.admission.admit():
+                    for slug, hot_items, error in self._fetch_as_completed(pending):
+                        if hot_items:
+                            results[slug] = _batch_result(hot_items, limits[slug])
+                        elif error:
+                            results[slug] = {"code": 500, "message": error, "data": None}
+                        else:
+                            results[slug] = {"code": 404, "message": f"未找到{get_platform(slug).name}热搜数据", "data": None}
+            except Overloaded as e:
+                for slug in pending:
+                    hot_items = self.cache.last(slug)
+                    if hot_items:
+                        results[slug] = _batch_result(hot_items, limits[slug], stale=True)
+                    else:
+                        results[slug] = {"code": 503, "message": str(e), "data": None}
+                stale = any(results[slug]["code"] == 200 for slug in pending)
+                metrics.ADMISSION_SHED.inc("batch", "stale" if stale else "unavailable")
+        return {slug: results[slug] for slug in limits}
+    
+    def _fetch_as_completed(self, services: Dict[str, Any]) -> Iterator[Tuple[str, Optional[List[Dict[str, Any]]], str]]:
+        """在共享抓取线程池中并发抓取若干平台（平台标识 -> 服务），按完成顺序产出 (平台标识, 热搜数据, 错误信息)"""
+        executor = get_executor()
+        futures = {executor.submit(self.get_platform_hot_search, service): slug for slug, service in services.items()}
+        for future in concurrent.futures.as_completed(futures):
+            slug = futures[future]
+            try:
+                yield slug, future.result(), ""
+            except Exception as e:
+                self.logger.error(f"获取 {slug} 热搜失败: {str(e)}")
+                yield slug, None, f"获取失败: {str(e)}"
     
     def get_all_hot_search(self) -> Dict[str, List[Dict[str, Any]]]:
         """获取所有平台的热搜"""
@@ -38,20 +323,32 @@ class AllService:
         
         def fetch_platform_data(platform_name, service):
             try:
-                hot_items = service.get_hot_search()
+                with tracing.span("fetch"):
+                    hot_items = self.get_platform_hot_search(service)
                 if hot_items:
                     with mutex:
-                        result[platform_name] = [item.to_dict() for item in hot_items]
+                        result[platform_name] = hot_items
             except Exception as e:
                 self.logger.error(f"获取 {platform_name} 热搜失败: {str(e)}")
         
-        # 使用线程池并发获取各平台数据
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {
-                executor.submit(fetch_platform_data, name, service): name 
-                for name, service in self.services.items()
-            }
-            concurrent.futures.wait(futures)
+        # 使用进程共享的抓取线程池并发获取各平台数据
+        executor = get_executor()
+        concurrent.futures.wait([
+            executor.submit(fetch_platform_data, name, service)
+            for name, service in self.services.items()
+        ])
         
         self.logger.info(f"成功获取 {len(result)} 个平台的热搜数据")
-        return result 
\ No newline at end of file
+        return result
+
+_all_service = None
+_all_service_lock = Lock()
+
+def get_all_service() -> AllService:
+    """获取全局共享的聚合服务，Flask 与 ASGI 入口共用"""
+    global _all_service
+    if _all_service is None:
+        with _all_service_lock:
+            if _all_service is None:
+                _all_service = AllService(snapshot=create_shared_snapshot())
+    return _all_service
@@ -0,0 +1,134 @@
+# 热搜缓存模块
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config.config import config
+from services.cache_backends import CacheBackend, MemoryBackend, create_cache_backend
+from services.warm_start import WarmStartStore
+from utils import metrics, outbound
+from utils.executor import get_executor
+
+class HotSearchCache:
+    """按平台缓存热搜结果，同一平台并发未命中时只抓取一次"""
+    
+    def __init__(self, ttl: float, backend: Optional[CacheBackend] = None,
+                 warm_start: Optional[WarmStartStore] = None):
+        self.ttl = ttl
+        self.backend = backend or MemoryBackend()
+        # 热启动数据：进程启动后各平台第一次未命中时读取，刷新成功前作为旧数据返回
+        self.warm_start = warm_start
+        self._stale: Dict[str, Any] = {}
+        # 各平台最近一次写入的数据，缓存过期后仍保留，过载时作为旧数据返回
+        self._last: Dict[str, Any] = {}
+        # 各平台数据的产生时间（本进程写入时刻或热启动数据的保存时刻），用于响应的 Age
+        self._written_at: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+    
+    def peek(self, key: str) -> Optional[Any]:
+        """读取未过期的缓存，不触发抓取"""
+        return self.backend.get(key)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """读取未过期的缓存，命中时计数"""
+        value = self.peek(key)
+        if value is not None:
+            metrics.CACHE_REQUESTS.inc(key, "hit")
+        return value
+    
+    def set(self, key: str, value: Any):
+        """写入缓存"""
+        self.backend.set(key, value, self.ttl)
+        self._last[key] = value
+        self._written_at[key] = time.time()
+    
+    def last(self, key: str) -> Optional[Any]:
+        """最近一次写入的数据，不论是否过期；本进程尚未抓取过时使用热启动数据"""
+        value = self._last.get(key)
+        if value is None:
+            value = self._stale_for(key)
+        return value
+    
+    def age(self, key: str) -> Optional[float]:
+        """当前数据产生至今的秒数；数据由其他进程写入共享后端时无法得知，返回 None"""
+        written_at = self._written_at.get(key)
+        return time.time() - written_at if written_at is not None else None
+    
+    def _lock_for(self, key: str) -> threading.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(key, threading.Lock())
+        return lock
+    
+    def _stale_for(self, key: str) -> Optional[Any]:
+        """尚未刷新过的平台的热启动数据"""
+        if self.warm_start is None:
+            return None
+        if key not in self._stale:
+            loaded = self.warm_start.load(key)
+            self._stale[key] = loaded[0] if loaded else None
+            if loaded and key not in self._written_at:
+                self._written_at[key] = time.time() - loaded[1]
+        return self._stale[key]
+    
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """调用 loader 抓取并写入缓存，调用方需持有该键的锁"""
+        metrics.CACHE_REQUESTS.inc(key, "miss")
+        value = loader()
+        if value:
+            self.set(key, value)
+            if self.warm_start is not None:
+                self.warm_start.save(key, value)
+                self._stale[key] = None
+        return value
+    
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any]):
+        """后台刷新，同一平台已在刷新时不重复启动"""
+        lock = self._lock_for(key)
+        if not lock.acquire(blocking=False):
+            return
+        
+        def refresh():
+            try:
+                self._load(key, loader)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"后台刷新 {key} 失败: {str(e)}")
+            finally:
+                lock.release()
+        
+        get_executor().submit(refresh, priority=outbound.PRIORITY_BACKGROUND)
+    
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """读取缓存，未命中时调用 loader 抓取，空结果不缓存；有热启动数据时先返回旧数据并在后台刷新"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        stale = self._stale_for(key)
+        if stale:
+            metrics.CACHE_REQUESTS.inc(key, "stale")
+            self._refresh_in_background(key, loader)
+            return stale
+        
+        with self._lock_for(key):
+            # 等锁期间可能已有其他线程完成抓取
+            value = self.peek(key)
+            if value is not None:
+                metrics.CACHE_REQUESTS.inc(key, "hit")
+                return value
+            return self._load(key, loader)
+
+# 全局缓存实例
+hot_search_cache = HotSearchCache(
+    ttl=config.cache_ttl,
+    backend=create_cache_backend(
+        config.cache_backend,
+        max_bytes=config.cache_max_bytes,
+        directory=config.cache_dir,
+        url=config.cache_redis_url
+    ),
+    warm_start=WarmStartStore(config.warm_start_dir, config.warm_start_max_age) if config.warm_start_dir else None
+)
@@ -0,0 +1,298 @@
+# 缓存存储后端
+# HotSearchCache 负责过期判断之外的命中统计和单飞抓取，数据存放在可替换的后端中：
+#   memory - 进程内 LRU，按条目的估算大小限制容量
+#   disk   - 本地目录，每个键一个文件，同一主机的多个进程可共用
+#   redis  - Redis 协议服务器，多个节点共用抓取结果
+# 除 memory 外均以 models.codec 的紧凑格式存储条目，不经过 JSON。
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from models.codec import decode_items, encode_items
+
+Items = List[Dict[str, Any]]
+
+class CacheBackend:
+    """缓存存储后端接口，过期由后端负责"""
+
+    # 是否为进程内存储（读取不涉及 I/O，可以在事件循环中直接调用）
+    local = False
+
+    def get(self, key: str) -> Optional[Items]:
+        """读取未过期的条目，不存在时返回 None"""
+        raise NotImplementedError
+
+    def set(self, key: str, items: Items, ttl: float):
+        """写入条目，ttl 秒后过期"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """删除条目"""
+        raise NotImplementedError
+
+    def close(self):
+        """释放后端持有的资源"""
+
+def estimate_size(items: Items) -> int:
+    """条目的估算大小：字段名和字符串按字符数，其他值按 8 字节，不为计算容量而编码"""
+    size = 0
+    for item in items:
+        for field, value in item.items():
+            size += len(field) + (len(value) if isinstance(value, str) else 8)
+    return size
+
+class MemoryBackend(CacheBackend):
+    """进程内 LRU 缓存，总容量按条目的估算大小计算"""
+
+    local = True
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # 键 -> (过期时间, 条目, 字节数)
+        self._entries: "OrderedDict[str, Tuple[float, Items, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Items]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[0]:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, items: Items, ttl: float):
+        size = estimate_size(items)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + ttl, items, size)
+            self.size += size
+            # 超出容量时淘汰最久未使用的条目
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+class DiskBackend(CacheBackend):
+    """本地磁盘缓存，文件内容为 过期时间(double) + 编码后的条目"""
+
+    _HEADER = struct.Struct("<d")
+
+    def __init__(self, directory: str):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # 平台标识只含字母数字，其他字符统一替换，避免越出缓存目录
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in key)
+        return os.path.join(self.directory, f"{safe}.bin")
+
+    def get(self, key: str) -> Optional[Items]:
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.error(f"读取磁盘缓存失败: {str(e)}")
+            return None
+        try:
+            (expires,) = self._HEADER.unpack_from(data, 0)
+            if time.time() >= expires:
+                return None
+            return decode_items(data[self._HEADER.size:])
+        except (struct.error, ValueError, IndexError) as e:
+            self.logger.error(f"磁盘缓存数据损坏 {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, items: Items, ttl: float):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self._HEADER.pack(time.time() + ttl))
+                f.write(encode_items(items))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.error(f"写入磁盘缓存失败: {str(e)}")
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+class RespError(Exception):
+    """Redis 服务器返回的错误"""
+
+class RespConnection:
+    """单个 Redis 协议（RESP2）连接"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def execute(self, *args) -> Any:
+        """发送命令并读取回复"""
+        out = bytearray(b"*%d\r\n" % len(args))
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif not isinstance(arg, (bytes, bytearray)):
+                arg = str(arg).encode()
+            out += b"$%d\r\n" % len(arg)
+            out += arg
+            out += b"\r\n"
+        self.sock.sendall(out)
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Redis 连接已断开")
+        try:
+            return self._parse_reply(line[:1], line[1:-2])
+        except ValueError:
+            raise ConnectionError(f"无法解析的 Redis 回复: {line!r}") from None
+
+    def _parse_reply(self, prefix: bytes, payload: bytes) -> Any:
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RespError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Redis 连接已断开")
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise ValueError(prefix)
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+class RedisBackend(CacheBackend):
+    """Redis 协议缓存，多个节点共用；连接失败时视为未命中，不影响实时抓取"""
+
+    def __init__(self, url: str, prefix: str = "hot_search:", timeout: float = 1.0, pool_size: int = 8):
+        self.logger = logging.getLogger(__name__)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._pool: List[RespConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> RespConnection:
+        conn = RespConnection(self.host, self.port, self.timeout)
+        try:
+            if self.password:
+                conn.execute("AUTH", self.password)
+            if self.db:
+                conn.execute("SELECT", self.db)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def execute(self, *args) -> Any:
+        """从连接池取连接执行命令；出现任何异常都关闭该连接，不把读取状态未知的连接放回连接池"""
+        with self._lock:
+            conn = self._pool.pop() if self._pool else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            result = conn.execute(*args)
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+        return result
+
+    def _release(self, conn: RespConnection):
+        """归还连接，连接池已满时关闭"""
+        with self._lock:
+            if len(self._pool) < self.pool_size:
+                self._pool.append(conn)
+                return
+        conn.close()
+
+    def get(self, key: str) -> Optional[Items]:
+        try:
+            data = self.execute("GET", self.prefix + key)
+        except (OSError, ConnectionError, RespError) as e:
+            self.logger.error(f"读取 Redis 缓存失败: {str(e)}")
+            return None
+        if data is None:
+            return None
+        try:
+            return decode_items(data)
+        except (ValueError, IndexError) as e:
+            self.logger.error(f"Redis 缓存数据损坏 {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, items: Items, ttl: float):
+        try:
+            self.execute("SET", self.prefix + key, encode_items(items), "PX", max(int(ttl * 1000), 1))
+        except (OSError, ConnectionError, RespError) as e:
+            self.logger.error(f"写入 Redis 缓存失败: {str(e)}")
+
+    def delete(self, key: str):
+        try:
+            self.execute("DEL", self.prefix + key)
+        except (OSError, ConnectionError, RespError) as e:
+            self.logger.error(f"删除 Redis 缓存失败: {str(e)}")
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, []
+        for conn in pool:
+            conn.close()
+
+def create_cache_backend(name: str, **options) -> CacheBackend:
+    """按名称创建缓存后端"""
+    if name == "memory":
+        return MemoryBackend(options.get("max_bytes", 64 * 1024 * 1024))
+    if name == "disk":
+        return DiskBackend(options["directory"])
+    if name == "redis":
+        return RedisBackend(options["url"])
+    raise ValueError(f"未知的缓存后端: {name}")
@@ -0,0 +1,508 @@
+# 平台抽取引擎
+# 把 platform_specs.py 中的声明式平台定义在加载时编译成抽取流水线：路径拆分、模板解析、正则编译只做一次，
+# 抓取时只剩请求、解码、按编译好的取值函数生成条目。
+#
+# 平台定义：
+#   url       请求地址，可包含上下文变量 {MM}、{DD}（当前月、日，两位数）
+#   method    GET / POST，默认 GET
+#   headers   请求头
+#   data      POST 表单
+#   encoding  强制使用的响应编码，默认按响应头
+#   limit     最多抽取的条数，默认 config.item_limit，0 表示不限；JSON 取够后不再解码剩余元素，正则取够后停止匹配
+#   extract   抽取方式：
+#               {"type": "json", "path": "data.realtime", "require": "target"}
+#               {"type": "jsonp", "path": "items"}                  去掉回调函数包装后按 JSON 处理
+#               {"type": "regex", "pattern": "..."}                 每个匹配为一条记录，字段按分组序号（从 1 开始）引用
+#               {"type": "regex_columns", "columns": {"title": "...", "hot_value": "..."}}
+#                                                                    每列单独匹配后按顺序拼成记录，字段按列名引用
+#   fields    输出字段 title / url / hot_value 的取值：
+#               "word"                         JSON 路径（点号分隔）或列名
+#               2                              正则分组序号（去除首尾空白）
+#               "https://x.com/s?q={word}"     模板，占位符为路径或分组序号
+#               {"from": ..., "or": ..., "html": True, "replace": [" ", ""], "base": "https://x.com"}
+#                                              取不到值时改用 or 的来源；取值后去除 HTML 标签、替换字符、为相对地址补全前缀
+#   alternates  备用来源列表（结构同上）：主接口超过其近期耗时的分位数（config.hedge_percentile）仍未返回、
+#               失败或没有结果时启动下一个来源，采用最先得到的有效结果
+#   index     整个数据文件按键拆分后缓存在内存中（如按月的历史事件文件每次只取当天），仅用于 json / jsonp：
+#               {"key": "{MM}{DD}", "revalidate": 86400, "prefetch": 21600}
+#             extract.path 指向以 key 为键的对象。文件只在 URL 变化（如换月）或内容变化时重新下载和解析，
+#             解析时为每个键预先生成字段（HTML 已去除），之后直接按 key 取出；超过 revalidate 秒后带
+#             If-None-Match / If-Modified-Since 重新验证，304 或内容未变时不重新解析；
+#             prefetch 秒后的 URL 与当前不同时（如月末）在后台预取下一个文件
+import hashlib
+import json
+import logging
+import re
+import string
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from config.config import config
+from models.models import HotSearchItem
+from utils import metrics, outbound
+from utils.executor import get_executor
+from utils.hedge import LatencyTracker, hedged
+from utils.json_stream import take_array
+from utils.utils import format_hot_value, strip_html
+
+Getter = Callable[[Any], Any]
+
+# 预先生成的条目字段：(标题, 链接, 热度)
+Row = Tuple[str, str, int]
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+logger = logging.getLogger(__name__)
+
+def _context(now: Optional[datetime] = None) -> Dict[str, str]:
+    """URL 和路径模板可用的上下文变量，默认为当前时间"""
+    today = now or datetime.now()
+    return {"MM": f"{today.month:02d}", "DD": f"{today.day:02d}"}
+
+def _render(template: str, context: Optional[Dict[str, str]]) -> str:
+    return template.format_map(context) if context is not None else template
+
+def _compile_path(path: str) -> Callable[..., Any]:
+    """编译点号分隔的 JSON 路径，段中可包含上下文变量"""
+    segments = tuple(segment for segment in path.split(".") if segment)
+    dynamic = any("{" in segment for segment in segments)
+
+    if not segments:
+        return lambda value, context=None: value
+    if len(segments) == 1 and not dynamic and not segments[0].isdigit():
+        # 最常见的单键字段，直接取值
+        key = segments[0]
+        return lambda value, context=None: value.get(key) if isinstance(value, dict) else None
+    if not dynamic and not any(segment.isdigit() for segment in segments):
+        def get_static(value: Any, context: Optional[Dict[str, str]] = None) -> Any:
+            for segment in segments:
+                if not isinstance(value, dict):
+                    return None
+                value = value.get(segment)
+            return value
+        return get_static
+
+    def get(value: Any, context: Optional[Dict[str, str]] = None) -> Any:
+        for segment in segments:
+            if dynamic:
+                segment = _render(segment, context)
+            if isinstance(value, dict):
+                value = value.get(segment)
+            elif isinstance(value, list) and segment.isdigit():
+                index = int(segment)
+                value = value[index] if index < len(value) else None
+            else:
+                return None
+            if value is None:
+                return None
+        return value
+
+    return get
+
+def _single_key(source: Any) -> Optional[str]:
+    """字段来源是否为单个 JSON 键"""
+    if isinstance(source, str) and source and not any(c in source for c in ".{") and not source.isdigit():
+        return source
+    return None
+
+def _compile_source(source: Any) -> Getter:
+    """编译字段来源：路径、分组序号或模板"""
+    if isinstance(source, int):
+        index = source - 1
+        return lambda record: record[index].strip() if index < len(record) else None
+    if "{" not in source:
+        return _compile_path(source)
+
+    parsed = list(string.Formatter().parse(source))
+    names = [name for _, name, _, _ in parsed if name is not None]
+
+    # 只有一个占位符的模板（最常见的链接）直接拼接
+    if len(names) == 1 and (names[0].isdigit() or _single_key(names[0])):
+        name = names[0]
+        prefix, suffix = source.split("{%s}" % name, 1)
+        if name.isdigit():
+            index = int(name) - 1
+            return lambda record: prefix + record[index] + suffix
+
+        def render_key(record: Any) -> str:
+            value = record.get(name) if isinstance(record, dict) else None
+            return prefix + ("" if value is None else str(value)) + suffix
+
+        return render_key
+
+    if all(name.isdigit() for name in names):
+        # 只引用正则分组的模板：分组值都是字符串，按位置格式化
+        template = "".join(
+            literal.replace("{", "{{").replace("}", "}}") + ("" if name is None else "{%d}" % (int(name) - 1))
+            for literal, name, _, _ in parsed
+        )
+        return lambda record: template.format(*record)
+
+    parts = []
+    for literal, name, _, _ in parsed:
+        getter = None
+        if name is not None:
+            getter = _compile_source(int(name) if name.isdigit() else name)
+        parts.append((literal, getter))
+
+    def render_parts(record: Any) -> str:
+        out = []
+        for literal, getter in parts:
+            out.append(literal)
+            if getter is not None:
+                value = getter(record)
+                if value is not None:
+                    out.append(str(value))
+        return "".join(out)
+
+    # 路径 a.b 改写为格式化语法 a[b]，直接 format_map，取不到值时逐段拼接
+    template = "".join(
+        literal.replace("{", "{{").replace("}", "}}")
+        + ("" if name is None else "{" + name.replace(".", "[", 1).replace(".", "][") + ("]" if "." in name else "") + "}")
+        for literal, name, _, _ in parsed
+    )
+
+    def render(record: Any) -> str:
+        try:
+            return template.format_map(record)
+        except (KeyError, IndexError, TypeError):
+            return render_parts(record)
+
+    return render
+
+def _compile_field(spec: Any, default: Any) -> Getter:
+    """编译输出字段，附加取值后的处理"""
+    options = spec if isinstance(spec, dict) else {"from": spec}
+    source = options["from"]
+    if len(options) == 1:
+        # 最常见的情况：直接取记录中的一个键或一个正则分组
+        key = _single_key(source)
+        if key is not None:
+            def get_key(record: Any) -> Any:
+                value = record.get(key) if isinstance(record, dict) else None
+                return default if value is None else value
+            return get_key
+        if isinstance(source, int):
+            index = source - 1
+            return lambda record: record[index].strip() if index < len(record) else default
+        if isinstance(source, str) and "{" in source:
+            # 模板总会得到字符串，不需要再处理默认值
+            return _compile_source(source)
+
+    getter = _compile_source(source)
+    if "or" in options:
+        primary, alternative = getter, _compile_source(options["or"])
+        key, other = _single_key(source), _single_key(options["or"])
+        if key is not None and other is not None:
+            getter = lambda record: (record.get(key) or record.get(other)) if isinstance(record, dict) else None
+        else:
+            getter = lambda record: primary(record) or alternative(record)
+    transforms: List[Callable[[str], str]] = []
+    if options.get("html"):
+        transforms.append(strip_html)
+    if "replace" in options:
+        old, new = options["replace"]
+        transforms.append(lambda value: value.replace(old, new))
+    if "base" in options:
+        base = options["base"]
+        transforms.append(lambda value: value if value.startswith("http") else base + value)
+
+    if not transforms:
+        def get(record: Any) -> Any:
+            value = getter(record)
+            return default if value is None else value
+        return get
+
+    transform = transforms[0]
+    for following in transforms[1:]:
+        transform = (lambda first, second: lambda value: second(first(value)))(transform, following)
+
+    def get_transformed(record: Any) -> Any:
+        value = getter(record)
+        return default if value is None else transform(str(value))
+
+    return get_transformed
+
+def _unwrap_jsonp(text: str) -> str:
+    """去掉 JSONP 回调函数包装：callback({...});"""
+    text = text.strip()
+    start = text.find("(")
+    end = text.rfind(")")
+    if start < 0 or end < start:
+        return text
+    return text[start + 1:end]
+
+class _IndexedDocument:
+    """按键拆分后的数据文件"""
+
+    __slots__ = ("etag", "last_modified", "digest", "rows", "validated_at")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], digest: str, rows: Dict[str, List[Row]]):
+        # 上游的校验器，重新验证时带上
+        self.etag = etag
+        self.last_modified = last_modified
+        # 响应体摘要，上游没有校验器时用于判断内容是否变化
+        self.digest = digest
+        self.rows = rows
+        self.validated_at = time.monotonic()
+
+class CompiledSpec:
+    """编译后的平台定义"""
+
+    def __init__(self, slug: str, spec: Dict[str, Any]):
+        self.slug = slug
+        self.method = spec.get("method", "GET")
+        self.url = spec["url"]
+        self.headers = spec.get("headers")
+        self.data = spec.get("data")
+        self.encoding = spec.get("encoding")
+        self.timeout = spec.get("timeout", config.api_timeout)
+        self.dynamic = bool(_PLACEHOLDER.search(self.url))
+
+        # 最多抽取的条数，取够后不再解析剩余内容
+        self.limit = spec.get("limit", config.item_limit)
+
+        extract = spec["extract"]
+        self.kind = extract["type"]
+        if self.kind in ("json", "jsonp"):
+            self.path = tuple(segment for segment in extract.get("path", "").split(".") if segment)
+            self.dynamic = self.dynamic or "{" in extract.get("path", "")
+            self.require = _compile_path(extract["require"]) if "require" in extract else None
+            self.get_path = _compile_path(extract.get("path", ""))
+        elif self.kind == "regex":
+            self.pattern = re.compile(extract["pattern"], re.DOTALL)
+        elif self.kind == "regex_columns":
+            self.columns = {name: re.compile(pattern, re.DOTALL) for name, pattern in extract["columns"].items()}
+        else:
+            raise ValueError(f"{slug}: 未知的抽取方式 {self.kind}")
+
+        fields = spec["fields"]
+        self.title = _compile_field(fields["title"], "")
+        self.item_url = _compile_field(fields["url"], "") if "url" in fields else None
+        self.hot_value = _compile_field(fields["hot_value"], 0) if "hot_value" in fields else None
+        self.alternates = [CompiledSpec(slug, alternate) for alternate in spec.get("alternates", ())]
+        # 主接口的近期耗时，用于决定何时启动备用来源
+        self.latency = LatencyTracker() if self.alternates else None
+
+        index = spec.get("index")
+        self.index_key: Optional[str] = None
+        if index is not None:
+            if self.kind not in ("json", "jsonp"):
+                raise ValueError(f"{slug}: index 只支持 json / jsonp")
+            self.index_key = index["key"]
+            self.revalidate = index.get("revalidate", 86400)
+            self.prefetch = index.get("prefetch", 0)
+            # URL -> 拆分后的数据文件，只保留当前和预取的两个
+            self._documents: Dict[str, _IndexedDocument] = {}
+            self._documents_lock = threading.Lock()
+            self._prefetching: Set[str] = set()
+
+    def _decode(self, response) -> str:
+        if self.encoding:
+            response.encoding = self.encoding
+        return response.text
+
+    def _take(self, iterable):
+        return islice(iterable, self.limit) if self.limit else iterable
+
+    def records(self, response, context: Optional[Dict[str, str]]) -> List[Any]:
+        """从响应中抽取原始记录，最多 limit 条"""
+        if self.kind == "json":
+            content = response.content
+            text = content.decode(self.encoding or json.detect_encoding(content))
+        elif self.kind == "jsonp":
+            text = _unwrap_jsonp(self._decode(response))
+        elif self.kind == "regex":
+            # 分组值在字段取值时再去除首尾空白
+            matches = self._take(self.pattern.finditer(self._decode(response)))
+            groups = self.pattern.groups
+            if groups <= 1:
+                return [(match.group(groups),) for match in matches]
+            return [match.groups() for match in matches]
+        else:
+            text = self._decode(response)
+            columns = [[match.group(min(pattern.groups, 1)).strip() for match in self._take(pattern.finditer(text))]
+                       for pattern in self.columns.values()]
+            return [dict(zip(self.columns, row)) for row in zip(*columns)]
+
+        # JSON 只解码路径上的数组中需要的元素
+        path = [_render(segment, context) for segment in self.path] if context is not None else self.path
+        require = self.require
+        accept = (lambda record: require(record) is not None) if require is not None else None
+        return take_array(text, path, self.limit, accept) or []
+
+    def build(self, records: List[Any]) -> List[HotSearchItem]:
+        """按字段定义生成热搜条目"""
+        title = self.title
+        item_url = self.item_url
+        hot_value = self.hot_value
+        slug = self.slug
+        return [
+            HotSearchItem(
+                id=i + 1,
+                title=title(record),
+                url=item_url(record) if item_url is not None else "",
+                hot_value=format_hot_value(hot_value(record)) if hot_value is not None else 0,
+                platform=slug,
+                rank=i + 1
+            )
+            for i, record in enumerate(records)
+        ]
+
+    def _row(self, record: Any) -> Row:
+        return (
+            self.title(record),
+            self.item_url(record) if self.item_url is not None else "",
+            format_hot_value(self.hot_value(record)) if self.hot_value is not None else 0
+        )
+
+    def _build_index(self, content: bytes, context: Dict[str, str]) -> Dict[str, List[Row]]:
+        """解析整个数据文件，为 path 下的每个键生成最多 limit 条的字段"""
+        text = content.decode(self.encoding or json.detect_encoding(content))
+        if self.kind == "jsonp":
+            text = _unwrap_jsonp(text)
+        container = self.get_path(json.loads(text), context)
+        if not isinstance(container, dict):
+            raise ValueError(f"{self.slug}: 数据文件中没有 {'.'.join(self.path)}")
+        require = self.require
+        rows = {}
+        for key, records in container.items():
+            if not isinstance(records, list):
+                continue
+            if require is not None:
+                records = [record for record in records if require(record) is not None]
+            rows[key] = [self._row(record) for record in self._take(records)]
+        return rows
+
+    def _load_document(self, service, url: str, context: Dict[str, str]) -> _IndexedDocument:
+        """下载或重新验证数据文件，同一时间只有一个线程请求上游"""
+        with self._documents_lock:
+            current = self._documents.get(url)
+            if current is not None and time.monotonic() - current.validated_at < self.revalidate:
+                # 等待期间其他线程已经完成
+                return current
+            headers = dict(self.headers or {})
+            if current is not None:
+                if current.etag:
+                    headers["If-None-Match"] = current.etag
+                if current.last_modified:
+                    headers["If-Modified-Since"] = current.last_modified
+            kwargs: Dict[str, Any] = {"timeout": self.timeout}
+            if headers:
+                kwargs["headers"] = headers
+            if self.data:
+                kwargs["data"] = self.data
+            try:
+                response = service.request(self.method, url, **kwargs)
+                if response.status_code == 304 and current is not None:
+                    current.validated_at = time.monotonic()
+                    metrics.DOCUMENT_REQUESTS.inc(self.slug, "not_modified")
+                    return current
+                response.raise_for_status()
+            except Exception as e:
+                if current is None:
+                    raise
+                # 重新验证失败时继续使用已有的数据，下次请求再重试
+                metrics.DOCUMENT_REQUESTS.inc(self.slug, "stale")
+                logger.warning(f"{self.slug}: 重新验证 {url} 失败，继续使用已缓存的数据: {str(e)}")
+                return current
+
+            content = response.content
+            digest = hashlib.sha1(content).hexdigest()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if current is not None and current.digest == digest:
+                current.etag, current.last_modified = etag, last_modified
+                current.validated_at = time.monotonic()
+                metrics.DOCUMENT_REQUESTS.inc(self.slug, "unchanged")
+                return current
+
+            document = _IndexedDocument(etag, last_modified, digest, self._build_index(content, context))
+            metrics.DOCUMENT_REQUESTS.inc(self.slug, "loaded")
+            self._documents[url] = document
+            while len(self._documents) > 2:
+                del self._documents[next(key for key in self._documents if key != url)]
+            return document
+
+    def _prefetch_next(self, service, now: datetime, url: str):
+        """prefetch 秒后使用的数据文件与当前不同且尚未缓存时，在后台预取"""
+        context = _context(now + timedelta(seconds=self.prefetch))
+        next_url = _render(self.url, context)
+        if next_url == url or next_url in self._documents or next_url in self._prefetching:
+            return
+        self._prefetching.add(next_url)
+
+        def prefetch():
+            try:
+                self._load_document(service, next_url, context)
+                logger.info(f"{self.slug}: 已预取 {next_url}")
+            except Exception as e:
+                logger.warning(f"{self.slug}: 预取 {next_url} 失败: {str(e)}")
+            finally:
+                self._prefetching.discard(next_url)
+
+        get_executor().submit(prefetch, priority=outbound.PRIORITY_BACKGROUND)
+
+    def _fetch_indexed(self, service) -> List[HotSearchItem]:
+        """从拆分后的数据文件中取出当前上下文对应的条目"""
+        now = datetime.now()
+        context = _context(now)
+        url = _render(self.url, context)
+        document = self._documents.get(url)
+        if document is None or time.monotonic() - document.validated_at >= self.revalidate:
+            document = self._load_document(service, url, context)
+        else:
+            metrics.DOCUMENT_REQUESTS.inc(self.slug, "hit")
+        if self.prefetch > 0:
+            self._prefetch_next(service, now, url)
+        slug = self.slug
+        return [
+            HotSearchItem(id=i + 1, title=title, url=item_url, hot_value=hot_value, platform=slug, rank=i + 1)
+            for i, (title, item_url, hot_value) in enumerate(document.rows.get(_render(self.index_key, context), ()))
+        ]
+
+    def _fetch(self, service) -> List[HotSearchItem]:
+        context = _context() if self.dynamic else None
+        kwargs: Dict[str, Any] = {"timeout": self.timeout}
+        if self.headers:
+            kwargs["headers"] = self.headers
+        if self.data:
+            kwargs["data"] = self.data
+        response = service.request(self.method, _render(self.url, context), **kwargs)
+        response.raise_for_status()
+        return self.build(self.records(response, context))
+
+    def _attempt(self, service, latency: Optional[LatencyTracker] = None):
+        """在对冲线程中抓取一个来源，返回 (条目, 解析耗时)"""
+        before = service.last_fetch_time
+        start = time.perf_counter()
+        try:
+            hot_items = self._fetch(service)
+        finally:
+            if latency is not None:
+                latency.observe(time.perf_counter() - start)
+        return hot_items, time.perf_counter() - start - (service.last_fetch_time - before)
+
+    def fetch(self, service) -> List[HotSearchItem]:
+        """请求上游并抽取热搜，有备用来源时对冲请求"""
+        if self.index_key is not None:
+            return self._fetch_indexed(service)
+        if not self.alternates:
+            return self._fetch(service)
+
+        delay = self.latency.percentile(config.hedge_percentile)
+        attempts = [lambda: self._attempt(service, self.latency)]
+        attempts += [(lambda alternate: lambda: alternate._attempt(service))(alternate) for alternate in self.alternates]
+        start = time.perf_counter()
+        hot_items, parse_time = hedged(attempts, config.hedge_delay if delay is None else delay,
+                                       accept=lambda result: bool(result[0]), label=self.slug)
+        # 对冲期间的等待都计为上游耗时，解析耗时取采用的来源本身的解析耗时
+        service.add_fetch_time(time.perf_counter() - start - parse_time)
+        return hot_items
+
+def compile_specs(specs: Dict[str, Dict[str, Any]]) -> Dict[str, CompiledSpec]:
+    """编译全部平台定义"""
+    return {slug: CompiledSpec(slug, spec) for slug, spec in specs.items()}
@@ -0,0 +1,242 @@
+# 历史热搜导出
+# 按时间范围和平台集合，从共享快照目录保存的历史版本文件（versions/）中导出热搜条目，每行一个条目：
+#   captured_at（抓取时间）| version | platform | rank | title | url | hot_value
+# 导出全程流式进行，内存占用与导出的时间范围无关：
+#   - 版本文件逐个映射读取，读完即释放；每个文件只解码选中平台的条目
+#   - 未刷新成功的平台在后续版本中沿用旧数据，同一平台同一抓取时间只导出一次
+#   - NDJSON 按平台逐批写出；Parquet（需要安装 pyarrow）按行组写出，platform 和 url 列使用字典编码
+# 导出的时间跨度取决于保留的版本文件数（SNAPSHOT_HISTORY，负数表示全部保留）。
+#
+# 命令行：
+#   python -m services.history_export --from 2026-09-01 --to 2026-10-01 -o history.parquet
+#   python -m services.history_export --from 2026-10-18 -p baidu -p weibo -f ndjson -o - | head
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config.config import config
+from services.registry import PLATFORMS
+from services.snapshot import KIND_PLATFORM, VERSIONS_DIR, SnapshotFile
+from utils.utils import format_hot_value
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "parquet")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+# 导出的一行：(抓取时间戳, 快照版本, 平台, 排名, 标题, 链接, 热度)
+HistoryRow = Tuple[float, int, str, int, str, str, Optional[int]]
+
+def parquet_available() -> bool:
+    """是否安装了 pyarrow"""
+    return pyarrow is not None
+
+def parse_time(value: str) -> float:
+    """时间参数转为时间戳：Unix 秒数或 ISO 8601 日期/时间（不带时区时按本地时间）"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"无法识别的时间: {value}") from None
+
+def parse_platforms(values: Iterable[str]) -> Optional[List[str]]:
+    """逗号分隔的平台标识，未指定时返回 None（全部平台）；包含未知平台时抛出 ValueError"""
+    slugs = [slug.strip() for value in values for slug in value.split(",") if slug.strip()]
+    known = {platform.slug for platform in PLATFORMS}
+    unknown = [slug for slug in slugs if slug not in known]
+    if unknown:
+        raise ValueError(f"未知平台: {', '.join(unknown)}")
+    return list(dict.fromkeys(slugs)) or None
+
+def _hot_value(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    return format_hot_value(value)
+
+def iter_history_rows(directory: str, start: float, end: float,
+                      platforms: Optional[Sequence[str]] = None) -> Iterator[List[HistoryRow]]:
+    """按版本顺序产出 [start, end) 内抓取的条目，每次产出一个平台一次抓取的全部条目"""
+    versions_dir = os.path.join(directory, VERSIONS_DIR)
+    try:
+        names = sorted(name for name in os.listdir(versions_dir) if name.endswith(".bin"))
+    except FileNotFoundError:
+        return
+    # 各平台已导出的最近一次抓取时间，后续版本沿用的旧数据不重复导出
+    exported: Dict[str, float] = {}
+    for name in names:
+        path = os.path.join(versions_dir, name)
+        try:
+            # 版本文件写入后不再修改，早于起始时间的文件中不会有范围内的条目
+            if os.stat(path).st_mtime < start:
+                continue
+            snapshot = SnapshotFile(path)
+        except FileNotFoundError:
+            # 导出期间被清理的旧版本
+            continue
+        except (OSError, ValueError) as e:
+            logger.error(f"读取快照版本失败 {name}: {str(e)}")
+            continue
+        try:
+            for key, entry in snapshot.entries.items():
+                updated_at = entry["updated_at"]
+                if (entry["kind"] != KIND_PLATFORM or (platforms is not None and key not in platforms)
+                        or not start <= updated_at < end or exported.get(key) == updated_at):
+                    continue
+                exported[key] = updated_at
+                yield [
+                    (updated_at, snapshot.version, key, item.get("rank") or position, item.get("title", ""),
+                     item.get("url", ""), _hot_value(item.get("hot_value")))
+                    for position, item in enumerate(snapshot.items(key) or (), 1)
+                ]
+        finally:
+            snapshot.close()
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds")
+
+def iter_ndjson(batches: Iterable[List[HistoryRow]]) -> Iterator[bytes]:
+    """每个条目一行 JSON，按批写出"""
+    for rows in batches:
+        if rows:
+            yield b"".join(
+                json.dumps({"captured_at": _isoformat(captured_at), "version": version, "platform": platform,
+                            "rank": rank, "title": title, "url": url, "hot_value": hot_value},
+                           ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                for captured_at, version, platform, rank, title, url, hot_value in rows
+            )
+
+class _ChunkSink(io.RawIOBase):
+    """收集 Parquet 写入的字节，每写完一个行组取出一次"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _parquet_schema() -> "pyarrow.Schema":
+    return pyarrow.schema([
+        ("captured_at", pyarrow.timestamp("ms", tz="UTC")),
+        ("version", pyarrow.int64()),
+        ("platform", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+        ("rank", pyarrow.int32()),
+        ("title", pyarrow.string()),
+        ("url", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+        ("hot_value", pyarrow.int64())
+    ])
+
+def _row_group(schema: "pyarrow.Schema", columns: List[list]) -> "pyarrow.Table":
+    captured_at, version, platform, rank, title, url, hot_value = columns
+    return pyarrow.Table.from_arrays([
+        pyarrow.array([int(value * 1000) for value in captured_at], type=schema.field("captured_at").type),
+        pyarrow.array(version, type=pyarrow.int64()),
+        pyarrow.array(platform, type=pyarrow.string()).dictionary_encode(),
+        pyarrow.array(rank, type=pyarrow.int32()),
+        pyarrow.array(title, type=pyarrow.string()),
+        pyarrow.array(url, type=pyarrow.string()).dictionary_encode(),
+        pyarrow.array(hot_value, type=pyarrow.int64())
+    ], schema=schema)
+
+def iter_parquet(batches: Iterable[List[HistoryRow]], row_group_rows: int = 65536,
+                 compression: str = "zstd") -> Iterator[bytes]:
+    """按行组写出 Parquet 文件，每个行组写完后产出其字节，内存中最多保留一个行组"""
+    if pyarrow is None:
+        raise RuntimeError("Parquet 导出需要安装 pyarrow")
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression=compression, use_dictionary=["platform", "url"])
+    columns: List[list] = [[] for _ in schema]
+    try:
+        for rows in batches:
+            for row in rows:
+                for column, value in zip(columns, row):
+                    column.append(value)
+            if len(columns[0]) >= row_group_rows:
+                writer.write_table(_row_group(schema, columns), row_group_size=len(columns[0]))
+                columns = [[] for _ in schema]
+                yield sink.drain()
+        if columns[0]:
+            writer.write_table(_row_group(schema, columns), row_group_size=len(columns[0]))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def export_history(export_format: str, start: float, end: float, platforms: Optional[Sequence[str]] = None,
+                   directory: Optional[str] = None) -> Iterator[bytes]:
+    """导出历史热搜，返回按块产出的文件内容"""
+    batches = iter_history_rows(directory or config.snapshot_dir, start, end, platforms)
+    if export_format == "parquet":
+        return iter_parquet(batches, config.export_row_group_rows, config.export_compression)
+    return iter_ndjson(batches)
+
+def export_filename(export_format: str, start: float, end: float) -> str:
+    """下载时的文件名"""
+    def day(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).strftime("%Y%m%d")
+    return f"hot_search_{day(start)}_{day(end)}.{export_format}"
+
+def main():
+    parser = argparse.ArgumentParser(description="从共享快照的历史版本导出热搜数据")
+    parser.add_argument("--from", dest="start", default="0", help="起始时间（含），Unix 秒数或 ISO 8601，默认不限")
+    parser.add_argument("--to", dest="end", help="结束时间（不含），默认当前时间")
+    parser.add_argument("-p", "--platform", action="append", default=[], help="只导出指定平台，可重复或逗号分隔")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, help="导出格式，默认按输出文件扩展名，否则为 ndjson")
+    parser.add_argument("-d", "--dir", default=config.snapshot_dir, help="共享快照目录，默认 SNAPSHOT_DIR")
+    parser.add_argument("-o", "--output", default="-", help="输出文件，- 表示标准输出")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        start = parse_time(args.start)
+        end = parse_time(args.end) if args.end else time.time()
+        platforms = parse_platforms(args.platform)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.dir:
+        parser.error("未指定共享快照目录（--dir 或 SNAPSHOT_DIR）")
+    export_format = args.format or ("parquet" if args.output.endswith(".parquet") else "ndjson")
+    if export_format == "parquet" and not parquet_available():
+        parser.error("Parquet 导出需要安装 pyarrow")
+
+    chunks = export_history(export_format, start, end, platforms, args.dir)
+    if args.output == "-":
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+        return
+    with open(args.output, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+if __name__ == "__main__":
+    main()
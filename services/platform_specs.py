@@ -0,0 +1,219 @@
+# 平台定义
+# 各平台的请求方式和抽取规则，由 extraction.py 在加载时编译，格式说明见 extraction.py
+from typing import Any, Dict
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+
+def _headers(referer: str, **extra: str) -> Dict[str, str]:
+    """带浏览器 User-Agent 和 Referer 的请求头"""
+    return {"User-Agent": USER_AGENT, "Referer": referer, **extra}
+
+PLATFORM_SPECS: Dict[str, Dict[str, Any]] = {
+    "baidu": {
+        "url": "https://top.baidu.com/board?tab=realtime",
+        # 标题和热度分别匹配后按顺序配对
+        "extract": {"type": "regex_columns", "columns": {
+            "title": r'<div\sclass="c-single-text-ellipsis">(.*?)</div>',
+            "hot_value": r'<div\sclass="hot-index_1Bl1a">(.*?)</div>'
+        }},
+        "fields": {"title": "title", "url": "https://www.baidu.com/s?wd={title}", "hot_value": "hot_value"}
+    },
+    "bilibili": {
+        "url": "https://api.bilibili.com/x/web-interface/search/square?limit=50",
+        "limit": 50,
+        "headers": _headers("https://www.bilibili.com/", Origin="https://www.bilibili.com"),
+        "extract": {"type": "json", "path": "data.trending.list"},
+        "fields": {
+            "title": {"from": "show_name", "or": "keyword"},
+            "url": "https://search.bilibili.com/all?keyword={keyword}",
+            "hot_value": "heat_score"
+        },
+        # 热搜接口慢、失败或没有数据时改用热门视频
+        "alternates": [{
+            "url": "https://api.bilibili.com/x/web-interface/popular?ps=50&pn=1",
+            "limit": 50,
+            "headers": _headers("https://www.bilibili.com/", Origin="https://www.bilibili.com"),
+            "extract": {"type": "json", "path": "data.list"},
+            "fields": {"title": "title", "url": "https://www.bilibili.com/video/{bvid}", "hot_value": "heat"}
+        }]
+    },
+    "weibo": {
+        "url": "https://weibo.com/ajax/side/hotSearch",
+        "extract": {"type": "json", "path": "data.realtime"},
+        "fields": {"title": "word", "url": "https://s.weibo.com/weibo?q={word}", "hot_value": "num"}
+    },
+    "zhihu": {
+        "url": "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total",
+        "headers": {"User-Agent": USER_AGENT},
+        "extract": {"type": "json", "path": "data", "require": "target"},
+        "fields": {
+            "title": "target.title",
+            "url": "https://www.zhihu.com/question/{target.id}",
+            "hot_value": "detail_text"
+        }
+    },
+    "360search": {
+        "url": "https://trends.so.com/top/realtime",
+        "headers": _headers("https://trends.so.com/", Accept="application/json"),
+        "extract": {"type": "json", "path": "data.result"},
+        "fields": {"title": "query", "url": "https://www.so.com/s?q={query}", "hot_value": "heat"}
+    },
+    "acfun": {
+        "url": "https://www.acfun.cn/rest/pc-direct/rank/channel?channelId=&subChannelId=&rankLimit=30&rankPeriod=DAY",
+        "headers": _headers("https://www.acfun.cn/"),
+        "extract": {"type": "json", "path": "rankList"},
+        "fields": {"title": "contentTitle", "url": "shareUrl", "hot_value": "viewCount"}
+    },
+    "csdn": {
+        "url": "https://blog.csdn.net/phoenix/web/blog/hot-rank?page=0&pageSize=25&type=1",
+        "limit": 25,
+        "headers": _headers("https://blog.csdn.net/rank/list"),
+        "extract": {"type": "json", "path": "data"},
+        "fields": {"title": "articleTitle", "url": "articleDetailUrl", "hot_value": "hotRankScore"}
+    },
+    "dongqiudi": {
+        "url": "https://api.dongqiudi.com/v3/archive/app/web/recommend/new",
+        "headers": _headers("https://www.dongqiudi.com/"),
+        "extract": {"type": "json", "path": "data.articles"},
+        "fields": {"title": "title", "url": "share.url", "hot_value": "read_count"}
+    },
+    "douban": {
+        "url": "https://movie.douban.com/j/search_subjects?type=movie&tag=热门&page_limit=50&page_start=0",
+        "limit": 50,
+        "headers": _headers("https://movie.douban.com/"),
+        "extract": {"type": "json", "path": "subjects"},
+        "fields": {"title": "title", "url": "url", "hot_value": "rate"}
+    },
+    "douyin": {
+        "url": "https://www.iesdouyin.com/web/api/v2/hotsearch/billboard/word/",
+        "extract": {"type": "json", "path": "word_list"},
+        "fields": {"title": "word", "url": "https://www.douyin.com/search/{word}", "hot_value": "hot_value"}
+    },
+    "github": {
+        "url": "https://github.com/trending",
+        "extract": {"type": "regex", "pattern": r'<h2 class="h3 lh-condensed">\s*<a\s+href="([^"]+)"[^>]*>\s*<span[^>]*>([^<]+)</span>\s*<span[^>]*>([^<]+)</span>\s*</a>\s*</h2>\s*<p[^>]*>\s*([^<]*)'},
+        # 标题为 "owner / repo"，去掉空格
+        "fields": {"title": {"from": "{2}{3}", "replace": [" ", ""]}, "url": "https://github.com{1}"}
+    },
+    "guojiadili": {
+        "url": "http://www.dili360.com/",
+        "headers": _headers("http://www.dili360.com/"),
+        "extract": {"type": "regex", "pattern": r'<div class="pic">\s*<a href="([^"]+)"[^>]*>\s*<img[^>]*>\s*</a>\s*</div>\s*<div class="text">\s*<h3>\s*<a[^>]*>([^<]+)</a>\s*</h3>'},
+        "fields": {"title": 2, "url": {"from": 1, "base": "http://www.dili360.com"}}
+    },
+    "history": {
+        # 按月的数据文件，整月解析一次后按天取当天的事件；每天重新验证一次，月末最后 6 小时预取下个月
+        "url": "https://baike.baidu.com/cms/home/eventsOnHistory/{MM}.json",
+        "headers": _headers("https://baike.baidu.com/"),
+        "extract": {"type": "json", "path": "{MM}"},
+        "index": {"key": "{MM}{DD}", "revalidate": 86400, "prefetch": 6 * 3600},
+        "fields": {"title": {"from": "{year}年：{title}", "html": True}, "url": "link"}
+    },
+    "hupu": {
+        "url": "https://bbs.hupu.com/all-gambia",
+        "headers": _headers("https://bbs.hupu.com/", Cookie="sajssdk_2015_cross_new_user=1"),
+        "extract": {"type": "regex", "pattern": r'<div class="post-title">\s*<a[^>]*href="([^"]+)"[^>]*>\s*<span[^>]*>([^<]+)</span>'},
+        "fields": {"title": 2, "url": {"from": 1, "base": "https://bbs.hupu.com"}}
+    },
+    "ithome": {
+        "method": "POST",
+        "url": "https://www.ithome.com/block/api/getlist",
+        "headers": _headers("https://www.ithome.com/", **{"Content-Type": "application/x-www-form-urlencoded"}),
+        "data": {"type": "rank", "name": "24h"},
+        "extract": {"type": "json", "path": "data"},
+        "fields": {"title": "title", "url": "link", "hot_value": "comment"}
+    },
+    "lishipin": {
+        "url": "https://www.pearvideo.com/popular_loading.jsp",
+        "headers": _headers("https://www.pearvideo.com/"),
+        "extract": {"type": "regex", "pattern": r'<a href="([^"]+)"[^>]*>\s*<h2[^>]*>([^<]+)</h2>'},
+        "fields": {"title": 2, "url": {"from": 1, "base": "https://www.pearvideo.com/"}}
+    },
+    "pengpai": {
+        "url": "https://www.thepaper.cn/load_chosen.jsp",
+        "headers": _headers("https://www.thepaper.cn/"),
+        "extract": {"type": "regex", "pattern": r'<a href="([^"]+)"[^>]*>\s*<h2[^>]*>([^<]+)</h2>\s*<div[^>]*>(\d+)</div>'},
+        "fields": {"title": 2, "url": {"from": 1, "base": "https://www.thepaper.cn"}, "hot_value": 3}
+    },
+    "qqnews": {
+        "url": "https://i.news.qq.com/trpc.qqnews_web.pc_base_srv.base_http_proxy/NinjaPageContentSync?pull_urls=news_top_2018",
+        "headers": _headers("https://news.qq.com/"),
+        "extract": {"type": "json", "path": "data.news_top_2018.children"},
+        "fields": {"title": "title", "url": "url", "hot_value": "view_count"}
+    },
+    "shaoshupai": {
+        "url": "https://sspai.com/api/v1/article/tag/page/get?limit=50&tag=热门文章",
+        "limit": 50,
+        "headers": _headers("https://sspai.com/"),
+        "extract": {"type": "json", "path": "data"},
+        "fields": {"title": "title", "url": "https://sspai.com/post/{id}", "hot_value": "like_count"}
+    },
+    "sougou": {
+        "url": "https://sa.sogou.com/new/getRankData",
+        "headers": _headers("https://sa.sogou.com/"),
+        "extract": {"type": "json", "path": "data.topwords"},
+        "fields": {"title": "word", "url": "https://www.sogou.com/web?query={word}", "hot_value": "number"}
+    },
+    "toutiao": {
+        "url": "https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc&_signature=_02B4Z6wo00901IjN4-gAAIDBvqPRadqvS7RD.5pAAO.YwY",
+        "headers": _headers("https://www.toutiao.com/", Cookie="tt_webid=7254553744002524715"),
+        "extract": {"type": "json", "path": "data"},
+        "fields": {"title": "Title", "url": "Url", "hot_value": "HotValue"}
+    },
+    "v2ex": {
+        "url": "https://www.v2ex.com/?tab=hot",
+        "extract": {"type": "regex", "pattern": r'<span\s+class="item_title">\s*<a\s+href="([^"]+)"[^>]*>([^<]+)</a>'},
+        "fields": {"title": 2, "url": "https://www.v2ex.com{1}"}
+    },
+    "wangyi": {
+        "url": "https://m.163.com/fe/api/hot/news/flow",
+        "headers": _headers("https://www.163.com/"),
+        "extract": {"type": "json", "path": "data.list"},
+        "fields": {"title": "title", "url": "url", "hot_value": "clickCount"}
+    },
+    "xinjingbao": {
+        "url": "https://www.bjnews.com.cn/api/articles/top",
+        "headers": _headers("https://www.bjnews.com.cn/"),
+        "extract": {"type": "json", "path": "data.list"},
+        "fields": {"title": "title", "url": "https://www.bjnews.com.cn/detail/{id}", "hot_value": "views"}
+    },
+    "quark": {
+        "url": "https://quark.sm.cn/api/rest?method=quark.home.getHomeData&format=json",
+        "headers": _headers("https://quark.sm.cn/"),
+        "extract": {"type": "json", "path": "data.hot_search"},
+        "fields": {"title": "title", "url": "url", "hot_value": "hot_score"}
+    },
+    "souhu": {
+        "url": "https://v2.sohu.com/integration-api/mix/region/6156",
+        "headers": _headers("https://www.sohu.com/"),
+        "extract": {"type": "json", "path": "data.data"},
+        "fields": {"title": "title", "url": "url", "hot_value": "readCount"}
+    },
+    "renminwang": {
+        "url": "http://news.people.com.cn/210801/211150/index.js",
+        "headers": _headers("http://www.people.com.cn/"),
+        "encoding": "utf-8",
+        "extract": {"type": "jsonp", "path": "items"},
+        "fields": {"title": "title", "url": "url"}
+    },
+    "nanfangzhoumo": {
+        "url": "https://www.infzm.com/contents",
+        "headers": _headers("https://www.infzm.com/"),
+        "extract": {"type": "regex", "pattern": r'<a href="/contents/(\d+)"[^>]*>\s*<h2[^>]*>([^<]+)</h2>'},
+        "fields": {"title": 2, "url": "https://www.infzm.com/contents/{1}"}
+    },
+    "360doc": {
+        "url": "http://www.360doc.com/index.html",
+        "headers": _headers("http://www.360doc.com/"),
+        "encoding": "utf-8",
+        "extract": {"type": "regex", "pattern": r'<div class="hot_box">\s*<a href="([^"]+)"[^>]*>\s*<div[^>]*>\s*<div[^>]*>([^<]+)</div>'},
+        "fields": {"title": 2, "url": 1}
+    },
+    "cctv": {
+        "url": "https://news.cctv.com/data/index.json",
+        "headers": _headers("https://news.cctv.com/"),
+        "encoding": "utf-8",
+        "extract": {"type": "json", "path": "rollData"},
+        "fields": {"title": "title", "url": "url"}
+    },
+}
@@ -0,0 +1,82 @@
+# 平台注册表
+# 各平台的路由标识、名称和服务类，Flask 与 ASGI 两套入口共用
+# 服务类按名称登记，首次使用时才导入 platform_services（及 requests），缩短冷启动时间
+import importlib
+import threading
+from typing import Dict, List, Optional
+
+SERVICES_MODULE = "services.platform_services"
+
+class PlatformInfo:
+    """平台信息"""
+    
+    def __init__(self, slug: str, name: str, service_name: str, description: str = ""):
+        self.slug = slug
+        self.name = name
+        self.service_name = service_name
+        self.description = description or f"获取{name}热搜"
+        self._service = None
+        self._lock = threading.Lock()
+    
+    @property
+    def endpoint(self) -> str:
+        """路由路径"""
+        return f"/{self.slug}"
+    
+    @property
+    def service_class(self) -> type:
+        """服务类"""
+        return getattr(importlib.import_module(SERVICES_MODULE), self.service_name)
+    
+    def get_service(self):
+        """获取共享的服务实例"""
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self.service_class()
+        return self._service
+
+PLATFORMS: List[PlatformInfo] = [
+    PlatformInfo("baidu", "百度", "BaiduService"),
+    PlatformInfo("bilibili", "哔哩哔哩", "BilibiliService"),
+    PlatformInfo("weibo", "微博", "WeiboHotService"),
+    PlatformInfo("zhihu", "知乎", "ZhihuService"),
+    PlatformInfo("360search", "360搜索", "Search360Service"),
+    PlatformInfo("acfun", "AcFun", "AcfunService"),
+    PlatformInfo("csdn", "CSDN", "CSDNService"),
+    PlatformInfo("dongqiudi", "懂球帝", "DongqiudiService"),
+    PlatformInfo("douban", "豆瓣", "DoubanService"),
+    PlatformInfo("douyin", "抖音", "DouyinService"),
+    PlatformInfo("github", "GitHub", "GithubService"),
+    PlatformInfo("guojiadili", "国家地理", "GuojiadiliService"),
+    PlatformInfo("history", "历史上的今天", "HistoryService", description="获取历史上的今天"),
+    PlatformInfo("hupu", "虎扑", "HupuService"),
+    PlatformInfo("ithome", "IT之家", "IthomeService"),
+    PlatformInfo("lishipin", "梨视频", "LishipinService"),
+    PlatformInfo("pengpai", "澎湃新闻", "PengpaiService"),
+    PlatformInfo("qqnews", "腾讯新闻", "QqnewsService"),
+    PlatformInfo("shaoshupai", "少数派", "ShaoshupaiService"),
+    PlatformInfo("sougou", "搜狗", "SougouService"),
+    PlatformInfo("toutiao", "今日头条", "ToutiaoService"),
+    PlatformInfo("v2ex", "V2EX", "V2exService"),
+    PlatformInfo("wangyi", "网易新闻", "WangyiNewsService"),
+    PlatformInfo("xinjingbao", "新京报", "XinjingbaoService"),
+    PlatformInfo("quark", "夸克", "QuarkService"),
+    PlatformInfo("souhu", "搜狐", "SouhuService"),
+    PlatformInfo("renminwang", "人民网", "RenminwangService"),
+    PlatformInfo("nanfangzhoumo", "南方周末", "NanfangzhoumoService"),
+    PlatformInfo("360doc", "360doc", "Doc360Service"),
+    PlatformInfo("cctv", "CCTV新闻", "CCTVService"),
+]
+
+_by_slug: Dict[str, PlatformInfo] = {platform.slug: platform for platform in PLATFORMS}
+
+def get_platform(slug: str) -> Optional[PlatformInfo]:
+    """按路由标识查找平台"""
+    return _by_slug.get(slug)
+
+def index_endpoints() -> List[str]:
+    """首页展示的接口列表"""
+    return (["/all - 获取所有平台热搜"]
+            + [f"{platform.endpoint} - {platform.description}" for platform in PLATFORMS]
+            + ["/api/hot-search - 获取热搜数据", "POST /batch - 一次获取多个平台热搜"])
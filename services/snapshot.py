@@ -0,0 +1,298 @@
+# 跨进程共享快照
+# 同一主机上的多个 worker 进程共用一份热搜快照：通过文件锁选出一个刷新进程抓取上游并写入快照，
+# 其余进程只读取。快照先写临时文件再原子替换，读者看到的总是完整的某个版本。
+#
+# 每个版本是一个文件，内容是预先编码好的响应体（各平台和 /all），文件头部是偏移索引：
+#   MAGIC(8) | 索引长度 uint32 | 索引 JSON | 响应体...
+# 读者 mmap 当前版本，按索引切片（指向映射的 memoryview，不复制）直接作为响应体返回，不再反序列化和重新编码：
+# ASGI 入口把切片原样交给服务器写出；WSGI 规范要求响应体为 bytes，Flask 入口在返回前复制一次。
+# 文件位于 tmpfs 时各进程共享同一份页缓存，worker 重启后也能立即用已有文件提供服务。
+# 快照替换后，仍在发送中的切片持有旧映射的引用，旧映射在发送完成后才释放。
+import concurrent.futures
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from config.config import config
+from models.models import ApiResponse
+from services.registry import PLATFORMS
+from utils import outbound
+from utils.executor import get_executor
+
+SNAPSHOT_FILE = "snapshot.bin"
+VERSIONS_DIR = "versions"
+LOCK_FILE = "refresher.lock"
+
+MAGIC = b"HSSNAP01"
+_PREFIX = struct.Struct("<8sI")
+
+# 索引中条目的类型：platform 为单个平台，aggregate 为聚合响应（如 /all）
+KIND_PLATFORM = "platform"
+KIND_AGGREGATE = "aggregate"
+
+class SnapshotFile:
+    """只读映射的快照文件"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"快照文件格式错误: {path}")
+        index = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + index_length])
+        self._base = _PREFIX.size + index_length
+        self.version: int = index["version"]
+        self.updated_at: float = index["updated_at"]
+        self.entries: Dict[str, Dict[str, Any]] = index["entries"]
+
+    def body(self, key: str) -> Optional[memoryview]:
+        """某个条目的响应体，为指向映射的切片，不复制"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        start = self._base + entry["offset"]
+        return memoryview(self._mmap)[start:start + entry["length"]]
+
+    def items(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """解码某个条目中的热搜数据，仅在需要数据本身时使用"""
+        body = self.body(key)
+        return None if body is None else json.loads(body.tobytes())["data"]
+
+    def close(self):
+        """释放映射，逐个读取历史版本（如导出）时使用，调用前 body() 返回的切片须已释放；
+        共享快照的当前版本由引用计数释放"""
+        self._mmap.close()
+
+def write_snapshot_file(path: str, version: int, entries: Dict[str, Dict[str, Any]]):
+    """写入快照文件，entries 为 键 -> {"kind", "updated_at", "body"}"""
+    index = {"version": version, "updated_at": time.time(), "entries": {}}
+    offset = 0
+    for key, entry in entries.items():
+        index["entries"][key] = {
+            "kind": entry["kind"],
+            "updated_at": entry["updated_at"],
+            "offset": offset,
+            "length": len(entry["body"])
+        }
+        offset += len(entry["body"])
+    encoded = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for entry in entries.values():
+            f.write(entry["body"])
+        f.flush()
+        os.fsync(f.fileno())
+
+class SharedSnapshot:
+    """跨进程共享的热搜快照"""
+
+    def __init__(self, directory: str, refresh_interval: float, max_age: float, history: int = 10):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.path = os.path.join(directory, SNAPSHOT_FILE)
+        self.versions_dir = os.path.join(directory, VERSIONS_DIR)
+        self.lock_path = os.path.join(directory, LOCK_FILE)
+        self.refresh_interval = refresh_interval
+        # 超过该时长的条目视为过期，由调用方回退到实时抓取
+        self.max_age = max_age
+        # 保留的历史版本文件数，负数表示全部保留
+        self.history = history
+        self.refresh_fn: Optional[Callable[[], Dict[str, List[Dict[str, Any]]]]] = None
+        # 由各平台数据生成聚合响应体（键 -> 已编码的响应体）
+        self.aggregate_fn: Optional[Callable[[Dict[str, List[Dict[str, Any]]]], Dict[str, bytes]]] = None
+
+        self._file: Optional[SnapshotFile] = None
+        self._file_id = None
+        self._load_lock = threading.Lock()
+        self._started_pid = None
+        self._lock_fd = None
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    @property
+    def version(self) -> int:
+        current = self._file
+        return current.version if current is not None else 0
+
+    @property
+    def is_refresher(self) -> bool:
+        """当前进程是否持有刷新锁"""
+        return self._lock_fd is not None
+
+    def _reload(self) -> Optional[SnapshotFile]:
+        """快照文件变化时重新映射，旧的映射在没有引用后自动释放"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self._file
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_id == self._file_id:
+            return self._file
+        with self._load_lock:
+            if file_id != self._file_id:
+                try:
+                    self._file = SnapshotFile(self.path)
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"读取共享快照失败: {str(e)}")
+                    return self._file
+                self._file_id = file_id
+        return self._file
+
+    def _fresh(self, key: str) -> Optional[SnapshotFile]:
+        """包含未过期条目 key 的当前快照文件"""
+        self.ensure_started()
+        current = self._reload()
+        if current is None:
+            return None
+        entry = current.entries.get(key)
+        if entry is None or time.time() - entry["updated_at"] > self.max_age:
+            return None
+        return current
+
+    def body(self, key: str) -> Optional[memoryview]:
+        """读取预编码的响应体，不存在或过期时返回 None"""
+        current = self._fresh(key)
+        return current.body(key) if current is not None else None
+
+    def last_body(self, key: str) -> Optional[memoryview]:
+        """读取预编码的响应体，不论是否过期，供过载时返回旧数据"""
+        current = self._reload()
+        return current.body(key) if current is not None else None
+
+    def age(self, key: str) -> Optional[float]:
+        """当前快照中条目 key 产生至今的秒数，不存在时返回 None"""
+        current = self._reload()
+        entry = current.entries.get(key) if current is not None else None
+        return time.time() - entry["updated_at"] if entry is not None else None
+
+    def get(self, platform: str) -> Optional[List[Dict[str, Any]]]:
+        """读取某个平台的快照数据，不存在或过期时返回 None"""
+        current = self._fresh(platform)
+        return current.items(platform) if current is not None else None
+
+    def write(self, platforms: Dict[str, List[Dict[str, Any]]]):
+        """写入新版本快照，抓取失败的平台沿用上一版本的数据"""
+        previous = self._reload()
+        now = time.time()
+        entries: Dict[str, Dict[str, Any]] = {}
+        if previous is not None:
+            # 沿用的平台直接复制已编码的响应体
+            for key, entry in previous.entries.items():
+                if entry["kind"] == KIND_PLATFORM and key not in platforms:
+                    entries[key] = {"kind": KIND_PLATFORM, "updated_at": entry["updated_at"],
+                                    "body": previous.body(key)}
+        for platform, items in platforms.items():
+            entries[platform] = {"kind": KIND_PLATFORM, "updated_at": now,
+                                 "body": ApiResponse(data=items).to_json()}
+
+        if self.aggregate_fn is not None:
+            merged = dict(platforms)
+            if previous is not None:
+                for key, entry in entries.items():
+                    if key not in merged:
+                        merged[key] = previous.items(key)
+            for key, body in self.aggregate_fn(merged).items():
+                entries[key] = {"kind": KIND_AGGREGATE, "updated_at": now, "body": body}
+
+        version = self.version + 1
+        version_path = os.path.join(self.versions_dir, f"{version:010d}.bin")
+        tmp_path = f"{version_path}.{os.getpid()}.tmp"
+        write_snapshot_file(tmp_path, version, entries)
+        os.replace(tmp_path, version_path)
+        # 当前版本是最新版本文件的硬链接，原子替换，读者要么看到旧版本，要么看到新版本
+        link_path = f"{self.path}.{os.getpid()}.tmp"
+        if os.path.lexists(link_path):
+            os.unlink(link_path)
+        os.link(version_path, link_path)
+        os.replace(link_path, self.path)
+        self._prune()
+
+    def _prune(self):
+        """清理超出保留数量的历史版本，已映射的读者不受影响；history 为负数时全部保留"""
+        if self.history < 0:
+            return
+        names = sorted(name for name in os.listdir(self.versions_dir) if name.endswith(".bin"))
+        for name in names[:-self.history] if self.history > 0 else names:
+            try:
+                os.unlink(os.path.join(self.versions_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def _try_acquire(self) -> bool:
+        """尝试成为刷新进程，持锁进程退出后锁自动释放"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        self.logger.info(f"进程 {os.getpid()} 成为共享快照刷新进程")
+        return True
+
+    def ensure_started(self):
+        """在当前进程启动后台线程（fork 之后的进程需要重新启动）"""
+        pid = os.getpid()
+        if self._started_pid == pid or self.refresh_fn is None:
+            return
+        with self._load_lock:
+            if self._started_pid == pid:
+                return
+            self._started_pid = pid
+            # fork 继承的锁描述符不代表当前进程持锁
+            self._lock_fd = None
+        thread = threading.Thread(target=self._run, name="snapshot-refresher", daemon=True)
+        thread.start()
+
+    def _run(self):
+        """刷新循环：未持锁时定期尝试竞选，持锁后按间隔刷新"""
+        while True:
+            if self.is_refresher or self._try_acquire():
+                started = time.time()
+                try:
+                    # 定期刷新让位于前台请求
+                    with outbound.priority(outbound.PRIORITY_BACKGROUND):
+                        self.write(self.refresh_fn())
+                    self.logger.info(f"共享快照已刷新到版本 {self.version}，耗时 {time.time() - started:.2f} 秒")
+                except Exception as e:
+                    self.logger.error(f"刷新共享快照失败: {str(e)}")
+            time.sleep(self.refresh_interval)
+
+def fetch_platforms(services: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """在共享抓取线程池中并发抓取一组平台（沿用当前优先级），只返回非空结果；结果在调用线程中按完成顺序汇总"""
+    def fetch(service) -> List[Dict[str, Any]]:
+        return [item.to_dict() for item in service.fetch_hot_search()]
+
+    executor = get_executor()
+    futures = {executor.submit(fetch, service): platform for platform, service in services.items()}
+    result = {}
+    for future in concurrent.futures.as_completed(futures):
+        platform = futures[future]
+        try:
+            hot_items = future.result()
+        except Exception as e:
+            logging.getLogger(__name__).error(f"抓取 {platform} 失败: {str(e)}")
+            continue
+        if hot_items:
+            result[platform] = hot_items
+    return result
+
+def create_shared_snapshot() -> Optional[SharedSnapshot]:
+    """按配置创建共享快照，刷新全部已注册平台"""
+    if not config.snapshot_dir:
+        return None
+    snapshot = SharedSnapshot(
+        config.snapshot_dir,
+        refresh_interval=config.snapshot_refresh_interval,
+        max_age=config.snapshot_refresh_interval * 3,
+        history=config.snapshot_history
+    )
+    snapshot.refresh_fn = lambda: fetch_platforms({platform.slug: platform.get_service() for platform in PLATFORMS})
+    return snapshot
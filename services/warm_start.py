@@ -0,0 +1,58 @@
+# 热启动持久化
+# 每次成功抓取后把平台数据写到本地目录（Vercel 上为 /tmp），进程重启或冷启动后先返回这份旧数据，
+# 同时在后台刷新，避免冷启动后的首批请求全部实时抓取上游。
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.codec import decode_items, encode_items
+
+class WarmStartStore:
+    """本地持久化的各平台最近一次抓取结果，文件内容为 抓取时间(double) + 编码后的条目"""
+
+    _HEADER = struct.Struct("<d")
+
+    def __init__(self, directory: str, max_age: float):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        # 超过该时长的数据不再作为热启动数据使用
+        self.max_age = max_age
+        self._ready = False
+
+    def _path(self, key: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in key)
+        return os.path.join(self.directory, f"{safe}.bin")
+
+    def load(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """读取某个平台的持久化数据，返回 (条目, 数据年龄秒数)"""
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            (fetched_at,) = self._HEADER.unpack_from(data, 0)
+            age = time.time() - fetched_at
+            if age > self.max_age:
+                return None
+            return decode_items(data[self._HEADER.size:]), age
+        except FileNotFoundError:
+            return None
+        except (OSError, struct.error, ValueError, IndexError) as e:
+            self.logger.error(f"读取热启动数据失败 {key}: {str(e)}")
+            return None
+
+    def save(self, key: str, items: List[Dict[str, Any]]):
+        """持久化某个平台的最新数据，先写临时文件再原子替换"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not self._ready:
+                os.makedirs(self.directory, exist_ok=True)
+                self._ready = True
+            with open(tmp_path, "wb") as f:
+                f.write(self._HEADER.pack(time.time()))
+                f.write(encode_items(items))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.error(f"写入热启动数据失败 {key}: {str(e)}")
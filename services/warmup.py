@@ -0,0 +1,197 @@
+# 上游连接预热
+# 进程启动后在后台解析全部平台的上游主机并在共享 Session 的连接池中建立连接（DNS、TCP、TLS 握手都提前完成），
+# 部署后第一批请求与稳定运行时一样直接复用连接。之后按间隔重复：
+#   - DNS 缓存即将过期的主机提前重新解析
+#   - 空闲期间被上游关闭的连接重新建立，已有可用连接的主机不做任何事
+# 预热只建立连接、不发送请求，不占用上游配额：urllib3 没有只建立连接的公开接口，这里直接从连接池取出连接
+# 并 connect() 后放回（_get_conn/_put_conn，连接状态依赖 urllib3 2.x 的 HTTPConnection.is_connected）。
+# requests 等 HTTP 相关模块在预热线程中才导入，不增加启动耗时。
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from config.config import config
+from services.platform_specs import PLATFORM_SPECS
+from utils import metrics, outbound
+from utils.executor import get_executor
+
+logger = logging.getLogger(__name__)
+
+def _spec_urls(spec: Dict[str, Any]) -> Iterator[str]:
+    yield spec["url"]
+    for alternate in spec.get("alternates", ()):
+        yield from _spec_urls(alternate)
+
+def upstream_origins() -> List[str]:
+    """全部平台的上游源站（scheme://host[:port]）；设置了上游覆盖地址时只有覆盖地址"""
+    if config.upstream_base_url:
+        parts = urlsplit(config.upstream_base_url)
+        return [f"{parts.scheme}://{parts.netloc}"]
+    origins = set()
+    for spec in PLATFORM_SPECS.values():
+        for url in _spec_urls(spec):
+            parts = urlsplit(url)
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+    return sorted(origins)
+
+def _connection_pool(session, url: str):
+    """Session 发送请求时实际使用的连接池，不是 HTTPAdapter 时返回 None"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    adapter = session.get_adapter(url)
+    if not isinstance(adapter, HTTPAdapter):
+        return None
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    if hasattr(adapter, "get_connection_with_tls_context"):
+        request = requests.Request("GET", url).prepare()
+        return adapter.get_connection_with_tls_context(request, settings["verify"], settings["proxies"], settings["cert"])
+    return adapter.get_connection(url, settings["proxies"])
+
+class Warmup:
+    """上游 DNS 解析与连接预热"""
+
+    def __init__(self, interval: float, concurrency: int, connections: int):
+        # 重复预热的间隔，0 表示只在启动时预热一次
+        self.interval = interval
+        self.concurrency = max(concurrency, 1)
+        # 每个源站保持的连接数
+        self.connections = max(connections, 1)
+        self.runs = 0
+        self.running = False
+        self.last_started: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._first_run = threading.Event()
+        self._started_pid = None
+
+    def warm(self, origin: str) -> Dict[str, Any]:
+        """预热单个源站：DNS 缓存即将过期时重新解析，连接池中可用连接不足时补足"""
+        from utils.dns_cache import get_dns_cache
+        from utils.http import get_session
+        
+        parts = urlsplit(origin)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        result: Dict[str, Any] = {"ok": False, "opened": 0}
+        start = time.perf_counter()
+        try:
+            dns_cache = get_dns_cache()
+            if dns_cache is not None:
+                expires_in = dns_cache.expires_in(parts.hostname, port)
+                # 下一轮预热之前会过期的提前解析，请求路径上不再遇到过期的缓存
+                if expires_in is None or expires_in < self.interval * 2:
+                    dns_cache.resolve(parts.hostname, port, refresh=True)
+            result["dns_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+            pool = _connection_pool(get_session(), origin + "/")
+            if pool is not None:
+                conns = []
+                try:
+                    for _ in range(min(self.connections, pool.pool.maxsize if pool.pool else 1)):
+                        # 取出时会关闭已被上游断开的连接
+                        conn = pool._get_conn()
+                        conns.append(conn)
+                        if not conn.is_connected:
+                            conn.timeout = config.api_timeout
+                            conn.connect()
+                            result["opened"] += 1
+                finally:
+                    for conn in conns:
+                        pool._put_conn(conn)
+            result["ok"] = True
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+        result["ms"] = round(elapsed * 1000, 1)
+        result["warmed_at"] = time.time()
+        metrics.WARMUP_SECONDS.observe(elapsed, parts.hostname)
+        with self._lock:
+            self._hosts[origin] = result
+        return result
+
+    def run(self):
+        """预热全部源站，同时进行的预热数不超过 concurrency；
+        每个源站单独作为后台任务提交到抓取线程池，两个源站之间排队的前台任务先执行"""
+        origins = upstream_origins()
+        self.running = True
+        self.last_started = time.time()
+        start = time.perf_counter()
+        try:
+            executor = get_executor()
+            pending = set()
+            for origin in origins:
+                if len(pending) >= self.concurrency:
+                    _, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                pending.add(executor.submit(self.warm, origin, priority=outbound.PRIORITY_BACKGROUND))
+            concurrent.futures.wait(pending)
+        finally:
+            self.running = False
+            self.last_duration = time.perf_counter() - start
+            self.runs += 1
+            self._first_run.set()
+        with self._lock:
+            failed = sum(1 for origin in origins if not self._hosts.get(origin, {}).get("ok"))
+        metrics.WARMUP_HOSTS.set(len(origins) - failed, "ok")
+        metrics.WARMUP_HOSTS.set(failed, "error")
+        logger.info(f"上游预热完成：{len(origins) - failed}/{len(origins)} 个源站，耗时 {self.last_duration:.2f} 秒")
+
+    def _loop(self):
+        while True:
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"上游预热失败: {str(e)}")
+            if self.interval <= 0:
+                return
+            time.sleep(self.interval)
+
+    def ensure_started(self, wait: float = 0):
+        """在当前进程启动后台预热线程（fork 之后的进程需要重新启动），wait 为等待首次预热完成的最长秒数"""
+        pid = os.getpid()
+        if self._started_pid != pid:
+            with self._lock:
+                if self._started_pid != pid:
+                    self._started_pid = pid
+                    self._first_run = threading.Event()
+                    threading.Thread(target=self._loop, name="upstream-warmup", daemon=True).start()
+        if wait > 0:
+            self._first_run.wait(wait)
+
+    def status(self) -> Dict[str, Any]:
+        """预热状态：最近一轮的开始时间和耗时、各源站结果、DNS 缓存"""
+        from utils.dns_cache import get_dns_cache
+        
+        with self._lock:
+            hosts = {origin: dict(result) for origin, result in self._hosts.items()}
+        dns_cache = get_dns_cache()
+        return {
+            "runs": self.runs,
+            "running": self.running,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "interval": self.interval,
+            "hosts": hosts,
+            "dns": dns_cache.status() if dns_cache is not None else None
+        }
+
+_warmup: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+def get_warmup() -> Warmup:
+    """获取进程共享的预热任务"""
+    global _warmup
+    if _warmup is None:
+        with _warmup_lock:
+            if _warmup is None:
+                _warmup = Warmup(config.warmup_interval, config.warmup_concurrency, config.warmup_connections)
+    return _warmup
+
+def start_warmup(wait: float = 0):
+    """按配置启动上游预热，WARMUP_INTERVAL 为负数时不预热"""
+    if config.warmup_interval >= 0:
+        get_warmup().ensure_started(wait)
@@ -0,0 +1,95 @@
+# 测试公共配置
+# 配置在导入时从环境变量读取，需要在导入应用模块之前设置：
+# 不使用热启动和共享快照目录，不预热，上游指向本机不可用的端口，测试中不会访问外网
+import os
+import sys
+import time
+
+os.environ.setdefault("WARM_START_DIR", "")
+os.environ.setdefault("SNAPSHOT_DIR", "")
+os.environ.setdefault("WARMUP_INTERVAL", "-1")
+os.environ.setdefault("UPSTREAM_BASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from services.all_service import AllService
+from utils.admission import Overloaded
+
+# 桩服务返回的数据产生时长和刷新间隔
+DATA_AGE = 12.0
+REFRESH_INTERVAL = 60.0
+ITEMS = [{"title": "热搜", "url": "https://example.com/1", "hot_value": 100}]
+# 桩服务流式响应的耗时
+STREAM_SECONDS = 0.05
+
+class StubAllService(AllService):
+    """不访问上游的 AllService：数据、数据时长和刷新间隔固定，缓存响应头沿用真实实现"""
+
+    def __init__(self):
+        super().__init__()
+        # 设置后需要实时抓取的请求抛出 Overloaded，stale 为过载时可返回的旧数据
+        self.overloaded = False
+        self.stale: bytes = None
+        # 返回空结果的平台
+        self.empty = set()
+        # 设置后数据接口抛出该异常
+        self.error: Exception = None
+
+    def data_age(self, key):
+        return DATA_AGE
+
+    def refresh_interval(self, key):
+        return REFRESH_INTERVAL
+
+    def _serve(self, result):
+        if self.error is not None:
+            raise self.error
+        if self.overloaded:
+            raise Overloaded("queue_full", 5)
+        return result
+
+    def serve_all_hot_search(self):
+        return self._serve({"百度": ITEMS})
+
+    def serve_platform_hot_search(self, service):
+        return self._serve([] if service.platform in self.empty else ITEMS)
+
+    def serve_batch(self, limits):
+        return self._serve({slug: {"code": 200, "message": "success", "data": ITEMS[:limit or None]}
+                            for slug, limit in limits.items()})
+
+    def shed(self, key):
+        return self.stale
+
+    def _stream_all_hot_search(self):
+        time.sleep(STREAM_SECONDS)
+        yield b'{"platform":"\xe7\x99\xbe\xe5\xba\xa6"}\n'
+        yield b'{"summary":{}}\n'
+
+@pytest.fixture
+def all_service(monkeypatch):
+    """替换 Flask 与 ASGI 入口使用的 AllService"""
+    import asgi
+    import handlers.all_handlers
+    import handlers.handlers
+
+    service = StubAllService()
+    monkeypatch.setattr(handlers.all_handlers, "all_service", service)
+    monkeypatch.setattr(handlers.handlers, "hot_search_service", service)
+    monkeypatch.setattr(asgi, "all_service", service)
+    return service
+
+@pytest.fixture(params=["flask", "asgi"])
+def client(request, all_service):
+    """分别针对 Flask 应用和 ASGI 应用的测试客户端"""
+    if request.param == "flask":
+        from main import create_app
+        return create_app().test_client()
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    import asgi
+    return TestClient(asgi.app)
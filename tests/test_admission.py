@@ -0,0 +1,131 @@
+# 入站准入控制
+import json
+import threading
+import time
+from contextlib import ExitStack
+from types import SimpleNamespace
+
+import pytest
+
+from config.config import config
+from services.all_service import ALL_KEY, AllService
+from utils.admission import AdmissionController, Overloaded, create_admission_controller
+
+class FakeCache:
+    """没有未过期数据的缓存，last 返回设置的旧数据"""
+
+    def __init__(self):
+        self.stale = {}
+
+    def get(self, key):
+        return None
+
+    def last(self, key):
+        return self.stale.get(key)
+
+def _wait_until(condition, timeout: float = 2.0):
+    """等待条件成立"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        time.sleep(0.001)
+
+def test_admits_up_to_limit_then_sheds():
+    controller = AdmissionController(2, 1, 2.0, retry_after=3)
+    with ExitStack() as stack:
+        stack.enter_context(controller.admit())
+        stack.enter_context(controller.admit())
+        assert controller.status() == {"in_flight": 2, "queued": 0, "max_concurrent": 2, "max_queue": 1}
+
+        # 第三个请求排队，释放配额后开始执行
+        admitted = threading.Event()
+        release = threading.Event()
+
+        def queued():
+            with controller.admit():
+                admitted.set()
+                release.wait(2)
+
+        thread = threading.Thread(target=queued)
+        thread.start()
+        _wait_until(lambda: controller.status()["queued"] == 1)
+
+        # 队列已满，立即拒绝
+        start = time.monotonic()
+        with pytest.raises(Overloaded) as excinfo:
+            with controller.admit():
+                pass
+        assert time.monotonic() - start < 0.5
+        assert excinfo.value.reason == "queue_full"
+        assert excinfo.value.retry_after == 3
+        assert not admitted.is_set()
+
+    assert admitted.wait(2)
+    assert controller.status()["in_flight"] == 1
+    release.set()
+    thread.join(2)
+    assert controller.status() == {"in_flight": 0, "queued": 0, "max_concurrent": 2, "max_queue": 1}
+
+def test_queue_timeout():
+    controller = AdmissionController(1, 1, 0.05, retry_after=7)
+    with controller.admit():
+        start = time.monotonic()
+        with pytest.raises(Overloaded) as excinfo:
+            with controller.admit():
+                pass
+        waited = time.monotonic() - start
+    assert 0.05 <= waited < 1
+    assert excinfo.value.reason == "timeout"
+    assert excinfo.value.retry_after == 7
+    assert "7 秒后重试" in str(excinfo.value)
+    assert controller.status()["queued"] == 0
+    assert controller.status()["in_flight"] == 0
+
+def test_release_on_error():
+    controller = AdmissionController(1, 0, 0)
+    with pytest.raises(RuntimeError):
+        with controller.admit():
+            raise RuntimeError("抓取失败")
+    with controller.admit():
+        assert controller.status()["in_flight"] == 1
+
+def test_unlimited():
+    controller = AdmissionController(0, 0, 0)
+    with ExitStack() as stack:
+        for _ in range(10):
+            stack.enter_context(controller.admit())
+        assert controller.status()["in_flight"] == 0
+
+def test_created_from_config(monkeypatch):
+    monkeypatch.setattr(config, "admission_max_concurrent", 3)
+    monkeypatch.setattr(config, "admission_max_queue", 6)
+    monkeypatch.setattr(config, "admission_queue_timeout", 0.5)
+    monkeypatch.setattr(config, "admission_retry_after", 9)
+    controller = create_admission_controller()
+    assert (controller.max_concurrent, controller.max_queue, controller.queue_timeout, controller.retry_after) == (3, 6, 0.5, 9)
+
+def test_shed_stale_or_unavailable():
+    cache = FakeCache()
+    service = AllService(cache=cache, admission=AdmissionController(1, 0, 0))
+    with service.admission.admit():
+        with pytest.raises(Overloaded):
+            service.serve_platform_hot_search(SimpleNamespace(platform="baidu"))
+        with pytest.raises(Overloaded):
+            service.serve_all_hot_search()
+
+    # 没有旧数据时返回 None，由调用方返回 503
+    assert service.shed("baidu") is None
+    assert service.shed(ALL_KEY) is None
+
+    items = [{"title": "热搜", "url": "https://example.com/1", "hot_value": 100}]
+    cache.stale["baidu"] = items
+    assert json.loads(service.shed("baidu"))["data"] == items
+    assert json.loads(service.shed(ALL_KEY))["data"] == {"百度": items}
+
+def test_shed_prefers_snapshot_body():
+    snapshot = SimpleNamespace(last_body=lambda key: b'{"code":200}' if key == "baidu" else None)
+    cache = FakeCache()
+    cache.stale["weibo"] = [{"title": "旧"}]
+    service = AllService(cache=cache, snapshot=snapshot, admission=AdmissionController(1, 0, 0))
+    assert service.shed("baidu") == b'{"code":200}'
+    assert json.loads(service.shed("weibo"))["data"] == [{"title": "旧"}]
@@ -0,0 +1,37 @@
+# POST /batch
+import pytest
+from flask.testing import FlaskClient
+
+def json_body(response):
+    """Flask 与 ASGI 测试客户端的响应体 JSON"""
+    return response.get_json() if hasattr(response, "get_json") else response.json()
+
+def test_batch(client):
+    response = client.post("/batch", json={"platforms": ["baidu", {"slug": "weibo", "limit": 1}]})
+    assert response.status_code == 200
+    data = json_body(response)["data"]
+    assert set(data) == {"baidu", "weibo"}
+    assert data["weibo"]["code"] == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "Surrogate-Key" not in response.headers
+
+@pytest.mark.parametrize("body", [{"platforms": []}, {"platforms": ["baidu"], "limit": -1}, [1, 2]])
+def test_bad_request(client, body):
+    response = client.post("/batch", json=body)
+    assert response.status_code == 400
+    assert json_body(response)["code"] == 400
+    assert response.headers["Cache-Control"] == "no-store"
+
+def test_invalid_json(client):
+    # Flask 测试客户端用 data 传原始请求体，httpx 用 content
+    raw = {"data": b"{"} if isinstance(client, FlaskClient) else {"content": b"{"}
+    response = client.post("/batch", headers={"Content-Type": "application/json"}, **raw)
+    assert response.status_code == 400
+    assert json_body(response)["code"] == 400
+
+def test_server_error(client, all_service):
+    all_service.error = RuntimeError("boom")
+    response = client.post("/batch", json={"platforms": ["baidu"]})
+    assert response.status_code == 500
+    assert json_body(response) == {"code": 500, "message": "服务器错误: boom", "data": None}
+    assert response.headers["Cache-Control"] == "no-store"
@@ -0,0 +1,130 @@
+# 缓存存储后端与条目编码
+import os
+import socket
+import threading
+
+import pytest
+
+from benchmarks.fake_redis import start_fake_redis
+from models.codec import decode_items, encode_items
+from services.cache_backends import DiskBackend, MemoryBackend, RedisBackend, estimate_size
+
+ITEMS = [
+    {"title": "热搜一", "url": "https://example.com/1", "hot_value": 100, "platform": "baidu", "rank": 1},
+    {"title": "热搜二", "url": "https://example.com/2", "hot_value": 90, "platform": "baidu", "rank": 2},
+    {"title": "热搜三", "url": "https://example.com/3", "hot_value": 80, "platform": "baidu", "rank": 3},
+]
+
+@pytest.fixture
+def redis_server():
+    server = start_fake_redis(password="secret")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def bad_reply_server():
+    """第一个连接回复无法解析的内容，之后的连接返回空值"""
+    listener = socket.create_server(("127.0.0.1", 0))
+    connections = []
+
+    def serve():
+        for reply in (b"$oops\r\n", b"$-1\r\n", b"$-1\r\n"):
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            connections.append(conn)
+            conn.recv(65536)
+            conn.sendall(reply)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"redis://127.0.0.1:{listener.getsockname()[1]}/0"
+    listener.close()
+    for conn in connections:
+        conn.close()
+
+def test_codec_round_trip():
+    items = ITEMS + [{"title": "缺少字段", "hot_value": None, "score": 1.5, "top": True, "delta": -3, "big": 1 << 70}]
+    assert decode_items(encode_items(items)) == items
+    assert decode_items(encode_items([])) == []
+
+def test_codec_rejects_other_data():
+    with pytest.raises(ValueError):
+        decode_items(b'[{"title": "a"}]')
+
+def test_memory_backend_lru_by_size():
+    size = estimate_size(ITEMS)
+    backend = MemoryBackend(max_bytes=size * 2)
+    backend.set("a", ITEMS, 60)
+    backend.set("b", ITEMS, 60)
+    assert backend.get("a") == ITEMS
+    backend.set("c", ITEMS, 60)
+    # b 最久未使用，被淘汰
+    assert backend.get("b") is None
+    assert backend.get("a") == ITEMS and backend.get("c") == ITEMS
+    assert backend.size == size * 2
+    backend.delete("a")
+    assert backend.size == size
+
+def test_memory_backend_expiry_and_oversized():
+    backend = MemoryBackend(max_bytes=estimate_size(ITEMS[:1]))
+    backend.set("a", ITEMS[:1], 0)
+    assert backend.get("a") is None
+    assert backend.size == 0
+    backend.set("b", ITEMS, 60)
+    assert backend.get("b") is None
+
+def test_disk_backend(tmp_path):
+    directory = str(tmp_path / "cache")
+    backend = DiskBackend(directory)
+    backend.set("baidu", ITEMS, 60)
+    assert DiskBackend(directory).get("baidu") == ITEMS
+    backend.set("expired", ITEMS, 0)
+    assert backend.get("expired") is None
+    backend.delete("baidu")
+    assert backend.get("baidu") is None
+    # 键中的路径字符被替换，不会越出缓存目录
+    backend.set("../escape", ITEMS, 60)
+    assert os.listdir(tmp_path) == ["cache"]
+    assert len(os.listdir(directory)) == 2
+
+@pytest.mark.parametrize("data", [b"", b"\x00" * 4, b"\x00" * 8 + b"HSI2\xff", b"\x00\x00\x00\x00\x00\x00\xf0\x7f" + b"garbage"])
+def test_disk_backend_corrupt_file(tmp_path, data):
+    backend = DiskBackend(str(tmp_path))
+    backend.set("baidu", ITEMS, 60)
+    with open(backend._path("baidu"), "wb") as f:
+        f.write(data)
+    assert backend.get("baidu") is None
+
+def test_redis_backend(redis_server):
+    backend = RedisBackend(redis_server.url.replace("redis://", "redis://:secret@").replace("/0", "/2"))
+    backend.set("baidu", ITEMS, 60)
+    assert backend.get("baidu") == ITEMS
+    assert redis_server.store.execute(2, [b"EXISTS", b"hot_search:baidu"]) == 1
+    # 另一个节点共用同一份数据
+    assert RedisBackend(redis_server.url.replace("redis://", "redis://:secret@").replace("/0", "/2")).get("baidu") == ITEMS
+    backend.delete("baidu")
+    assert backend.get("baidu") is None
+    backend.close()
+
+def test_redis_backend_wrong_password(redis_server):
+    backend = RedisBackend(redis_server.url.replace("redis://", "redis://:wrong@"))
+    assert backend.get("baidu") is None
+    assert backend._pool == []
+
+def test_redis_backend_connection_error():
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        port = listener.getsockname()[1]
+    backend = RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=0.5)
+    assert backend.get("baidu") is None
+    backend.set("baidu", ITEMS, 60)
+    backend.delete("baidu")
+
+def test_redis_backend_drops_connection_after_bad_reply(bad_reply_server):
+    backend = RedisBackend(bad_reply_server, timeout=1)
+    assert backend.get("baidu") is None
+    # 读取状态未知的连接不放回连接池，下一次请求使用新连接
+    assert backend._pool == []
+    assert backend.get("baidu") is None
+    assert len(backend._pool) == 1
@@ -0,0 +1,115 @@
+# 各路由的 CDN 缓存响应头，Flask 与 ASGI 入口分别验证
+import pytest
+
+from config.config import config
+from services.all_service import AGGREGATE_PLATFORMS
+from utils.cache_headers import SURROGATE_KEY_DATA
+
+DATA_CACHE_CONTROL = "public, max-age=0, s-maxage=60, stale-while-revalidate=60, stale-if-error=86400"
+ALL_SURROGATE_KEY = " ".join([SURROGATE_KEY_DATA, "all", *AGGREGATE_PLATFORMS.values()])
+
+@pytest.fixture(autouse=True)
+def cdn_config(monkeypatch):
+    monkeypatch.setattr(config, "cdn_cache", True)
+    monkeypatch.setattr(config, "cdn_max_age", 0)
+    monkeypatch.setattr(config, "cdn_stale_while_revalidate", 60)
+    monkeypatch.setattr(config, "cdn_stale_if_error", 86400)
+
+def json_body(response):
+    """Flask 与 ASGI 测试客户端的响应体 JSON"""
+    return response.get_json() if hasattr(response, "get_json") else response.json()
+
+def assert_data_headers(response, surrogate_key, vary="Accept-Encoding"):
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == DATA_CACHE_CONTROL
+    assert response.headers["Age"] == "12"
+    assert response.headers["Vary"] == vary
+    assert response.headers["Surrogate-Key"] == surrogate_key
+
+def assert_no_store(response):
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "Surrogate-Key" not in response.headers
+    assert "Age" not in response.headers
+
+def test_platform(client):
+    assert_data_headers(client.get("/baidu"), f"{SURROGATE_KEY_DATA} baidu")
+
+def test_platform_snapshot_body(client, all_service, monkeypatch):
+    monkeypatch.setattr(all_service, "get_response_body", lambda key: memoryview(b'{"code":200,"data":[]}'))
+    response = client.get("/baidu")
+    assert_data_headers(response, f"{SURROGATE_KEY_DATA} baidu")
+    assert json_body(response) == {"code": 200, "data": []}
+
+@pytest.mark.parametrize("path", ["/all", "/api/hot-search"])
+def test_all(client, path):
+    assert_data_headers(client.get(path), ALL_SURROGATE_KEY, vary="Accept, Accept-Encoding")
+
+@pytest.mark.parametrize("path,accept", [("/all.ndjson", None), ("/all", "application/x-ndjson")])
+def test_all_ndjson(client, path, accept):
+    response = client.get(path, headers={"Accept": accept} if accept else {})
+    assert_data_headers(response, ALL_SURROGATE_KEY, vary="Accept, Accept-Encoding")
+    assert response.headers["Content-Type"].startswith("application/x-ndjson")
+    assert response.headers["X-Accel-Buffering"] == "no"
+
+@pytest.mark.parametrize("path", ["/apis", "/apis.json"])
+def test_apis(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    max_age = config.apis_cache_max_age
+    assert response.headers["Cache-Control"] == f"public, max-age={max_age}, s-maxage={max_age}"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Surrogate-Key"] == "apis"
+    not_modified = client.get(path, headers={"If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["Surrogate-Key"] == "apis"
+
+def test_index(client):
+    response = client.get("/")
+    max_age = config.apis_cache_max_age
+    assert response.headers["Cache-Control"] == f"public, max-age={max_age}, s-maxage={max_age}"
+    assert response.headers["Surrogate-Key"] == "index"
+
+@pytest.mark.parametrize("path", ["/metrics", "/api/health"])
+def test_not_cached(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert_no_store(response)
+
+def test_empty_result_not_cached(client, all_service):
+    all_service.empty.add("baidu")
+    response = client.get("/baidu")
+    assert response.status_code == 200
+    assert json_body(response)["code"] == 404
+    assert_no_store(response)
+
+def test_error_not_cached(client, all_service):
+    all_service.error = RuntimeError("boom")
+    response = client.get("/baidu")
+    assert response.status_code == 500
+    assert_no_store(response)
+
+@pytest.mark.parametrize("path,vary", [("/baidu", "Accept-Encoding"), ("/all", "Accept, Accept-Encoding")])
+def test_shed_stale(client, all_service, path, vary):
+    all_service.overloaded = True
+    all_service.stale = b'{"code":200,"message":"success","data":[]}'
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=0, s-maxage=5, stale-if-error=86400"
+    assert response.headers["X-Data-Stale"] == "1"
+    assert response.headers["Vary"] == vary
+    assert response.headers["Surrogate-Key"].startswith(f"{SURROGATE_KEY_DATA} ")
+    assert "Age" not in response.headers
+
+def test_shed_unavailable(client, all_service):
+    all_service.overloaded = True
+    response = client.get("/baidu")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert_no_store(response)
+
+def test_cdn_cache_disabled(client, monkeypatch):
+    monkeypatch.setattr(config, "cdn_cache", False)
+    response = client.get("/baidu")
+    assert response.status_code == 200
+    assert "Cache-Control" not in response.headers
+    assert "Surrogate-Key" not in response.headers
@@ -0,0 +1,87 @@
+# 抓取线程池
+import os
+import threading
+
+import pytest
+
+from utils import executor, outbound
+from utils.executor import PriorityExecutor, get_executor
+
+def _block(pool: PriorityExecutor) -> threading.Event:
+    """占住线程池唯一的线程，返回放行用的事件"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(2)
+
+    pool.submit(blocker)
+    assert started.wait(2)
+    return release
+
+def test_interactive_runs_before_queued_background():
+    pool = PriorityExecutor(1, "test")
+    release = _block(pool)
+    order = []
+    futures = [
+        pool.submit(order.append, "background-1", priority=outbound.PRIORITY_BACKGROUND),
+        pool.submit(order.append, "background-2", priority=outbound.PRIORITY_BACKGROUND),
+        pool.submit(order.append, "interactive-1", priority=outbound.PRIORITY_INTERACTIVE),
+        pool.submit(order.append, "interactive-2"),
+    ]
+    assert pool.status()["queued"] == {"background": 2, "interactive": 2}
+    release.set()
+    for future in futures:
+        future.result(2)
+    assert order == ["interactive-1", "interactive-2", "background-1", "background-2"]
+    assert pool.status()["threads"] == 1
+
+def test_task_inherits_submitting_priority():
+    pool = PriorityExecutor(2, "test")
+    with outbound.priority(outbound.PRIORITY_BACKGROUND):
+        future = pool.submit(outbound.current_priority)
+    assert future.result(2) == outbound.PRIORITY_BACKGROUND
+    assert pool.submit(outbound.current_priority).result(2) == outbound.PRIORITY_INTERACTIVE
+
+def test_exception_set_on_future():
+    pool = PriorityExecutor(1, "test")
+    future = pool.submit(int, "not a number")
+    with pytest.raises(ValueError):
+        future.result(2)
+    # 线程在任务失败后继续工作
+    assert pool.submit(int, "7").result(2) == 7
+
+def test_cancelled_task_skipped():
+    pool = PriorityExecutor(1, "test")
+    release = _block(pool)
+    ran = []
+    cancelled = pool.submit(ran.append, "cancelled")
+    assert cancelled.cancel()
+    future = pool.submit(ran.append, "kept")
+    release.set()
+    future.result(2)
+    assert ran == ["kept"]
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="需要 os.fork")
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_fork_gets_fresh_executor():
+    parent = get_executor("fork-test")
+    assert parent.submit(os.getpid).result(2) == os.getpid()
+    assert get_executor("fork-test") is parent
+
+    pid = os.fork()
+    if pid == 0:
+        # 子进程不继承线程池的线程，应重新创建线程池，并能正常执行任务
+        status = 1
+        try:
+            child = get_executor("fork-test")
+            if child is not parent and child.submit(os.getpid).result(2) == os.getpid():
+                status = 0
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    # 父进程仍使用原来的线程池
+    assert get_executor("fork-test") is parent
+    assert executor._executors_pid == os.getpid()
@@ -0,0 +1,159 @@
+# 声明式平台定义的抽取
+import json
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from benchmarks.replay import FixtureStore, create_replay_session
+from config.config import config
+from services import extraction, platform_services
+from services.extraction import CompiledSpec, _unwrap_jsonp
+from services.platform_specs import PLATFORM_SPECS
+from utils import http, outbound
+
+# 各平台按录制数据抽取出的 (标题, 链接, 热度)，由改为声明式定义之前的手写解析器生成；
+# github 除外：原解析器向 HotSearchItem 传入了不存在的 desc 参数，总是返回空列表
+# weibo（JSON）和 v2ex（正则）的录制数据超过 50 条，默认不限条数时应全部返回
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "platform_rows.json"), encoding="utf-8") as f:
+    EXPECTED_ROWS = json.load(f)
+
+# 录制数据中的 history 是按月的模板，固定日期后当天的事件才确定
+NOW = datetime(2026, 3, 15, 12, 0)
+
+class FixedDatetime(datetime):
+    """now() 固定为 NOW 的 datetime"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+class FakeResponse:
+    """只实现抽取用到的属性的响应"""
+
+    def __init__(self, body: bytes, status_code: int = 200, headers=None):
+        self.content = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+class FakeService:
+    """依次返回给定响应的服务，记录每次请求的参数"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+@pytest.fixture
+def replay(monkeypatch):
+    """上游请求改为回放 benchmarks/fixtures 中的录制数据，返回录制数据集合"""
+    store = FixtureStore()
+    monkeypatch.setattr(http, "_session", create_replay_session(store))
+    monkeypatch.setattr(outbound, "_scheduler", outbound.OutboundScheduler(outbound.HostLimit(1 << 30, 0, 1)))
+    monkeypatch.setattr(config, "upstream_base_url", "")
+    monkeypatch.setattr(extraction, "datetime", FixedDatetime)
+    # 按月数据文件的缓存是进程内共享的，不沿用其他测试下载的
+    monkeypatch.setattr(platform_services.HistoryService.spec, "_documents", {})
+    return store
+
+def _spec(extract, fields, **spec):
+    """example.com 上的平台定义"""
+    return CompiledSpec("test", dict(spec, url="https://example.com/", extract=extract, fields=fields))
+
+def test_every_platform_matches_recorded_rows(replay):
+    platforms = replay.platforms()
+    assert sorted(platforms) == sorted(EXPECTED_ROWS)
+    for platform, service_name in platforms.items():
+        items = getattr(platform_services, service_name)().get_hot_search()
+        assert [[item.title, item.url, item.hot_value] for item in items] == EXPECTED_ROWS[platform], platform
+        assert [item.rank for item in items] == list(range(1, len(items) + 1))
+    assert len(EXPECTED_ROWS["weibo"]) > 50 and len(EXPECTED_ROWS["v2ex"]) > 50
+
+def test_require_skips_records_and_counts_toward_limit():
+    spec = _spec({"type": "json", "path": "data", "require": "target"}, {"title": "target.title"}, limit=2)
+    body = json.dumps({"data": [{"ad": 1}, {"target": {"title": "a"}}, {"target": None},
+                                {"target": {"title": "b"}}, {"target": {"title": "c"}}]}).encode()
+    assert [item.title for item in spec.build(spec.records(FakeResponse(body), None))] == ["a", "b"]
+
+def test_unwrap_jsonp():
+    assert _unwrap_jsonp(' news_callback({"items": [1, 2]});\n') == '{"items": [1, 2]}'
+    assert _unwrap_jsonp('{"items": []}') == '{"items": []}'
+
+def test_jsonp_records():
+    spec = _spec({"type": "jsonp", "path": "items"}, {"title": "title", "url": "url"}, encoding="gbk")
+    body = 'cb({"total": 2, "items": [{"title": "甲", "url": "u1"}, {"title": "乙", "url": "u2"}]})'.encode("gbk")
+    items = spec.build(spec.records(FakeResponse(body), None))
+    assert [(item.title, item.url) for item in items] == [("甲", "u1"), ("乙", "u2")]
+
+def test_regex_records():
+    body = "".join(f'<a href="/n/{i}"><b> 标题{i} </b></a>' for i in range(5)).encode()
+    spec = _spec({"type": "regex", "pattern": r'<a href="([^"]+)"><b>([^<]+)</b>'},
+                 {"title": 2, "url": {"from": 1, "base": "https://example.com"}}, limit=3)
+    items = spec.build(spec.records(FakeResponse(body), None))
+    assert [(item.title, item.url) for item in items] == [
+        ("标题0", "https://example.com/n/0"), ("标题1", "https://example.com/n/1"), ("标题2", "https://example.com/n/2")]
+
+    single = _spec({"type": "regex", "pattern": r'<b>([^<]+)</b>'}, {"title": 1})
+    assert [item.title for item in single.build(single.records(FakeResponse(body), None))] == [
+        f"标题{i}" for i in range(5)]
+
+def test_build_index_splits_month_file(replay):
+    spec = CompiledSpec("history", PLATFORM_SPECS["history"])
+    content = replay.find("GET", "https://baike.baidu.com/cms/home/eventsOnHistory/03.json").body(
+        "https://baike.baidu.com/cms/home/eventsOnHistory/03.json")
+    rows = spec._build_index(content, {"MM": "03", "DD": "15"})
+    assert "0301" in rows
+    assert [list(row) for row in rows["0315"]] == EXPECTED_ROWS["history"]
+
+def test_load_document_revalidates():
+    spec = CompiledSpec("history", dict(PLATFORM_SPECS["history"], index={"key": "{MM}{DD}", "revalidate": 0}))
+    context = {"MM": "03", "DD": "15"}
+    url = "https://example.com/03.json"
+    body = json.dumps({"03": {"0315": [{"year": "2000", "title": "<b>甲</b>", "link": "l1"}]}}).encode()
+    changed = json.dumps({"03": {"0315": [{"year": "2001", "title": "乙", "link": "l2"}]}}).encode()
+    service = FakeService(
+        FakeResponse(body, headers={"ETag": '"v1"'}),
+        FakeResponse(b"", status_code=304),
+        FakeResponse(body),
+        RuntimeError("连接失败"),
+        FakeResponse(changed),
+    )
+
+    document = spec._load_document(service, url, context)
+    assert document.rows == {"0315": [("2000年：甲", "l1", 0)]}
+    assert "If-None-Match" not in service.requests[0][2]["headers"]
+
+    # 304：沿用已解析的数据，只刷新验证时间
+    validated_at = document.validated_at
+    time.sleep(0.01)
+    assert spec._load_document(service, url, context) is document
+    assert service.requests[1][2]["headers"]["If-None-Match"] == '"v1"'
+    assert document.validated_at > validated_at
+
+    # 内容摘要不变：不重新解析，校验器按新响应更新
+    assert spec._load_document(service, url, context) is document
+    assert document.etag is None
+
+    # 重新验证失败时继续使用已有的数据
+    assert spec._load_document(service, url, context) is document
+
+    updated = spec._load_document(service, url, context)
+    assert updated is not document
+    assert updated.rows == {"0315": [("2001年：乙", "l2", 0)]}
+    assert spec._documents == {url: updated}
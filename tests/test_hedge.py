@@ -0,0 +1,134 @@
+# 对冲请求
+import json
+import threading
+import time
+
+import pytest
+
+from config.config import config
+from services.extraction import CompiledSpec
+from utils.hedge import MIN_SAMPLES, LatencyTracker, hedged
+
+class Attempt:
+    """记录启动时间、耗时 seconds 后返回结果或抛出异常的来源"""
+
+    def __init__(self, seconds: float, result=None, error: Exception = None):
+        self.seconds = seconds
+        self.result = result
+        self.error = error
+        self.started_at = None
+        self.finished = threading.Event()
+
+    def __call__(self):
+        self.started_at = time.monotonic()
+        time.sleep(self.seconds)
+        self.finished.set()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+class FakeResponse:
+    """标题为请求地址的 JSON 响应"""
+
+    status_code = 200
+
+    def __init__(self, url: str):
+        self.content = json.dumps({"list": [{"title": url}]}).encode()
+
+    def raise_for_status(self):
+        pass
+
+class SlowService:
+    """按地址延迟返回的上游，记录各地址的请求时间"""
+
+    last_fetch_time = 0.0
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.started = {}
+
+    def request(self, method, url, **kwargs):
+        self.started[url] = time.monotonic()
+        time.sleep(self.delays[url])
+        return FakeResponse(url)
+
+    def add_fetch_time(self, seconds: float):
+        pass
+
+def test_percentile_needs_enough_samples():
+    tracker = LatencyTracker()
+    for i in range(MIN_SAMPLES - 1):
+        tracker.observe(i / 100)
+    assert tracker.percentile(95) is None
+    tracker.observe(1.0)
+    assert tracker.percentile(0) == 0.0
+    assert tracker.percentile(50) == 0.1
+    assert tracker.percentile(100) == 1.0
+
+def test_percentile_window():
+    tracker = LatencyTracker(size=MIN_SAMPLES)
+    for _ in range(MIN_SAMPLES):
+        tracker.observe(5.0)
+    for _ in range(MIN_SAMPLES):
+        tracker.observe(0.5)
+    assert tracker.percentile(99) == 0.5
+
+def test_no_hedge_when_primary_fast():
+    primary, alternate = Attempt(0.01, "primary"), Attempt(0, "alternate")
+    assert hedged([primary, alternate], 0.5) == "primary"
+    assert alternate.started_at is None
+
+def test_hedge_starts_after_delay_and_first_wins():
+    primary, alternate = Attempt(1.0, "primary"), Attempt(0.01, "alternate")
+    start = time.monotonic()
+    assert hedged([primary, alternate], 0.1) == "alternate"
+    assert alternate.started_at - primary.started_at >= 0.1
+    # 不等待较慢的主接口，其结果被丢弃
+    assert time.monotonic() - start < 0.5
+    assert not primary.finished.is_set()
+
+def test_failed_primary_starts_alternate_immediately():
+    primary, alternate = Attempt(0, error=ConnectionError("主接口失败")), Attempt(0, "alternate")
+    start = time.monotonic()
+    assert hedged([primary, alternate], 5) == "alternate"
+    assert time.monotonic() - start < 1
+
+def test_invalid_result_starts_alternate():
+    primary, alternate = Attempt(0, []), Attempt(0, ["alternate"])
+    assert hedged([primary, alternate], 5) == ["alternate"]
+    # 全部无效时返回最后一个结果
+    assert hedged([Attempt(0, []), Attempt(0, ())], 5) == ()
+
+def test_all_failed_raises_attempt_error():
+    error = TimeoutError("备用接口超时")
+    primary, alternate = Attempt(0, error=ConnectionError("主接口失败")), Attempt(0.05, error=error)
+    with pytest.raises(TimeoutError) as excinfo:
+        hedged([primary, alternate], 5)
+    assert excinfo.value is error
+
+    # 只有一个来源时直接抛出它的异常
+    with pytest.raises(ConnectionError):
+        hedged([Attempt(0, error=ConnectionError("主接口失败"))], 0.01)
+
+def test_spec_hedges_after_tracked_percentile(monkeypatch):
+    # 默认延迟很长，只有按近期耗时的分位数才会及时启动备用来源
+    monkeypatch.setattr(config, "hedge_delay", 5.0)
+    monkeypatch.setattr(config, "hedge_percentile", 95)
+    spec = CompiledSpec("test", {
+        "url": "https://primary.example.com/",
+        "extract": {"type": "json", "path": "list"},
+        "fields": {"title": "title"},
+        "alternates": [{
+            "url": "https://alternate.example.com/",
+            "extract": {"type": "json", "path": "list"},
+            "fields": {"title": "title"},
+        }],
+    })
+    for _ in range(MIN_SAMPLES):
+        spec.latency.observe(0.1)
+    service = SlowService({"https://primary.example.com/": 1.0, "https://alternate.example.com/": 0})
+    start = time.monotonic()
+    assert [item.title for item in spec.fetch(service)] == ["https://alternate.example.com/"]
+    assert time.monotonic() - start < 0.8
+    hedge_after = service.started["https://alternate.example.com/"] - service.started["https://primary.example.com/"]
+    assert 0.1 <= hedge_after < 0.8
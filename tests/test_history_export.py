@@ -0,0 +1,96 @@
+# 历史热搜导出
+import io
+import json
+
+import pytest
+
+from config.config import config
+from services import history_export, snapshot
+from services.history_export import iter_history_rows, iter_ndjson, iter_parquet
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """三个版本的快照目录，返回 (目录, [各版本的抓取时间])：
+    v1 抓取 baidu 和 weibo，v2 只抓取 baidu（weibo 沿用 v1），v3 只抓取 weibo（baidu 沿用 v2）"""
+    clock = [1_700_000_000.0]
+    monkeypatch.setattr(snapshot.time, "time", lambda: clock[0])
+    shared = snapshot.SharedSnapshot(str(tmp_path), refresh_interval=60, max_age=180, history=-1)
+    times = []
+    for platforms in (
+        {"baidu": [{"title": "a", "url": "https://a", "hot_value": 3}, {"title": "b", "url": "https://b"}],
+         "weibo": [{"title": "c", "url": "https://c", "hot_value": "12"}]},
+        {"baidu": [{"rank": 7, "title": "d", "url": "https://a", "hot_value": 1}]},
+        {"weibo": [{"title": "e", "url": "https://e"}]},
+    ):
+        times.append(clock[0])
+        shared.write(platforms)
+        clock[0] += 100
+    monkeypatch.undo()
+    return str(tmp_path), times
+
+def _rows(batches):
+    return [row for rows in batches for row in rows]
+
+def test_rows_exported_once_per_capture(history):
+    directory, (t1, t2, t3) = history
+    rows = _rows(iter_history_rows(directory, 0, float("inf")))
+    assert [(row[0], row[1], row[2], row[4]) for row in rows] == [
+        (t1, 1, "baidu", "a"), (t1, 1, "baidu", "b"), (t1, 1, "weibo", "c"),
+        (t2, 2, "baidu", "d"),
+        (t3, 3, "weibo", "e"),
+    ]
+    # 缺省排名按位置补齐，热度统一为整数
+    assert [(row[3], row[6]) for row in rows] == [(1, 3), (2, None), (1, 12), (7, 1), (1, None)]
+
+def test_time_range_and_platforms(history):
+    directory, (t1, t2, t3) = history
+    # 范围含起始、不含结束；v3 中沿用的 baidu 不重复导出
+    assert [(row[0], row[2]) for row in _rows(iter_history_rows(directory, t2, t3))] == [(t2, "baidu")]
+    assert [(row[0], row[4]) for row in _rows(iter_history_rows(directory, 0, float("inf"), ["weibo"]))] == [
+        (t1, "c"), (t3, "e")]
+    assert _rows(iter_history_rows(directory, t3 + 1, float("inf"))) == []
+
+def test_missing_directory(tmp_path):
+    assert list(iter_history_rows(str(tmp_path / "missing"), 0, float("inf"))) == []
+
+def test_ndjson_round_trip(history):
+    directory, times = history
+    rows = _rows(iter_history_rows(directory, 0, float("inf")))
+    lines = b"".join(iter_ndjson(iter_history_rows(directory, 0, float("inf")))).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [(r["version"], r["platform"], r["rank"], r["title"], r["url"], r["hot_value"]) for r in records] == [
+        row[1:] for row in rows]
+    assert records[0]["captured_at"] == history_export._isoformat(times[0])
+
+def test_parquet_row_groups_and_round_trip(history):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    directory, times = history
+    rows = _rows(iter_history_rows(directory, 0, float("inf")))
+    chunks = list(iter_parquet(iter_history_rows(directory, 0, float("inf")), row_group_rows=2))
+    # 每写完一个行组产出一次，最后一块为剩余行和文件尾
+    assert len(chunks) == 3
+    parquet_file = pyarrow.parquet.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)] == [2, 2, 1]
+    table = parquet_file.read()
+    assert pyarrow.types.is_dictionary(table.schema.field("platform").type)
+    assert pyarrow.types.is_dictionary(table.schema.field("url").type)
+    records = table.to_pylist()
+    assert [(r["version"], r["platform"], r["rank"], r["title"], r["url"], r["hot_value"]) for r in records] == [
+        row[1:] for row in rows]
+    assert records[0]["captured_at"].timestamp() == times[0]
+
+def test_admin_export(history, monkeypatch):
+    from main import create_app
+
+    directory, times = history
+    monkeypatch.setattr(config, "admin_token", "secret")
+    monkeypatch.setattr(config, "snapshot_dir", directory)
+    client = create_app().test_client()
+    response = client.get(f"/admin/export?to={times[2]}&platforms=weibo", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    assert response.headers["Content-Disposition"].endswith(".ndjson")
+    assert [json.loads(line)["title"] for line in response.get_data().splitlines()] == ["c"]
+    assert client.get("/admin/export?format=csv", headers={"X-Admin-Token": "secret"}).status_code == 400
@@ -0,0 +1,86 @@
+# 增量 JSON 抽取
+import json
+
+import pytest
+
+from utils import json_stream
+from utils.json_stream import locate, take_array
+
+def _document(count: int) -> str:
+    """data.list 下有 count 个元素的响应，奇数号元素带 target"""
+    records = [{"id": i, "target": {"title": f"t{i}"} if i % 2 else None} for i in range(count)]
+    return json.dumps({"code": 0, "data": {"total": count, "list": records}})
+
+def _no_streaming(*args):
+    """替换 _take_elements，确认走整体解码"""
+    raise AssertionError("不应逐个解码")
+
+def test_limit_stops_mid_array():
+    text = _document(100)
+    assert [record["id"] for record in take_array(text, ["data", "list"], 3)] == [0, 1, 2]
+    # 取够之后的内容不再解码，之后的格式错误不影响结果
+    broken = text[:text.index('{"id": 10,')] + "not json"
+    assert [record["id"] for record in take_array(broken, ["data", "list"], 3)] == [0, 1, 2]
+
+def test_short_array_decoded_in_one_call(monkeypatch):
+    monkeypatch.setattr(json_stream, "_take_elements", _no_streaming)
+    text = _document(4)
+    assert [record["id"] for record in take_array(text, ["data", "list"], 3)] == [0, 1, 2]
+    assert [record["id"] for record in take_array(text, ["data", "list"], 10)] == [0, 1, 2, 3]
+    assert take_array('{"list": [ ]}', ["list"], 3) == []
+
+def test_unlimited_returns_whole_array(monkeypatch):
+    monkeypatch.setattr(json_stream, "_take_elements", _no_streaming)
+    assert len(take_array(_document(100), ["data", "list"])) == 100
+
+def test_siblings_skipped_along_path():
+    text = json.dumps({
+        "before": {"list": [{"id": "wrong"}], "s": "} ] \" {"},
+        "nums": [1, -2.5e3, True, False, None],
+        "data": [{"list": "first"}, {"x": [[], {}], "list": [{"id": "right"}]}],
+        "after": {"list": []},
+    })
+    assert take_array(text, ["data", "1", "list"], 1) == [{"id": "right"}]
+    assert locate(text, ["data", "1", "x", "0"]) == text.index("[]")
+
+def test_accept_counts_toward_limit():
+    def accept(record):
+        return record["target"] is not None
+    # 长数组逐个解码和短数组整体解码两条路径结果一致
+    for count in (100, 8):
+        records = take_array(_document(count), ["data", "list"], 3, accept)
+        assert [record["id"] for record in records] == [1, 3, 5]
+    assert [record["id"] for record in take_array(_document(8), ["data", "list"], 0, accept)] == [1, 3, 5, 7]
+
+def test_missing_path_returns_none():
+    text = _document(3)
+    assert take_array(text, ["data", "items"], 3) is None
+    assert take_array(text, ["data", "list", "5"], 3) is None
+    assert take_array(text, ["data", "total"], 3) is None
+    assert take_array(text, ["code", "list"], 3) is None
+    assert take_array("", ["data"], 3) is None
+
+def test_truncated_while_streaming_raises(monkeypatch):
+    calls = []
+    take_elements = json_stream._take_elements
+    monkeypatch.setattr(json_stream, "_take_elements", lambda *args: calls.append(1) or take_elements(*args))
+    # 第一个元素很短，按它估算会逐个解码，取够之前就遇到截断
+    text = '{"data": {"list": [0, ' + ", ".join(json.dumps({"title": "x" * 20}) for _ in range(5)) + ', {"title": "x'
+    with pytest.raises(ValueError):
+        take_array(text, ["data", "list"], 10)
+    assert calls
+
+def test_truncated_short_array_raises(monkeypatch):
+    monkeypatch.setattr(json_stream, "_take_elements", _no_streaming)
+    with pytest.raises(ValueError):
+        take_array(_document(4)[:-10], ["data", "list"], 10)
+
+@pytest.mark.parametrize("text", [
+    '{"code": 0 "data": {"list": [1]}}',
+    '{"code": [1, 2, "data": {"list": [1]}}',
+    '{"data" {"list": [1]}}',
+    '{"data": {"list": [1, 2,, 3]}}',
+])
+def test_malformed_json_raises(text):
+    with pytest.raises(ValueError):
+        take_array(text, ["data", "list"], 50)
@@ -0,0 +1,48 @@
+# 指标导出格式
+import pytest
+
+from utils import metrics
+
+parser = pytest.importorskip("prometheus_client.parser")
+
+def _families(registry: metrics.MetricsRegistry):
+    return {family.name: family for family in parser.text_string_to_metric_families(registry.render())}
+
+def test_counter_family_matches_samples():
+    registry = metrics.MetricsRegistry()
+    errors = registry.register(metrics.Counter("test_errors", "错误数", ["platform"]))
+    errors.inc("baidu")
+    errors.inc("baidu", amount=2)
+
+    text = registry.render()
+    assert "# TYPE test_errors_total counter" in text
+    family = _families(registry)["test_errors"]
+    assert family.type == "counter"
+    assert [(sample.name, sample.labels, sample.value) for sample in family.samples] == [
+        ("test_errors_total", {"platform": "baidu"}, 3.0)]
+
+def test_gauge_and_histogram_types():
+    registry = metrics.MetricsRegistry()
+    registry.register(metrics.Gauge("test_in_flight", "进行中的请求数")).set(2)
+    registry.register(metrics.Histogram("test_seconds", "耗时", ["endpoint"], buckets=(0.1, 1))).observe(0.5, "/all")
+
+    families = _families(registry)
+    assert families["test_in_flight"].type == "gauge"
+    histogram = families["test_seconds"]
+    assert histogram.type == "histogram"
+    buckets = {sample.labels["le"]: sample.value for sample in histogram.samples if sample.name == "test_seconds_bucket"}
+    assert buckets == {"0.1": 0.0, "1": 1.0, "+Inf": 1.0}
+
+def test_histogram_value():
+    histogram = metrics.Histogram("test_seconds", "耗时", ["endpoint"], buckets=(0.1, 1))
+    assert histogram.value("/all") == (0, 0.0)
+    histogram.observe(0.5, "/all")
+    histogram.observe(2, "/all")
+    assert histogram.value("/all") == (2, 2.5)
+    assert histogram.value("/batch") == (0, 0.0)
+
+def test_global_registry_has_no_untyped_families():
+    metrics.CACHE_REQUESTS.inc("test", "hit")
+    families = _families(metrics.REGISTRY)
+    assert families
+    assert not [name for name, family in families.items() if family.type in ("untyped", "unknown")]
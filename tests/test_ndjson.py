@@ -0,0 +1,26 @@
+# 流式 NDJSON 的 /all
+import pytest
+
+from utils import metrics
+
+def _body(response) -> bytes:
+    """读完响应体（Flask 测试客户端在读取时才迭代生成器）"""
+    return response.get_data() if hasattr(response, "get_data") else response.content
+
+@pytest.mark.parametrize("path,accept", [("/all.ndjson", None), ("/all", "application/x-ndjson")])
+def test_duration_covers_stream(client, path, accept):
+    all_before = metrics.REQUEST_SECONDS.value("/all", "all")
+    count, total = metrics.REQUEST_SECONDS.value("/all.ndjson", "all")
+    response = client.get(path, headers={"Accept": accept} if accept else {})
+    assert response.status_code == 200
+    assert _body(response).splitlines()[-1] == b'{"summary":{}}'
+    after_count, after_total = metrics.REQUEST_SECONDS.value("/all.ndjson", "all")
+    assert after_count == count + 1
+    assert after_total - total >= 0.05
+    # 流式响应不计入 JSON 的 /all
+    assert metrics.REQUEST_SECONDS.value("/all", "all") == all_before
+
+def test_json_all_still_timed(client):
+    count, _ = metrics.REQUEST_SECONDS.value("/all", "all")
+    assert client.get("/all").status_code == 200
+    assert metrics.REQUEST_SECONDS.value("/all", "all")[0] == count + 1
@@ -0,0 +1,44 @@
+# 跨进程共享快照
+import json
+
+from models.models import HotSearchItem
+from services.snapshot import SharedSnapshot, fetch_platforms
+
+class StubService:
+    """返回固定条目或抛出异常的平台服务"""
+
+    def __init__(self, titles=(), error: Exception = None):
+        self.titles = titles
+        self.error = error
+
+    def fetch_hot_search(self):
+        if self.error is not None:
+            raise self.error
+        return [HotSearchItem(title=title, url=f"https://{title}") for title in self.titles]
+
+def _snapshot(tmp_path):
+    snapshot = SharedSnapshot(str(tmp_path), refresh_interval=60, max_age=180)
+    snapshot.write({"baidu": [{"title": "a", "url": "https://a", "hot_value": 1}]})
+    return snapshot
+
+def test_body_is_view_of_mapping(tmp_path):
+    body = _snapshot(tmp_path).body("baidu")
+    assert isinstance(body, memoryview)
+    assert body.readonly
+    assert json.loads(body.tobytes())["data"][0]["title"] == "a"
+
+def test_write_reuses_previous_bodies(tmp_path):
+    snapshot = _snapshot(tmp_path)
+    previous = snapshot.body("baidu").tobytes()
+    snapshot.write({"weibo": [{"title": "b", "url": "https://b"}]})
+    assert snapshot.body("baidu").tobytes() == previous
+    assert snapshot.version == 2
+    assert snapshot.get("weibo")[0]["title"] == "b"
+
+def test_fetch_platforms_skips_empty_and_failed():
+    services = {f"p{i}": StubService([f"t{i}"]) for i in range(20)}
+    services["empty"] = StubService()
+    services["failed"] = StubService(error=RuntimeError("boom"))
+    result = fetch_platforms(services)
+    assert sorted(result) == sorted(f"p{i}" for i in range(20))
+    assert result["p3"][0]["title"] == "t3"
@@ -0,0 +1,83 @@
+# 上游连接预热
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import asgi
+import main
+from services import warmup as warmup_module
+from services.warmup import Warmup
+from utils import outbound
+from utils.executor import PriorityExecutor
+
+@pytest.fixture
+def origin():
+    """本机 HTTP 服务的源站地址"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_create_app_does_not_start_warmup(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "start_warmup", lambda: calls.append(True))
+    main.create_app()
+    assert calls == []
+
+def test_asgi_lifespan_starts_warmup(monkeypatch):
+    testclient = pytest.importorskip("fastapi.testclient")
+    calls = []
+    monkeypatch.setattr(asgi, "start_warmup", lambda: calls.append(True))
+    with testclient.TestClient(asgi.app):
+        assert calls == [True]
+
+def test_warm_opens_pooled_connection_once(origin):
+    warmup = Warmup(interval=0, concurrency=1, connections=1)
+    first = warmup.warm(origin)
+    assert first["ok"], first
+    assert first["opened"] == 1
+    # 连接仍然可用时不再新建
+    assert warmup.warm(origin)["opened"] == 0
+
+def test_interactive_tasks_run_between_origins(monkeypatch):
+    pool = PriorityExecutor(1, "test")
+    monkeypatch.setattr(warmup_module, "get_executor", lambda: pool)
+    monkeypatch.setattr(warmup_module, "upstream_origins", lambda: ["https://a", "https://b", "https://c"])
+    warmup = Warmup(interval=0, concurrency=3, connections=1)
+    order = []
+
+    def warm(origin):
+        order.append(origin)
+        if origin == "https://a":
+            # 预热期间到达的前台任务排在剩余源站之前
+            pool.submit(order.append, "interactive", priority=outbound.PRIORITY_INTERACTIVE)
+        return {"ok": True}
+
+    monkeypatch.setattr(warmup, "warm", warm)
+    warmup.run()
+    assert order == ["https://a", "interactive", "https://b", "https://c"]
+
+def test_run_bounded_by_concurrency(monkeypatch):
+    pool = PriorityExecutor(8, "test")
+    monkeypatch.setattr(warmup_module, "get_executor", lambda: pool)
+    monkeypatch.setattr(warmup_module, "upstream_origins", lambda: [f"https://{i}" for i in range(6)])
+    warmup = Warmup(interval=0, concurrency=2, connections=1)
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def warm(origin):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return {"ok": True}
+
+    monkeypatch.setattr(warmup, "warm", warm)
+    warmup.run()
+    assert active == [0, 2]
+    assert warmup.runs == 1
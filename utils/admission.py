@@ -0,0 +1,103 @@
+# 入站准入控制
+# 接口请求在共享快照和缓存都没有现成数据、需要实时抓取上游时才申请准入：
+#   - 同时进行的实时抓取数有上限
+#   - 超出上限的请求在有界队列中按到达顺序等待，等待时间有上限
+# 队列已满或等待超时的请求立即被拒绝，由调用方改用最近一次的旧数据（标记为 stale）或快速返回 503，
+# 过载时请求要么很快开始抓取要么很快被拒绝，尾延迟不再随排队长度无限增长。
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from config.config import config
+from utils import metrics, tracing
+
+# 旧数据响应附带的响应头
+STALE_HEADERS = {"Warning": '110 - "Response is Stale"', "X-Data-Stale": "1"}
+
+class Overloaded(Exception):
+    """请求未获准入，reason 为 queue_full 或 timeout"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"服务繁忙（{reason}），请 {retry_after} 秒后重试")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """限制同时进行的实时抓取数，超出的请求有界排队"""
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: int = 1):
+        # max_concurrent 为 0 时不限制
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # 拒绝时建议客户端等待的秒数
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.queued = 0
+        self._cond = threading.Condition()
+
+    def _acquire(self):
+        with self._cond:
+            # 有人排队时新请求不插队
+            if self.in_flight < self.max_concurrent and not self.queued:
+                self.in_flight += 1
+                metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+                return
+            if self.queued >= self.max_queue:
+                raise Overloaded("queue_full", self.retry_after)
+            self.queued += 1
+            metrics.ADMISSION_QUEUED.set(self.queued)
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self.in_flight >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Overloaded("timeout", self.retry_after)
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+            finally:
+                self.queued -= 1
+                metrics.ADMISSION_QUEUED.set(self.queued)
+
+    def _release(self):
+        with self._cond:
+            self.in_flight -= 1
+            metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+            self._cond.notify()
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """在准入配额内执行代码块，未获准入时抛出 Overloaded"""
+        if self.max_concurrent <= 0:
+            yield
+            return
+        start = time.perf_counter()
+        self._acquire()
+        waited = time.perf_counter() - start
+        metrics.ADMISSION_QUEUE_SECONDS.observe(waited)
+        tracing.add_span("admission", waited)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def status(self) -> Dict[str, int]:
+        """当前准入状态"""
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue
+            }
+
+def create_admission_controller() -> AdmissionController:
+    """按配置创建准入控制器"""
+    return AdmissionController(
+        config.admission_max_concurrent,
+        config.admission_max_queue,
+        config.admission_queue_timeout,
+        config.admission_retry_after
+    )
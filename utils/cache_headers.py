@@ -0,0 +1,69 @@
+# CDN 缓存响应头
+# 各路由的 Cache-Control 等缓存相关响应头统一在这里生成，Flask 与 ASGI 入口共用：
+#   - 热搜数据：s-maxage 为数据的刷新间隔，Age 为数据产生至今的时长，边缘缓存按 s-maxage - Age
+#     计算剩余的新鲜时间，数据在源站刷新时同时在边缘过期；过期后按 stale-while-revalidate 先返回旧数据并后台回源
+#   - 浏览器缓存时间单独配置（默认 0，每次都向边缘缓存确认）
+#   - Surrogate-Key 标记响应包含的平台，可在 CDN 上按平台清除（/all 同时带各聚合平台的键）
+#   - 过载时返回的旧数据只在边缘缓存 Retry-After 秒；错误、空结果、/batch、健康检查、监控和管理接口不缓存
+# 配置为 CDN_CACHE=0 时不输出这些响应头，/apis 页面保留原有的浏览器缓存头。
+from typing import Dict, Iterable, Optional
+
+from config.config import config
+from utils.admission import STALE_HEADERS
+
+# 所有热搜数据响应共有的 Surrogate-Key，用于一次清除全部数据
+SURROGATE_KEY_DATA = "hot-search"
+
+# 响应体按 Accept-Encoding 压缩，边缘缓存需要按其区分；/all 还按 Accept 返回 JSON 或流式 NDJSON
+VARY = "Accept-Encoding"
+VARY_NEGOTIATED = "Accept, Accept-Encoding"
+
+def _cache_control(*directives: str) -> str:
+    return ", ".join(directive for directive in directives if directive)
+
+def _stale_directives() -> tuple:
+    return (
+        f"stale-while-revalidate={config.cdn_stale_while_revalidate}" if config.cdn_stale_while_revalidate > 0 else "",
+        f"stale-if-error={config.cdn_stale_if_error}" if config.cdn_stale_if_error > 0 else ""
+    )
+
+def data_headers(keys: Iterable[str], refresh_interval: float, age: Optional[float],
+                 negotiated: bool = False) -> Dict[str, str]:
+    """热搜数据响应的缓存头，age 为数据产生至今的秒数，未知时不输出 Age；negotiated 表示按 Accept 区分响应格式"""
+    if not config.cdn_cache:
+        return {}
+    s_maxage = max(int(refresh_interval), 0)
+    headers = {
+        "Cache-Control": _cache_control("public", f"max-age={min(config.cdn_max_age, s_maxage)}",
+                                        f"s-maxage={s_maxage}", *_stale_directives()),
+        "Vary": VARY_NEGOTIATED if negotiated else VARY,
+        "Surrogate-Key": " ".join([SURROGATE_KEY_DATA, *keys])
+    }
+    if age is not None:
+        headers["Age"] = str(max(int(age), 0))
+    return headers
+
+def shed_headers(keys: Iterable[str], retry_after: int, negotiated: bool = False) -> Dict[str, str]:
+    """过载时返回旧数据的响应头：标记为 stale，边缘缓存只保留 retry_after 秒"""
+    if not config.cdn_cache:
+        return dict(STALE_HEADERS)
+    return {
+        **STALE_HEADERS,
+        "Cache-Control": _cache_control("public", "max-age=0", f"s-maxage={retry_after}", *_stale_directives()[1:]),
+        "Vary": VARY_NEGOTIATED if negotiated else VARY,
+        "Surrogate-Key": " ".join([SURROGATE_KEY_DATA, *keys])
+    }
+
+def static_headers(max_age: int, key: str) -> Dict[str, str]:
+    """随部署变化的页面（首页、接口列表）的缓存头，浏览器和边缘缓存都保留 max_age 秒"""
+    if not config.cdn_cache:
+        return {"Cache-Control": f"public, max-age={max_age}"}
+    return {
+        "Cache-Control": f"public, max-age={max_age}, s-maxage={max_age}",
+        "Vary": VARY,
+        "Surrogate-Key": key
+    }
+
+def no_store_headers() -> Dict[str, str]:
+    """不允许缓存的响应（错误、空结果、/batch、健康检查、监控和管理接口）"""
+    return {"Cache-Control": "no-store"} if config.cdn_cache else {}
@@ -0,0 +1,107 @@
+# DNS 缓存
+# 上游主机的解析结果按 TTL 缓存，建立连接时直接使用缓存的地址，不再每次新建连接都同步解析。
+# 过期后由预热任务在后台重新解析；解析失败时继续使用上一次的结果。
+# 通过替换 urllib3 建立连接的函数接入，TLS 的 SNI 和证书校验仍使用原主机名。
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import urllib3.util.connection as urllib3_connection
+
+from utils import metrics
+
+# getaddrinfo 的单条结果：(family, type, proto, canonname, sockaddr)
+AddrInfo = Tuple[int, int, int, str, tuple]
+
+class DNSCache:
+    """按 (主机, 端口) 缓存的解析结果"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # (主机, 端口) -> (解析时间, 地址列表)
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[AddrInfo]]] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, host: str, port: int) -> List[AddrInfo]:
+        family = urllib3_connection.allowed_gai_family()
+        return socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+
+    def resolve(self, host: str, port: int, refresh: bool = False) -> List[AddrInfo]:
+        """解析主机，缓存未过期时直接返回；refresh 为 True 时总是重新解析，失败时保留旧结果"""
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and not refresh and time.monotonic() - entry[0] < self.ttl:
+            metrics.DNS_LOOKUPS.inc("hit")
+            return entry[1]
+        try:
+            addresses = self._lookup(host, port)
+        except socket.gaierror:
+            if entry is None:
+                metrics.DNS_LOOKUPS.inc("error")
+                raise
+            # 解析失败时继续使用旧地址
+            metrics.DNS_LOOKUPS.inc("stale")
+            return entry[1]
+        metrics.DNS_LOOKUPS.inc("miss")
+        with self._lock:
+            self._entries[key] = (time.monotonic(), addresses)
+        return addresses
+
+    def expires_in(self, host: str, port: int) -> Optional[float]:
+        """缓存剩余有效秒数，未缓存时返回 None"""
+        entry = self._entries.get((host, port))
+        return None if entry is None else self.ttl - (time.monotonic() - entry[0])
+
+    def status(self) -> Dict[str, Dict[str, object]]:
+        """各主机的缓存地址和剩余有效期"""
+        now = time.monotonic()
+        with self._lock:
+            entries = dict(self._entries)
+        return {
+            f"{host}:{port}": {
+                "addresses": sorted({info[4][0] for info in addresses}),
+                "expires_in": round(self.ttl - (now - resolved_at), 1)
+            }
+            for (host, port), (resolved_at, addresses) in entries.items()
+        }
+
+_cache: Optional[DNSCache] = None
+_original_create_connection = urllib3_connection.create_connection
+
+def _is_ip(host: str) -> bool:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except OSError:
+            pass
+    return False
+
+def _create_connection(address, *args, **kwargs) -> socket.socket:
+    """按缓存的地址依次尝试建立连接"""
+    host, port = address
+    host = host.strip("[]")
+    if _cache is None or _is_ip(host) or host == "localhost":
+        return _original_create_connection(address, *args, **kwargs)
+    error: Optional[OSError] = None
+    for info in _cache.resolve(host, port):
+        try:
+            return _original_create_connection(info[4][:2], *args, **kwargs)
+        except OSError as e:
+            error = e
+    raise error or OSError(f"无法连接 {host}:{port}")
+
+def install(ttl: float) -> Optional[DNSCache]:
+    """启用 DNS 缓存（进程内只启用一次），ttl 为 0 时不启用"""
+    global _cache
+    if ttl <= 0:
+        return None
+    if _cache is None:
+        _cache = DNSCache(ttl)
+        urllib3_connection.create_connection = _create_connection
+    return _cache
+
+def get_dns_cache() -> Optional[DNSCache]:
+    """当前启用的 DNS 缓存"""
+    return _cache
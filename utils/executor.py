@@ -0,0 +1,113 @@
+# 抓取线程池
+# 进程内所有并发抓取（/all 聚合、共享快照刷新、缓存后台刷新）共用一个常驻的有界线程池：
+#   - 线程按需创建，之后常驻复用，不再每个请求创建和销毁线程池
+#   - 任务按优先级分道排队（与 utils/outbound.py 的优先级相同），前台请求先于后台刷新执行，
+#     任务在执行时沿用该优先级申请上游配额
+#   - 任务在提交时的上下文中执行，请求 trace 自动传入，排队耗时记为 pool span
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from config.config import config
+from utils import metrics, outbound, tracing
+
+_LANES = {outbound.PRIORITY_INTERACTIVE: "interactive", outbound.PRIORITY_BACKGROUND: "background"}
+
+def _lane(priority: int) -> str:
+    return _LANES.get(priority) or str(priority)
+
+class PriorityExecutor:
+    """按优先级分道排队的常驻线程池"""
+
+    def __init__(self, max_workers: int, name: str = "fetch"):
+        self.max_workers = max(max_workers, 1)
+        self.name = name
+        # 排队中的任务：(优先级, 序号, 提交时间, future, 上下文, 函数, 位置参数, 关键字参数)
+        self._queue: list = []
+        self._cond = threading.Condition()
+        self._threads = 0
+        # 空闲等待任务、且尚未被分配任务的线程数
+        self._idle = 0
+        self._sequence = itertools.count()
+
+    def submit(self, fn: Callable[..., Any], *args, priority: Optional[int] = None, **kwargs) -> Future:
+        """提交任务，priority 默认沿用当前上下文的上游请求优先级"""
+        if priority is None:
+            priority = outbound.current_priority()
+        future: Future = Future()
+        item = (priority, next(self._sequence), time.perf_counter(), future,
+                contextvars.copy_context(), fn, args, kwargs)
+        with self._cond:
+            heapq.heappush(self._queue, item)
+            metrics.EXECUTOR_QUEUED.inc(self.name, _lane(priority))
+            if self._idle:
+                self._idle -= 1
+                self._cond.notify()
+            elif self._threads < self.max_workers:
+                self._threads += 1
+                threading.Thread(target=self._worker, name=f"{self.name}-{self._threads}", daemon=True).start()
+        return future
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._idle += 1
+                    # 提交任务时会先把 _idle 减一再唤醒
+                    self._cond.wait()
+                priority, _, submitted, future, context, fn, args, kwargs = heapq.heappop(self._queue)
+            lane = _lane(priority)
+            waited = time.perf_counter() - submitted
+            metrics.EXECUTOR_QUEUED.dec(self.name, lane)
+            metrics.EXECUTOR_QUEUE_SECONDS.observe(waited, self.name, lane)
+            if not future.set_running_or_notify_cancel():
+                continue
+            metrics.EXECUTOR_ACTIVE.inc(self.name)
+            try:
+                context.run(self._run, future, priority, waited, fn, args, kwargs)
+            finally:
+                metrics.EXECUTOR_ACTIVE.dec(self.name)
+
+    @staticmethod
+    def _run(future: Future, priority: int, waited: float, fn: Callable[..., Any], args, kwargs):
+        tracing.add_span("pool", waited)
+        try:
+            with outbound.priority(priority):
+                result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def status(self) -> Dict[str, Any]:
+        """各优先级排队的任务数和线程数"""
+        with self._cond:
+            queued = {}
+            for item in self._queue:
+                lane = _lane(item[0])
+                queued[lane] = queued.get(lane, 0) + 1
+            return {"threads": self._threads, "idle": self._idle, "max_workers": self.max_workers, "queued": queued}
+
+_executors: Dict[str, PriorityExecutor] = {}
+_executors_pid = None
+_executors_lock = threading.Lock()
+
+def get_executor(name: str = "fetch") -> PriorityExecutor:
+    """获取进程共享的线程池，默认为抓取线程池；fork 出的子进程不继承线程，重新创建"""
+    global _executors_pid
+    pid = os.getpid()
+    executor = _executors.get(name)
+    if executor is None or _executors_pid != pid:
+        with _executors_lock:
+            if _executors_pid != pid:
+                _executors.clear()
+                _executors_pid = pid
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = PriorityExecutor(config.fetch_workers, name)
+    return executor
@@ -0,0 +1,73 @@
+# 对冲请求
+# 同一份数据有多个来源（主接口和备用接口）时，先只请求主接口；主接口超过其近期耗时的分位数仍未返回、
+# 失败或结果无效时再启动下一个来源，采用最先得到的有效结果。
+# 只有慢于分位数的那部分请求会多发一次，平均负载基本不变，尾延迟被限制在分位数加一次备用请求的耗时。
+import concurrent.futures
+import threading
+from collections import deque
+from typing import Callable, Optional, Sequence, TypeVar
+
+from utils import metrics
+from utils.executor import get_executor
+
+T = TypeVar("T")
+
+# 估计分位数所需的最少样本数，样本不足时使用默认延迟
+MIN_SAMPLES = 20
+
+class LatencyTracker:
+    """最近若干次耗时的滑动窗口，用于估计分位数"""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """近期耗时的分位数（0-100），样本不足时返回 None"""
+        with self._lock:
+            if len(self._samples) < MIN_SAMPLES:
+                return None
+            samples = sorted(self._samples)
+        index = min(int(len(samples) * percent / 100), len(samples) - 1)
+        return samples[index]
+
+def hedged(attempts: Sequence[Callable[[], T]], delay: float, accept: Callable[[T], bool] = bool,
+           label: str = "") -> T:
+    """依次启动各来源：已启动的来源在 delay 秒内都没有返回，或返回的结果失败、无效时启动下一个，
+    返回最先得到的有效结果；全部无效时返回最后一个结果，全部失败时抛出最后一个异常。
+    各来源在独立的 hedge 线程池中执行，调用方自身可以位于抓取线程池中。"""
+    executor = get_executor("hedge")
+    primary = executor.submit(attempts[0])
+    pending = {primary}
+    started = 1
+    result_seen = False
+    last_result = None
+    last_error: Optional[BaseException] = None
+    while pending:
+        more = started < len(attempts)
+        done, pending = concurrent.futures.wait(
+            pending, timeout=delay if more else None, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            if accept(result):
+                if future is not primary:
+                    metrics.HEDGE_REQUESTS.inc(label, "won")
+                return result
+            result_seen = True
+            last_result = result
+        if more:
+            # 超过延迟仍未返回，或已返回的结果都无效：启动下一个来源
+            pending.add(executor.submit(attempts[started]))
+            started += 1
+            metrics.HEDGE_REQUESTS.inc(label, "started")
+    if result_seen or last_error is None:
+        return last_result
+    raise last_error
@@ -0,0 +1,65 @@
+# HTTP 客户端
+# 所有平台服务共享一个带连接池的 Session
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import config
+from utils import dns_cache
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session(pool_maxsize: int = 32, http2: Optional[bool] = None,
+                   prior_knowledge: Optional[bool] = None) -> requests.Session:
+    """创建带连接池的 Session，同时启用上游 DNS 缓存；http2 / prior_knowledge 默认按配置"""
+    dns_cache.install(config.dns_cache_ttl)
+    session = requests.Session()
+    # 各服务自行携带 Cookie，不在共享 Session 中保存上游下发的 Cookie
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=64, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if config.upstream_http2 if http2 is None else http2:
+        from utils.http2 import create_http2_adapter
+        
+        if prior_knowledge is None:
+            prior_knowledge = config.upstream_http2_prior_knowledge
+        http2_adapter = create_http2_adapter(adapter, prior_knowledge, max_connections=pool_maxsize)
+        if http2_adapter is not None:
+            session.mount("https://", http2_adapter)
+            if prior_knowledge:
+                session.mount("http://", http2_adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """获取共享 Session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def set_session(session: requests.Session):
+    """替换共享 Session，用于基准测试和离线回放"""
+    global _session
+    with _session_lock:
+        _session = session
+
+def rewrite_upstream_url(url: str, base_url: str) -> str:
+    """将上游 URL 改写到覆盖地址：https://host/path?q -> {base}/https/host/path?q"""
+    parts = urlsplit(url)
+    rewritten = f"{base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+    if parts.query:
+        rewritten += f"?{parts.query}"
+    return rewritten
+
+def restore_upstream_url(path: str) -> str:
+    """rewrite_upstream_url 的逆操作，path 为覆盖地址上的请求路径"""
+    scheme, _, rest = path.lstrip("/").partition("/")
+    return f"{scheme}://{rest}"
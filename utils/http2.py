@@ -0,0 +1,182 @@
+# HTTP/2 上游传输
+# 可选依赖 httpx[http2]。挂载到共享 Session 后，平台服务仍按原样调用 session.get / session.post：
+#   - 每个源站只建立一个 HTTP/2 连接，并发请求在该连接上多路复用，不再每个并发请求各占一个连接
+#   - https 源站经 ALPN 协商，协商结果为 HTTP/1.1 时 httpx 自动使用 HTTP/1.1
+#   - prior_knowledge 时 http 源站直接发送 h2c 连接前言（用于本地回放服务）
+#   - 源站不支持 HTTP/2（协议错误）且从未成功使用过 HTTP/2 时，该源站此后改走 HTTP/1.1 连接池
+# httpx 的同步客户端在多线程并发使用同一个 HTTP/2 连接时，流 id 的分配和请求头的发送不是原子的，
+# 会以乱序的流 id 发出请求头（服务端按协议错误断开连接）。因此请求统一提交到一个专用事件循环线程中的
+# AsyncClient，调用线程等待结果，所有流都在同一个线程中按顺序建立。
+# 连接由 httpcore 管理，不经过 urllib3：DNS 缓存和连接预热只对 HTTP/1.1 连接池生效。
+import asyncio
+import logging
+import os
+import ssl
+import threading
+from typing import Dict, Optional, Set, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils import metrics
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 禁止的连接级请求头
+_HOP_BY_HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+def http2_available() -> bool:
+    """是否安装了 httpx 和 h2"""
+    if httpx is None:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _timeout(timeout) -> "httpx.Timeout":
+    """requests 的超时参数（秒数或 (连接, 读取) 元组）转换为 httpx.Timeout"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+class HTTP2Adapter(BaseAdapter):
+    """经 httpx 发送请求的 requests 适配器，不支持 HTTP/2 的源站回退到 fallback"""
+
+    def __init__(self, fallback: HTTPAdapter, prior_knowledge: bool = False, max_connections: int = 64):
+        super().__init__()
+        self.fallback = fallback
+        self.prior_knowledge = prior_knowledge
+        self.max_connections = max_connections
+        # httpx 的证书校验设置按客户端生效，每种设置（通常只有一种）一个客户端，只在事件循环线程中访问
+        self._clients: Dict[Union[bool, str], "httpx.AsyncClient"] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_pid = None
+        # 已改走 HTTP/1.1 连接池的源站和成功使用过 HTTP/2 的源站
+        self._http1_origins: Set[str] = set()
+        self._http2_origins: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None, verify=True,
+             cert=None, proxies=None) -> requests.Response:
+        origin = _origin(request.url)
+        # 代理和客户端证书在 httpx 中按客户端而不是按请求配置，这类请求交给 HTTP/1.1 连接池
+        if origin in self._http1_origins or cert or any(proxies.values() if proxies else ()):
+            return self.fallback.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        try:
+            response = self._send(request, timeout, verify)
+        except (httpx.RemoteProtocolError, httpx.LocalProtocolError) as e:
+            if origin in self._http2_origins:
+                raise requests.ConnectionError(e, request=request)
+            with self._lock:
+                self._http1_origins.add(origin)
+            logger.warning(f"{origin} 不支持 HTTP/2，改用 HTTP/1.1: {str(e)}")
+            return self.fallback.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request)
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(e, request=request)
+        if response.http_version == "HTTP/2" and origin not in self._http2_origins:
+            with self._lock:
+                self._http2_origins.add(origin)
+        metrics.UPSTREAM_HTTP_VERSION.inc(urlsplit(origin).hostname, response.http_version)
+        return self._build_response(request, response)
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """事件循环线程，fork 出的子进程不继承线程，重新创建"""
+        pid = os.getpid()
+        if self._loop_pid != pid:
+            with self._lock:
+                if self._loop_pid != pid:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="http2-client", daemon=True).start()
+                    self._clients = {}
+                    self._loop = loop
+                    self._loop_pid = pid
+        return self._loop
+
+    def _client(self, verify: Union[bool, str]) -> "httpx.AsyncClient":
+        client = self._clients.get(verify)
+        if client is None:
+            if isinstance(verify, str):
+                # requests 的 verify 可以是 CA 证书文件或目录（如 REQUESTS_CA_BUNDLE）
+                is_dir = os.path.isdir(verify)
+                verify_arg = ssl.create_default_context(cafile=None if is_dir else verify, capath=verify if is_dir else None)
+            else:
+                verify_arg = verify
+            # 每个源站一个多路复用连接，max_connections 只限制回退为 HTTP/1.1 的源站
+            client = self._clients[verify] = httpx.AsyncClient(
+                http1=not self.prior_knowledge,
+                http2=True,
+                verify=verify_arg,
+                trust_env=False,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return client
+
+    async def _request(self, method: str, url: str, headers, body, timeout, verify) -> "httpx.Response":
+        return await self._client(verify).request(method, url, headers=headers, content=body, timeout=timeout)
+
+    def _send(self, request: requests.PreparedRequest, timeout, verify: Union[bool, str]) -> "httpx.Response":
+        headers = [(name, value) for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP]
+        future = asyncio.run_coroutine_threadsafe(
+            self._request(request.method, request.url, headers, request.body, _timeout(timeout), verify),
+            self._event_loop())
+        return future.result()
+
+    def _build_response(self, request: requests.PreparedRequest, response: "httpx.Response") -> requests.Response:
+        """httpx 响应转换为 requests 响应，响应体已完整读取并解压"""
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers.items())
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.reason = response.reason_phrase
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        result.elapsed = response.elapsed
+        result._content = response.content
+        result._content_consumed = True
+        return result
+
+    async def _close_clients(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def close(self):
+        with self._lock:
+            loop = self._loop if self._loop_pid == os.getpid() else None
+            self._loop = self._loop_pid = None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+        self.fallback.close()
+
+def create_http2_adapter(fallback: HTTPAdapter, prior_knowledge: bool = False,
+                         max_connections: int = 64) -> Optional[HTTP2Adapter]:
+    """创建 HTTP/2 适配器，未安装 httpx[http2] 时返回 None"""
+    if not http2_available():
+        logger.warning("未安装 httpx[http2]，上游请求使用 HTTP/1.1")
+        return None
+    # httpx 默认按 INFO 记录每个请求，与 HTTP/1.1 连接池一样只保留警告
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return HTTP2Adapter(fallback, prior_knowledge, max_connections)
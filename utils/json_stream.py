@@ -0,0 +1,129 @@
+# 增量 JSON 抽取
+# 沿路径直接走到目标数组，逐个解码数组元素，取够条数后立即停止。
+# 路径以外的值由标准库的 C 解码器扫过后立即丢弃，数组中取够之后的元素完全不再解码。
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Optional, Sequence
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SPACES = " \t\n\r"
+# 剩余内容超过所需元素估算长度的该倍数时才逐个解码
+_STREAM_RATIO = 2
+
+def _scan(text: str, pos: int):
+    try:
+        return _decoder.scan_once(text, pos)
+    except StopIteration as e:
+        raise json.JSONDecodeError("Expecting value", text, e.value) from None
+
+def _skip_ws(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+def _expect(text: str, pos: int, chars: str) -> str:
+    if pos >= len(text) or text[pos] not in chars:
+        raise ValueError(f"JSON 格式错误：位置 {pos} 处应为 {chars!r}")
+    return text[pos]
+
+def skip_value(text: str, pos: int) -> int:
+    """跳过 pos 处的一个 JSON 值，返回其后的位置"""
+    char = _expect(text, pos, '"[{-0123456789tfn')
+    if char == '"':
+        return scanstring(text, pos + 1)[1]
+    # 容器交给 C 解码器整体扫过，比逐个字符串、括号地扫描快得多
+    return _scan(text, pos)[1]
+
+def _find_key(text: str, pos: int, key: str) -> Optional[int]:
+    """在 pos 处的对象中查找键，返回对应值的位置"""
+    pos = _skip_ws(text, pos + 1)
+    if _expect(text, pos, '"}') == "}":
+        return None
+    while True:
+        _expect(text, pos, '"')
+        name, pos = scanstring(text, pos + 1)
+        pos = _skip_ws(text, pos)
+        _expect(text, pos, ":")
+        pos = _skip_ws(text, pos + 1)
+        if name == key:
+            return pos
+        pos = _skip_ws(text, skip_value(text, pos))
+        if _expect(text, pos, ",}") == "}":
+            return None
+        pos = _skip_ws(text, pos + 1)
+
+def _find_index(text: str, pos: int, index: int) -> Optional[int]:
+    """在 pos 处的数组中查找下标，返回对应元素的位置"""
+    pos = _skip_ws(text, pos + 1)
+    if _expect(text, pos, "]-0123456789\"[{tfn") == "]":
+        return None
+    for _ in range(index):
+        pos = _skip_ws(text, skip_value(text, pos))
+        if _expect(text, pos, ",]") == "]":
+            return None
+        pos = _skip_ws(text, pos + 1)
+    return pos
+
+def locate(text: str, path: Sequence[str]) -> Optional[int]:
+    """返回路径指向的值在文本中的位置，路径不存在时返回 None"""
+    pos = _skip_ws(text, 0)
+    for segment in path:
+        if pos >= len(text):
+            return None
+        if text[pos] == "{":
+            pos = _find_key(text, pos, segment)
+        elif text[pos] == "[" and segment.isdigit():
+            pos = _find_index(text, pos, int(segment))
+        else:
+            return None
+        if pos is None:
+            return None
+    return pos
+
+def _locate_array(text: str, path: Sequence[str]) -> Optional[int]:
+    pos = locate(text, path)
+    if pos is None or pos >= len(text) or text[pos] != "[":
+        return None
+    return pos
+
+def take_array(text: str, path: Sequence[str], limit: int = 0,
+               accept: Optional[Callable[[Any], bool]] = None) -> Optional[list]:
+    """取路径指向的数组中前 limit 个满足 accept 的元素（limit 为 0 时不限），
+    取够后不再解码剩余内容；路径不存在或不是数组时返回 None"""
+    pos = _locate_array(text, path)
+    if pos is None:
+        return None
+    if limit:
+        start = _skip_ws(text, pos + 1)
+        if start < len(text) and text[start] == "]":
+            return []
+        # 先解码第一个元素估算元素长度：剩余内容不比所需多太多时整体解码，
+        # C 扫描器整体解码时键名可以复用，比逐个元素解码快
+        first, end = _scan(text, start)
+        if len(text) - pos > (end - start) * limit * _STREAM_RATIO:
+            return _take_elements(text, end, first, limit, accept)
+
+    elements = _scan(text, pos)[0]
+    if accept is not None:
+        elements = [element for element in elements if accept(element)]
+    return elements[:limit] if limit else elements
+
+def _take_elements(text: str, pos: int, first: Any, limit: int,
+                   accept: Optional[Callable[[Any], bool]]) -> list:
+    """逐个解码数组元素直到取够 limit 个，pos 为第一个元素之后的位置"""
+    elements = [first] if accept is None or accept(first) else []
+    # 直接调用 C 扫描器，省去 raw_decode 的逐元素开销
+    scan = _decoder.scan_once
+    while len(elements) < limit:
+        if pos < len(text) and text[pos] in _SPACES:
+            pos = _skip_ws(text, pos)
+        if _expect(text, pos, ",]") == "]":
+            break
+        pos = _skip_ws(text, pos + 1)
+        try:
+            value, pos = scan(text, pos)
+        except StopIteration as e:
+            raise json.JSONDecodeError("Expecting value", text, e.value) from None
+        if accept is None or accept(value):
+            elements.append(value)
+    return elements
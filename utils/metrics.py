@@ -0,0 +1,278 @@
+# 指标模块
+# 以 Prometheus 文本格式导出计数器、仪表和直方图，记录路径只做 O(1) 的字典更新
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, List, Sequence, Tuple
+
+# 默认耗时分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """格式化标签"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_number(value: float) -> str:
+    """格式化数值"""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """指标基类"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        # 每个指标一把锁，临界区只有一次字典更新
+        self._lock = threading.Lock()
+
+    @property
+    def family(self) -> str:
+        """HELP/TYPE 行中的指标名，须与样本名一致"""
+        return self.name
+
+    def collect(self) -> List[str]:
+        """生成 Prometheus 文本行"""
+        lines = [f"# HELP {self.family} {self.documentation}", f"# TYPE {self.family} {self.type}"]
+        with self._lock:
+            items = [(labels, self._snapshot(value)) for labels, value in self._values.items()]
+        for labels, value in sorted(items):
+            lines.extend(self._render(labels, value))
+        return lines
+
+    def _snapshot(self, value):
+        return value
+
+    def _render(self, labels: Tuple[str, ...], value) -> List[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    """计数器"""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """计数加一"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        """读取当前计数"""
+        return self._values.get(labels, 0)
+
+    @property
+    def family(self) -> str:
+        # 计数器的样本名带 _total 后缀，HELP/TYPE 行使用同一个名字，否则 Prometheus 按 untyped 处理
+        return f"{self.name}_total"
+
+    def _render(self, labels, value):
+        return [f"{self.family}{_format_labels(self.labelnames, labels)} {_format_number(value)}"]
+
+class Gauge(Metric):
+    """仪表，记录当前值"""
+
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        """设置当前值"""
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """当前值加 amount"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """当前值减 amount"""
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: str) -> float:
+        """读取当前值"""
+        return self._values.get(labels, 0)
+
+    def _render(self, labels, value):
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"]
+
+class Histogram(Metric):
+    """直方图"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """记录一次观测值"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [各分桶计数（非累积，最后一个为 +Inf）, 总和, 次数]
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str):
+        """记录代码块耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def value(self, *labels: str) -> Tuple[int, float]:
+        """读取观测次数和总和"""
+        with self._lock:
+            state = self._values.get(labels)
+            return (state[2], state[1]) if state is not None else (0, 0.0)
+
+    def _snapshot(self, value):
+        return list(value[0]), value[1], value[2]
+
+    def _render(self, labels, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = f'le="{_format_number(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+        label_str = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{label_str} {_format_number(total)}")
+        lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """注册指标"""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """导出全部指标"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+# Prometheus 文本格式的 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """创建并注册计数器"""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """创建并注册仪表"""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """创建并注册直方图"""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+def render() -> str:
+    """导出全部指标"""
+    return REGISTRY.render()
+
+# 上游抓取指标
+UPSTREAM_CONNECT_SECONDS = histogram(
+    "hot_search_upstream_connect_seconds", "上游请求建连到收到响应头的耗时", ["platform"])
+UPSTREAM_TRANSFER_SECONDS = histogram(
+    "hot_search_upstream_transfer_seconds", "上游响应体传输耗时", ["platform"])
+UPSTREAM_RESPONSE_BYTES = histogram(
+    "hot_search_upstream_response_bytes", "上游响应体大小", ["platform"],
+    buckets=(1024, 4096, 16384, 65536, 262144, 1048576, 4194304))
+
+# 上游调度指标，按主机族统计
+UPSTREAM_IN_FLIGHT = gauge("hot_search_upstream_in_flight", "正在进行的上游请求数", ["host"])
+UPSTREAM_QUEUED = gauge("hot_search_upstream_queued", "排队等待上游配额的请求数", ["host"])
+UPSTREAM_QUEUE_SECONDS = histogram(
+    "hot_search_upstream_queue_seconds", "上游请求排队等待配额的耗时", ["host"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+UPSTREAM_THROTTLED = counter("hot_search_upstream_throttled", "上游返回限流响应（429/503）的次数", ["host"])
+UPSTREAM_RATE = gauge("hot_search_upstream_rate", "当前生效的上游请求速率（次/秒）", ["host"])
+UPSTREAM_HTTP_VERSION = counter(
+    "hot_search_upstream_http_version", "经 HTTP/2 传输发出的上游请求数，version 为实际使用的协议（HTTP/2 或回退的 HTTP/1.1）",
+    ["host", "version"])
+
+# DNS 缓存与连接预热指标
+DNS_LOOKUPS = counter("hot_search_dns_lookups", "上游主机解析次数，result 为 hit / miss / stale（解析失败沿用旧结果）/ error", ["result"])
+WARMUP_SECONDS = histogram("hot_search_warmup_seconds", "单个上游主机的预热耗时（解析与建连）", ["host"])
+WARMUP_HOSTS = gauge("hot_search_warmup_hosts", "最近一轮预热成功和失败的上游源站数", ["result"])
+
+# 线程池指标，按线程池和优先级分道统计
+EXECUTOR_QUEUED = gauge("hot_search_executor_queued", "线程池中排队的任务数", ["pool", "lane"])
+EXECUTOR_ACTIVE = gauge("hot_search_executor_active", "线程池中正在执行的任务数", ["pool"])
+EXECUTOR_QUEUE_SECONDS = histogram(
+    "hot_search_executor_queue_seconds", "任务在线程池中的排队耗时", ["pool", "lane"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+# 对冲请求指标
+HEDGE_REQUESTS = counter("hot_search_hedge_requests", "对冲请求次数，result 为 started（启动了备用请求）或 won（采用了备用请求的结果）",
+                         ["platform", "result"])
+
+# 入站准入指标
+ADMISSION_IN_FLIGHT = gauge("hot_search_admission_in_flight", "正在进行的实时抓取请求数")
+ADMISSION_QUEUED = gauge("hot_search_admission_queued", "排队等待准入的请求数")
+ADMISSION_QUEUE_SECONDS = histogram(
+    "hot_search_admission_queue_seconds", "请求排队等待准入的耗时",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+ADMISSION_SHED = counter("hot_search_admission_shed", "未获准入的请求数，result 为 stale（返回旧数据）或 unavailable（返回 503）",
+                         ["platform", "result"])
+
+# 解析指标
+DOCUMENT_REQUESTS = counter(
+    "hot_search_document_requests",
+    "按键拆分缓存的数据文件的使用次数，result 为 hit（直接使用）/ loaded（下载并解析）/ not_modified（304）/ "
+    "unchanged（重新下载但内容未变）/ stale（重新验证失败沿用旧数据）", ["platform", "result"])
+PARSE_SECONDS = histogram("hot_search_parse_seconds", "热搜解析耗时", ["platform"])
+ITEMS = histogram("hot_search_items", "单次返回的热搜条数", ["platform"],
+                  buckets=(0, 1, 5, 10, 20, 30, 50, 100))
+EMPTY_RESULTS = counter("hot_search_empty_results", "返回空结果的次数", ["platform"])
+ERRORS = counter("hot_search_errors", "按异常类型统计的错误次数", ["platform", "type"])
+
+# 缓存指标
+CACHE_REQUESTS = counter("hot_search_cache_requests", "缓存命中与未命中次数", ["platform", "result"])
+
+# 接口指标
+REQUEST_SECONDS = histogram("hot_search_request_seconds", "接口请求耗时", ["endpoint", "platform"])
+SERIALIZE_SECONDS = histogram("hot_search_serialize_seconds", "接口响应序列化耗时", ["endpoint", "platform"])
+
+def track_request(endpoint: str, platform: str):
+    """记录接口请求耗时的装饰器"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with REQUEST_SECONDS.time(endpoint, platform):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,280 @@
+# 上游请求调度
+# 所有平台服务的上游请求都经过同一个调度器，按主机族（如 top.baidu.com 与 baike.baidu.com 同属 baidu.com）：
+#   - 限制同时进行的请求数
+#   - 用令牌桶限制请求速率
+#   - 超出配额的请求按优先级排队，前台请求优先于后台刷新
+# 上游返回 429/503 时该主机族的速率减半并遵守 Retry-After，之后每次成功逐步恢复到配置值，
+# 使总吞吐保持在不触发限流的最高水平。
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from config.config import config
+from utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+# 优先级，数值越小越先获得配额
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("outbound_priority", default=PRIORITY_INTERACTIVE)
+
+# 限流后速率最低降到配置值的该比例，每次成功恢复配置值的该比例
+_MIN_RATE_RATIO = 0.1
+_RECOVER_RATIO = 0.05
+# 同一批并发请求收到的多个限流响应只减速一次；限流后等待一段时间再开始恢复
+_DECREASE_INTERVAL = 1.0
+_RECOVER_AFTER = 5.0
+# Retry-After 最多遵守的秒数
+_MAX_RETRY_AFTER = 60.0
+
+_SECOND_LEVEL = {"com", "net", "org", "gov", "edu", "co", "ac"}
+
+class UpstreamQueueTimeout(Exception):
+    """排队等待上游配额超时"""
+
+class HostLimit:
+    """单个主机族的配额：最大并发数、每秒请求数（0 表示不限速）、令牌桶容量"""
+
+    def __init__(self, max_in_flight: int, rate: float, burst: float):
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+
+    @classmethod
+    def parse(cls, value: str) -> "HostLimit":
+        """解析 "并发数/速率/桶容量" 格式，如 "2/5/10" """
+        max_in_flight, rate, burst = value.split("/")
+        return cls(int(max_in_flight), float(rate), float(burst))
+
+def host_family(host: str) -> str:
+    """主机族：可注册域名，如 top.baidu.com -> baidu.com，www.people.com.cn -> people.com.cn"""
+    host = (host or "").lower().rstrip(".")
+    labels = host.split(".")
+    if len(labels) <= 2 or ":" in host or labels[-1].isdigit():
+        return host
+    if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+@contextmanager
+def priority(value: int) -> Iterator[None]:
+    """在代码块内以指定优先级发出上游请求，提交到抓取线程池（utils/executor）的任务默认沿用该优先级"""
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> int:
+    """当前上下文的上游请求优先级"""
+    return _priority.get()
+
+def _retry_after(value: Optional[str]) -> float:
+    """解析 Retry-After：秒数或 HTTP 日期"""
+    if not value:
+        return 0.0
+    try:
+        return min(max(float(value), 0.0), _MAX_RETRY_AFTER)
+    except ValueError:
+        pass
+    try:
+        return min(max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0), _MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return 0.0
+
+class _HostState:
+    """单个主机族的调度状态，所有字段在 cond 的锁内读写"""
+
+    def __init__(self, family: str, limit: HostLimit):
+        self.family = family
+        self.limit = limit
+        self.cond = threading.Condition()
+        self.in_flight = 0
+        # 当前生效的速率，限流后降低，成功后逐步恢复到 limit.rate
+        self.rate = limit.rate
+        self.tokens = limit.burst
+        self.updated = time.monotonic()
+        # 在此之前不发出新请求（Retry-After）
+        self.paused_until = 0.0
+        # 最近一次因限流减速的时间
+        self.throttled_at = float("-inf")
+        # 排队中的请求：(优先级, 序号)
+        self.waiters: list = []
+
+    def delay(self, now: float) -> float:
+        """距离可以发出下一个请求还需等待的秒数"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.rate <= 0:
+            return 0.0
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        if self.rate > 0:
+            self.tokens -= 1
+        self.in_flight += 1
+
+class Slot:
+    """已获得的上游请求配额，请求完成后通过 report 反馈响应状态"""
+
+    def __init__(self, scheduler: "OutboundScheduler", state: _HostState):
+        self._scheduler = scheduler
+        self._state = state
+
+    @property
+    def family(self) -> str:
+        return self._state.family
+
+    def report(self, status_code: int, retry_after: Optional[str] = None):
+        """反馈上游响应状态，429/503 视为限流"""
+        self._scheduler._feedback(self._state, status_code, retry_after)
+
+class OutboundScheduler:
+    """按主机族限制并发和速率的上游请求调度器"""
+
+    def __init__(self, default: HostLimit, limits: Optional[Dict[str, HostLimit]] = None,
+                 queue_timeout: float = 10.0):
+        self.default = default
+        self.limits = dict(limits or {})
+        # 排队超过该时长放弃请求
+        self.queue_timeout = queue_timeout
+        self._states: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def _state(self, family: str) -> _HostState:
+        state = self._states.get(family)
+        if state is None:
+            with self._lock:
+                state = self._states.get(family)
+                if state is None:
+                    state = self._states[family] = _HostState(family, self.limits.get(family, self.default))
+        return state
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[Slot]:
+        """获取访问 url 所属主机族的配额，代码块结束时归还"""
+        state = self._state(host_family(urlsplit(url).hostname))
+        start = time.perf_counter()
+        self._acquire(state, _priority.get())
+        waited = time.perf_counter() - start
+        metrics.UPSTREAM_QUEUE_SECONDS.observe(waited, state.family)
+        tracing.add_span("queue", waited)
+        try:
+            yield Slot(self, state)
+        finally:
+            with state.cond:
+                state.in_flight -= 1
+                metrics.UPSTREAM_IN_FLIGHT.set(state.in_flight, state.family)
+                state.cond.notify_all()
+
+    def _acquire(self, state: _HostState, priority: int):
+        deadline = time.monotonic() + self.queue_timeout
+        entry = (priority, next(self._sequence))
+        queued = False
+        with state.cond:
+            heapq.heappush(state.waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = None
+                    # 只有队首可以获得配额，保证优先级和先后顺序
+                    if state.waiters[0] == entry and state.in_flight < state.limit.max_in_flight:
+                        delay = state.delay(now)
+                        if delay <= 0:
+                            state.take()
+                            metrics.UPSTREAM_IN_FLIGHT.set(state.in_flight, state.family)
+                            return
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise UpstreamQueueTimeout(f"等待 {state.family} 的请求配额超过 {self.queue_timeout} 秒")
+                    if not queued:
+                        queued = True
+                        metrics.UPSTREAM_QUEUED.inc(state.family)
+                    state.cond.wait(remaining if delay is None else min(delay, remaining))
+            finally:
+                state.waiters.remove(entry)
+                heapq.heapify(state.waiters)
+                if queued:
+                    metrics.UPSTREAM_QUEUED.dec(state.family)
+                # 队首变化，唤醒其他等待者重新检查
+                state.cond.notify_all()
+
+    def _feedback(self, state: _HostState, status_code: int, retry_after: Optional[str]):
+        configured = state.limit.rate
+        now = time.monotonic()
+        with state.cond:
+            if status_code in (429, 503):
+                metrics.UPSTREAM_THROTTLED.inc(state.family)
+                pause = _retry_after(retry_after)
+                if pause:
+                    state.paused_until = max(state.paused_until, now + pause)
+                # 清空积攒的令牌，避免减速后仍按桶容量突发
+                state.tokens = min(state.tokens, 0.0)
+                if configured <= 0 or now - state.throttled_at < _DECREASE_INTERVAL:
+                    return
+                state.throttled_at = now
+                state.rate = max(state.rate / 2, configured * _MIN_RATE_RATIO)
+                logger.warning(f"上游 {state.family} 限流（{status_code}），速率降为 {state.rate:.2f}/s，暂停 {pause:.1f} 秒")
+            elif (configured > 0 and state.rate < configured and status_code < 400
+                  and now - state.throttled_at >= _RECOVER_AFTER):
+                state.rate = min(configured, state.rate + configured * _RECOVER_RATIO)
+            else:
+                return
+            metrics.UPSTREAM_RATE.set(state.rate, state.family)
+
+    def status(self) -> Dict[str, Dict[str, float]]:
+        """各主机族的当前状态"""
+        with self._lock:
+            states = list(self._states.values())
+        result = {}
+        for state in states:
+            with state.cond:
+                result[state.family] = {
+                    "in_flight": state.in_flight,
+                    "queued": len(state.waiters),
+                    "rate": state.rate,
+                    "max_in_flight": state.limit.max_in_flight
+                }
+        return result
+
+_scheduler: Optional[OutboundScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def create_scheduler() -> OutboundScheduler:
+    """按配置创建调度器"""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in config.outbound_host_limits.split(","))):
+        family, _, value = entry.partition("=")
+        try:
+            limits[family.strip().lower()] = HostLimit.parse(value)
+        except ValueError:
+            logger.error(f"忽略无效的主机配额配置: {entry}")
+    default = HostLimit(config.outbound_max_in_flight, config.outbound_rate, config.outbound_burst)
+    return OutboundScheduler(default, limits, config.outbound_queue_timeout)
+
+def get_scheduler() -> OutboundScheduler:
+    """获取共享调度器"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = create_scheduler()
+    return _scheduler
+
+def set_scheduler(scheduler: OutboundScheduler):
+    """替换共享调度器，用于基准测试和离线回放"""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -0,0 +1,80 @@
+# 按需性能分析模块
+# 管理员开启后对接下来的 N 个请求做 cProfile，汇总结果供下载
+# cProfile 只分析处理请求的线程：提交到抓取线程池的任务（/all 聚合中各平台的抓取、解析）不在结果中，
+# 结果中表现为等待 future 的耗时；各阶段的耗时见 Server-Timing 中的 pool / queue / upstream / parse
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+from typing import Any, Dict, Optional
+
+class ProfileSession:
+    """对接下来的 N 个请求进行 cProfile 采样"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._active = False
+        self._completed = 0
+        self._stats: Optional[pstats.Stats] = None
+
+    def arm(self, requests: int):
+        """开启采样，清空上一次的结果"""
+        with self._lock:
+            self._remaining = max(int(requests), 0)
+            self._completed = 0
+            self._stats = None
+
+    def start_request(self) -> Optional[cProfile.Profile]:
+        """请求开始时调用，需要采样时返回 profiler"""
+        if self._remaining <= 0:
+            return None
+        with self._lock:
+            # 同一时刻只分析一个请求，避免多个 profiler 互相干扰
+            if self._remaining <= 0 or self._active:
+                return None
+            self._remaining -= 1
+            self._active = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def finish_request(self, profiler: cProfile.Profile):
+        """请求结束时调用，合并采样结果"""
+        profiler.disable()
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+            self._completed += 1
+            self._active = False
+
+    def status(self) -> Dict[str, Any]:
+        """采样状态"""
+        return {
+            "remaining": self._remaining,
+            "completed": self._completed,
+            "available": self._stats is not None
+        }
+
+    def dump(self) -> Optional[bytes]:
+        """导出 pstats 格式的结果，可用 pstats/snakeviz 打开"""
+        with self._lock:
+            if self._stats is None:
+                return None
+            return marshal.dumps(self._stats.stats)
+
+    def report(self, limit: int = 50) -> Optional[str]:
+        """导出按累计耗时排序的文本报告"""
+        with self._lock:
+            if self._stats is None:
+                return None
+            stream = io.StringIO()
+            self._stats.stream = stream
+            self._stats.sort_stats("cumulative").print_stats(limit)
+            return stream.getvalue()
+
+# 全局采样会话
+profile_session = ProfileSession()
@@ -0,0 +1,77 @@
+# 请求追踪模块
+# 以 contextvars 保存当前请求的 trace，未开启 trace 时 span 为空操作
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+class Trace:
+    """单个请求的耗时记录"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration: float):
+        """记录一个 span"""
+        with self._lock:
+            self.spans.append((name, duration))
+
+    def summary(self) -> Dict[str, Tuple[float, int]]:
+        """按名称汇总耗时和次数，保持首次出现的顺序"""
+        result: Dict[str, Tuple[float, int]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for name, duration in spans:
+            total, count = result.get(name, (0.0, 0))
+            result[name] = (total + duration, count + 1)
+        return result
+
+    def server_timing(self) -> str:
+        """生成 Server-Timing 响应头"""
+        entries = []
+        for name, (total, count) in self.summary().items():
+            entry = f"{name};dur={total * 1000:.1f}"
+            # 并发 span 的耗时为累加值，注明次数
+            if count > 1:
+                entry += f';desc="x{count}"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(entries)
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("hot_search_trace", default=None)
+
+def start_trace() -> contextvars.Token:
+    """为当前请求开启 trace"""
+    return _current_trace.set(Trace())
+
+def end_trace(token: contextvars.Token) -> Optional[Trace]:
+    """结束当前请求的 trace"""
+    trace = _current_trace.get()
+    _current_trace.reset(token)
+    return trace
+
+def current_trace() -> Optional[Trace]:
+    """获取当前请求的 trace"""
+    return _current_trace.get()
+
+def add_span(name: str, duration: float):
+    """向当前 trace 记录一个 span"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, duration)
+
+@contextmanager
+def span(name: str):
+    """记录代码块耗时"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
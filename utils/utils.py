@@ -1,7 +1,7 @@
 # 工具函数
 import re
 import logging
-from typing import List, Pattern, Match
+from typing import Any, List, Pattern, Match
 
 logger = logging.getLogger(__name__)
 
@@ -27,4 +27,41 @@ def strip_html(html_string: str) -> str:
         return re.sub(clean, '', html_string)
     except Exception as e:
         logger.error(f"去除HTML标签失败: {str(e)}")
-        return ""
\ No newline at end of file
+        return ""
+
+def format_hot_value(value: Any) -> int:
+    """格式化热度值为整数，保持精度"""
+    try:
+        if isinstance(value, (int, float)):
+            return int(value)
+        
+        if not value:
+            return 0
+            
+        # 处理字符串类型
+        value = str(value).strip()
+        # 纯数字字符串是最常见的情况，直接转换
+        if value.isdigit():
+            return int(value)
+
+        # 知乎特殊处理
+        if "万热度" in value:
+            # 提取数字部分（包括小数点）
+            num_str = ''.join(c for c in value.split('万热度')[0].strip() if c.isdigit() or c == '.')
+            try:
+                # 将字符串转换为浮点数并乘以10000
+                return int(float(num_str) * 10000)
+            except:
+                return 0
+        
+        # 其他情况的处理保持不变
+        value = ''.join(c for c in value if c.isdigit() or c == '.')
+        
+        if '万' in value or 'w' in value.lower():
+            value = float(value.replace('万', '').replace('w', '').replace('W', '')) * 10000
+        elif '亿' in value:
+            value = float(value.replace('亿', '')) * 100000000
+            
+        return int(float(value))
+    except:
+        return 0